@@ -4,15 +4,25 @@ API Routes for FitTrack Backend
 RESTful API endpoints with input validation and error handling
 """
 import os
-import io
-import csv
+import json
+import base64
+import hashlib
 import datetime
+import math
+from functools import wraps
 from flask import Blueprint, jsonify, request, url_for, redirect, current_app
 from flask_login import login_user, logout_user, login_required, current_user
-from werkzeug.security import check_password_hash, generate_password_hash
+from sqlalchemy import and_, or_, insert, update
+from sqlalchemy.orm import contains_eager
 
 from backend.app import db, logger
-from backend.database_models import User, Workout, WorkoutExercise
+from backend.database_models import (
+    Exercise, ExerciseRollup, PersonalRecord, User, Workout, WorkoutExercise, exercise_volume, workout_totals_subqueries
+)
+from backend import exercise_names, exports, passwords, records, rollups
+from backend.exercise_catalog import display_name
+from backend.user_cache import user_cache
+from backend.query_stats import query_budget
 from flask import g
 
 
@@ -27,6 +37,56 @@ def _json_err(message, code=400):
 api_bp = Blueprint('api', __name__)
 
 
+# ============================================================================
+# CONDITIONAL REQUESTS (ETag / If-None-Match)
+# ============================================================================
+
+def _bump_data_version(user_id):
+    """Invalidate every ETag of the user; call inside the write's transaction"""
+    db.session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+    )
+
+
+def _data_etag():
+    """Strong ETag of the current user's view of request.full_path
+    
+    The version is read from the database rather than current_user, which
+    may be a cached snapshot from another worker's point of view.
+    """
+    version = db.session.query(User.data_version).filter(User.id == current_user.id).scalar()
+    digest = hashlib.sha1(f'{current_user.id}:{version}:{request.full_path}'.encode()).hexdigest()
+    return digest[:32]
+
+
+def etag_cached(view):
+    """Answer 304 for unchanged user data before the view runs any query
+    
+    Must be applied below @login_required. Only successful responses get
+    the ETag, so errors are never revalidated. With compression enabled the
+    ETag is weak and varies on Accept-Encoding on both 200 and 304, since
+    the 200 may be gzip or brotli encoded (see compression.py).
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        etag = _data_etag()
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        compressible = current_app.config['COMPRESS_LEVEL'] > 0
+        response.set_etag(etag, weak=compressible)
+        if compressible:
+            response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    return wrapper
+
+
 # ============================================================================
 # AUTHENTICATION & USER MANAGEMENT
 # ============================================================================
@@ -57,7 +117,7 @@ def register():
         # Create user
         new_user = User(
             username=username,
-            password=generate_password_hash(password, method='pbkdf2:sha256')
+            password=passwords.hash_password(password)
         )
         db.session.add(new_user)
         db.session.commit()
@@ -65,6 +125,9 @@ def register():
         logger.info(f'New user registered: {username}')
         return jsonify({'ok': True, 'message': 'Registration successful'})
     
+    except passwords.HashingBusy:
+        db.session.rollback()
+        return _json_err('Server je přetížený, zkuste to prosím za chvíli.', 503)
     except Exception as e:
         logger.error(f'Registration error: {str(e)}')
         db.session.rollback()
@@ -94,7 +157,7 @@ def login():
             if not admin:
                 admin = User(
                     username='admin',
-                    password=generate_password_hash(password, method='pbkdf2:sha256')
+                    password=passwords.hash_password(password)
                 )
                 db.session.add(admin)
                 db.session.commit()
@@ -104,14 +167,29 @@ def login():
         
         # Regular user login
         user = User.query.filter_by(username=username).first()
-        if not user or not check_password_hash(user.password, password):
+        if not user or not passwords.verify_password(user.password, password):
             logger.warning(f'Failed login attempt for: {username}')
             return jsonify({'ok': False, 'error': 'Nesprávné uživatelské jméno nebo heslo'}), 401
         
+        # Upgrade hashes made with an older method or cost while we know the password
+        # (skipped when the hashing pool is saturated; the next login retries)
+        if passwords.needs_rehash(user.password):
+            try:
+                user.password = passwords.hash_password(password)
+            except passwords.HashingBusy:
+                logger.info(f'Password hash upgrade deferred, hashing busy: {username}')
+            else:
+                db.session.commit()
+                user_cache.invalidate(user.id)
+                logger.info(f'Password hash upgraded for user: {username}')
+        
         login_user(user)
         logger.info(f'User logged in: {username}')
         return jsonify({'ok': True, 'message': 'Login successful', 'is_admin': False})
     
+    except passwords.HashingBusy:
+        db.session.rollback()
+        return _json_err('Server je přetížený, zkuste to prosím za chvíli.', 503)
     except Exception as e:
         logger.error(f'Login error: {str(e)}')
         return jsonify({'ok': False, 'error': 'Došlo k chybě při přihlašování. Zkuste to prosím znovu.'}), 500
@@ -189,7 +267,9 @@ def profile():
         user.age = age
         user.height_cm = height
         user.weight_kg = weight
+        _bump_data_version(user.id)
         db.session.commit()
+        user_cache.invalidate(user.id)
         
         logger.info(f'Profile updated for user: {current_user.username}')
         return jsonify({'ok': True, 'message': 'Profile updated successfully'})
@@ -206,16 +286,187 @@ def profile():
 # WORKOUT MANAGEMENT
 # ============================================================================
 
+WORKOUT_PAGE_MAX = 100
+WORKOUT_SORTS = ('date', 'exercise_count')
+BULK_CHUNK_SIZE = 1000  # rows per executemany batch
+BULK_MAX_ERRORS = 50
+
+
+def _encode_cursor(values):
+    """Encode keyset values of the last row into an opaque cursor string"""
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor, converters):
+    """Decode a cursor produced by _encode_cursor, converting each value with
+    the matching callable in converters; raises ValueError if malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(values, list) or len(values) != len(converters):
+            raise ValueError
+        return [convert(value) for convert, value in zip(converters, values)]
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+
+def _keyset_condition(columns, values, descending):
+    """Rows strictly after (values) in the (columns) ordering: (a, b) < (x, y) expanded"""
+    clauses = []
+    for idx, column in enumerate(columns):
+        equal = [col == val for col, val in zip(columns[:idx], values[:idx])]
+        step = column < values[idx] if descending else column > values[idx]
+        clauses.append(and_(*equal, step))
+    return or_(*clauses)
+
+
+def _workout_listing_query(user_id, date_from=None, date_to=None, search=None,
+                           sort='date', descending=True, cursor=None):
+    """Workout rows with their denormalized exercise totals
+    
+    Reads the workout table only. Ordering is always made unique with
+    (date, id) so it can drive keyset pagination; the (user_id, date, id)
+    index serves the default sort as a bounded range scan.
+    """
+    query = db.session.query(
+            Workout.id, Workout.user_id, Workout.date, Workout.note, Workout.exercise_count,
+            Workout.total_sets, Workout.total_reps, Workout.total_volume
+        )\
+        .filter(Workout.user_id == user_id)
+    
+    if date_from:
+        query = query.filter(Workout.date >= date_from)
+    if date_to:
+        query = query.filter(Workout.date <= date_to)
+    if search:
+        pattern = f'%{search}%'
+        query = query.filter(or_(
+            Workout.note.ilike(pattern),
+            db.cast(Workout.date, db.String).like(pattern)
+        ))
+    
+    if sort == 'exercise_count':
+        columns = [Workout.exercise_count, Workout.date, Workout.id]
+    else:
+        columns = [Workout.date, Workout.id]
+    if cursor:
+        query = query.filter(_keyset_condition(columns, cursor, descending))
+    
+    return query.order_by(*[col.desc() if descending else col.asc() for col in columns])
+
+
+def _row_cursor(row, sort):
+    values = [row.date.isoformat(), row.id]
+    if sort == 'exercise_count':
+        values.insert(0, row.exercise_count or 0)
+    return _encode_cursor(values)
+
+
+def _exercises_by_workout(user_id, workout_ids):
+    """Load the exercises of the given workouts in one JOIN query, grouped by workout id
+    
+    workout_ids is a list of ids or a SELECT of them.
+    """
+    query = WorkoutExercise.query\
+        .join(Workout, Workout.id == WorkoutExercise.workout_id)\
+        .filter(Workout.user_id == user_id, WorkoutExercise.workout_id.in_(workout_ids))
+    exercises = query.order_by(WorkoutExercise.workout_id, WorkoutExercise.id).all()
+    
+    grouped = {}
+    for exercise in exercises:
+        grouped.setdefault(exercise.workout_id, []).append(exercise.to_dict())
+    return grouped
+
+
 @api_bp.route('/workouts', methods=['GET'])
 @login_required
+@etag_cached
 def get_workouts():
-    """Get all workouts for current user"""
+    """Get workouts for current user
+    
+    Query params:
+        include: 'exercises' embeds each workout's exercises in the listing
+        from, to: inclusive ISO date range filter
+        q: substring search in note or date
+        sort: 'date' (default) or 'exercise_count'
+        order: 'desc' (default) or 'asc'
+        limit: page size (max 100); enables cursor pagination via 'next_cursor'
+        cursor: 'next_cursor' value from the previous page
+    
+    Without 'limit' the whole (filtered) history is returned.
+    """
     try:
-        workouts = Workout.query.filter_by(user_id=current_user.id)\
-            .order_by(Workout.date.desc()).all()
+        args = request.args
+        include = {part.strip() for part in args.get('include', '').split(',') if part.strip()}
+        
+        sort = args.get('sort', 'date')
+        if sort not in WORKOUT_SORTS:
+            return _json_err('Invalid sort (use: date, exercise_count)', 400)
+        order = args.get('order', 'desc')
+        if order not in ('asc', 'desc'):
+            return _json_err('Invalid order (use: asc, desc)', 400)
+        
+        try:
+            date_from = datetime.date.fromisoformat(args['from']) if args.get('from') else None
+            date_to = datetime.date.fromisoformat(args['to']) if args.get('to') else None
+        except ValueError:
+            return _json_err('Invalid date format (use YYYY-MM-DD)', 400)
+        
+        limit = None
+        if args.get('limit'):
+            try:
+                limit = int(args['limit'])
+            except ValueError:
+                return _json_err('Invalid limit', 400)
+            if not (1 <= limit <= WORKOUT_PAGE_MAX):
+                return _json_err(f'Limit must be between 1 and {WORKOUT_PAGE_MAX}', 400)
+        
+        cursor = None
+        if args.get('cursor'):
+            try:
+                converters = [datetime.date.fromisoformat, int]
+                if sort == 'exercise_count':
+                    converters.insert(0, int)
+                cursor = _decode_cursor(args['cursor'], converters)
+            except ValueError:
+                return _json_err('Invalid cursor', 400)
+        
+        query = _workout_listing_query(
+            current_user.id,
+            date_from=date_from,
+            date_to=date_to,
+            search=args.get('q', '').strip() or None,
+            sort=sort,
+            descending=(order == 'desc'),
+            cursor=cursor
+        )
         
-        workouts_data = [workout.to_dict() for workout in workouts]
-        return jsonify({'ok': True, 'workouts': workouts_data})
+        next_cursor = None
+        if limit is not None:
+            rows = query.limit(limit + 1).all()
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = _row_cursor(rows[-1], sort)
+        else:
+            rows = query.all()
+        
+        workouts_data = [Workout.row_to_dict(row) for row in rows]
+        if 'exercises' in include:
+            if limit is not None:
+                workout_ids = [row.id for row in rows]
+            else:
+                # The whole filtered listing: select its ids in SQL rather
+                # than binding one parameter per workout
+                workout_ids = query.with_entities(Workout.id).order_by(None).statement
+            exercises = _exercises_by_workout(current_user.id, workout_ids)
+            for workout_data in workouts_data:
+                workout_data['exercises'] = exercises.get(workout_data['id'], [])
+        
+        payload = {'ok': True, 'workouts': workouts_data}
+        if limit is not None:
+            payload['next_cursor'] = next_cursor
+        return jsonify(payload)
     
     except Exception as e:
         logger.error(f'Error fetching workouts: {str(e)}')
@@ -224,6 +475,7 @@ def get_workouts():
 
 @api_bp.route('/workouts/<int:workout_id>', methods=['GET'])
 @login_required
+@etag_cached
 def get_workout_detail(workout_id):
     """Get detailed information about a specific workout"""
     try:
@@ -240,6 +492,231 @@ def get_workout_detail(workout_id):
         return jsonify({'ok': False, 'error': 'Failed to fetch workout'}), 500
 
 
+def _exercise_totals(exercises):
+    """Denormalized Workout totals for a list of exercise dicts"""
+    return {
+        'exercise_count': len(exercises),
+        'total_sets': sum(ex['sets'] for ex in exercises),
+        'total_reps': sum(ex['reps'] for ex in exercises),
+        'total_volume': float(sum(ex['sets'] * ex['reps'] * (ex['weight'] or 0) for ex in exercises)),
+    }
+
+
+def _refresh_workout_totals(workout_id):
+    """Recompute one workout's totals from its exercise rows, in one UPDATE
+    
+    Call after the exercise change is flushed. Recomputing (rather than
+    adding and subtracting deltas) keeps the float volume from drifting.
+    """
+    workout_table = Workout.__table__
+    db.session.execute(
+        update(workout_table)
+        .where(workout_table.c.id == workout_id)
+        .values(workout_totals_subqueries(workout_table.c.id))
+    )
+
+
+def _resolve_exercise_ids(exercise_lists):
+    """Set exercise_id on every exercise dict, with one dictionary lookup for all names"""
+    ids = exercise_names.resolve({ex['name'] for exercises in exercise_lists for ex in exercises})
+    for exercises in exercise_lists:
+        for ex in exercises:
+            ex['exercise_id'] = ids[ex['name']]
+
+
+def _exercise_row(exercise, workout_id):
+    """workout_exercise values of a resolved exercise dict"""
+    return {'workout_id': workout_id, 'exercise_id': exercise['exercise_id'],
+            'sets': exercise['sets'], 'reps': exercise['reps'], 'weight': exercise['weight']}
+
+
+def _insert_workouts(user_id, workouts):
+    """Insert workouts and their exercises with Core executemany
+    
+    workouts are validated dicts (date, note, exercises=[{name, sets, reps,
+    weight}]). Runs in the caller's transaction and returns the new workout
+    ids in input order.
+    """
+    workout_table = Workout.__table__
+    exercise_table = WorkoutExercise.__table__
+    _resolve_exercise_ids([w['exercises'] for w in workouts])
+    
+    workout_ids = []
+    for start in range(0, len(workouts), BULK_CHUNK_SIZE):
+        chunk = workouts[start:start + BULK_CHUNK_SIZE]
+        result = db.session.execute(
+            insert(workout_table).returning(workout_table.c.id),
+            [{'user_id': user_id, 'date': w['date'], 'note': w['note'], **_exercise_totals(w['exercises'])}
+             for w in chunk]
+        )
+        # RETURNING order is unspecified, but ids are allocated ascending in
+        # VALUES order (SQLite rowid under the write lock, sequences in call
+        # order). sort_by_parameter_order=True would instead fall back to one
+        # statement per row on SQLite, which has no insert sentinel here.
+        workout_ids.extend(sorted(result.scalars().all()))
+    
+    exercise_rows = [
+        _exercise_row(exercise, workout_id)
+        for workout_id, workout in zip(workout_ids, workouts)
+        for exercise in workout['exercises']
+    ]
+    for start in range(0, len(exercise_rows), BULK_CHUNK_SIZE):
+        db.session.execute(insert(exercise_table), exercise_rows[start:start + BULK_CHUNK_SIZE])
+    
+    rollups.add_workouts(user_id, workout_ids)
+    records.add_workouts(user_id, [(wid, w['date'], w['exercises']) for wid, w in zip(workout_ids, workouts)])
+    return workout_ids
+
+
+def _insert_workout(user_id, workout_date, note, exercises):
+    """Insert one workout and its exercises in two statements
+    
+    The workout id comes back via RETURNING where the dialect supports it;
+    the exercises go in as a single multi-row INSERT. Runs in the caller's
+    transaction and returns the workout id.
+    """
+    workout_table = Workout.__table__
+    exercise_table = WorkoutExercise.__table__
+    _resolve_exercise_ids([exercises])
+    
+    stmt = insert(workout_table).values(user_id=user_id, date=workout_date, note=note,
+                                        **_exercise_totals(exercises))
+    if db.session.get_bind().dialect.insert_returning:
+        workout_id = db.session.execute(stmt.returning(workout_table.c.id)).scalar_one()
+    else:
+        workout_id = db.session.execute(stmt).inserted_primary_key[0]
+    
+    rows = [_exercise_row(exercise, workout_id) for exercise in exercises]
+    for start in range(0, len(rows), BULK_CHUNK_SIZE):
+        db.session.execute(insert(exercise_table).values(rows[start:start + BULK_CHUNK_SIZE]))
+    rollups.add_workouts(user_id, [workout_id])
+    records.add_workouts(user_id, [(workout_id, workout_date, exercises)])
+    return workout_id
+
+
+def _finite_float(value):
+    """float(value), refusing nan and infinity; raises ValueError"""
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f'{value!r} is not a finite number')
+    return number
+
+
+def _validate_bulk_workout(item):
+    """Validated workout dict for _insert_workouts; raises ValueError"""
+    if not isinstance(item, dict):
+        raise ValueError('workout must be an object')
+    
+    date_str = item.get('date')
+    try:
+        workout_date = datetime.date.fromisoformat(date_str) if date_str else datetime.date.today()
+    except (ValueError, TypeError):
+        raise ValueError('invalid date format (use YYYY-MM-DD)')
+    
+    note = item.get('note') or ''
+    if not isinstance(note, str):
+        raise ValueError('note must be a string')
+    
+    exercises = item.get('exercises') or []
+    if not isinstance(exercises, list):
+        raise ValueError('exercises must be an array')
+    
+    rows = []
+    for position, ex in enumerate(exercises):
+        if not isinstance(ex, dict) or not isinstance(ex.get('name'), str) or not ex['name'].strip():
+            raise ValueError(f'exercise {position}: name is required')
+        if len(display_name(ex['name'])) > Exercise.name.type.length:
+            raise ValueError(f'exercise {position}: name is longer than {Exercise.name.type.length} characters')
+        try:
+            sets = int(ex.get('sets', 3))
+            reps = int(ex.get('reps', 10))
+            weight = _finite_float(ex['weight']) if ex.get('weight') not in (None, '') else None
+        except (ValueError, TypeError, OverflowError):
+            raise ValueError(f'exercise {position}: sets, reps and weight must be finite numbers')
+        if sets < 0 or reps < 0 or (weight is not None and weight < 0):
+            raise ValueError(f'exercise {position}: values must not be negative')
+        rows.append({'name': ex['name'].strip(), 'sets': sets, 'reps': reps, 'weight': weight})
+    
+    return {'date': workout_date, 'note': note, 'exercises': rows}
+
+
+def _read_bulk_body():
+    """Raw workouts from a JSON array, {"workouts": [...]} or an NDJSON body
+    
+    Returns (items, error_response); reads at most BULK_MAX_BYTES.
+    """
+    limit = current_app.config['BULK_MAX_BYTES']
+    too_large = _json_err(f'Request body exceeds {limit} bytes', 413)
+    if request.content_length is not None and request.content_length > limit:
+        return None, too_large
+    raw = request.stream.read(limit + 1)
+    if len(raw) > limit:
+        return None, too_large
+    
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        items = []
+        for line_no, line in enumerate(raw.splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                items.append(current_app.json.loads(line))
+            except ValueError:
+                return None, _json_err(f'Invalid JSON on line {line_no}', 400)
+        return items, None
+    
+    try:
+        body = current_app.json.loads(raw) if raw else None
+    except ValueError:
+        return None, _json_err('Invalid JSON body', 400)
+    if isinstance(body, dict):
+        body = body.get('workouts')
+    if not isinstance(body, list):
+        return None, _json_err('Expected an array of workouts', 400)
+    return body, None
+
+
+@api_bp.route('/workouts/bulk', methods=['POST'])
+@login_required
+@query_budget(0, repeats=0)
+def bulk_create_workouts():
+    """Import many workouts at once (JSON array or NDJSON, one workout per line)
+    
+    Everything is validated before the first INSERT; the import is a single
+    transaction, so it either lands completely or not at all.
+    """
+    try:
+        items, error = _read_bulk_body()
+        if error:
+            return error
+        if not items:
+            return _json_err('No workouts to import', 400)
+        
+        workouts, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                workouts.append(_validate_bulk_workout(item))
+            except ValueError as e:
+                errors.append({'index': index, 'error': str(e)})
+                if len(errors) >= BULK_MAX_ERRORS:
+                    break
+        if errors:
+            return jsonify({'ok': False, 'error': 'Validation failed', 'errors': errors}), 400
+        
+        workout_ids = _insert_workouts(current_user.id, workouts)
+        _bump_data_version(current_user.id)
+        db.session.commit()
+        
+        exercise_count = sum(len(w['exercises']) for w in workouts)
+        logger.info(f'Bulk import for user {current_user.username}: '
+                    f'{len(workout_ids)} workouts, {exercise_count} exercises')
+        return jsonify({'ok': True, 'ids': workout_ids, 'exercise_count': exercise_count}), 201
+    
+    except Exception as e:
+        logger.error(f'Bulk import error: {str(e)}')
+        db.session.rollback()
+        return jsonify({'ok': False, 'error': 'Bulk import failed'}), 500
+
+
 @api_bp.route('/workouts', methods=['POST'])
 @login_required
 def create_workout():
@@ -255,35 +732,25 @@ def create_workout():
             return jsonify({'ok': False, 'error': 'Invalid date format (use YYYY-MM-DD)'}), 400
         
         note = data.get('note', '')
-        exercises = data.get('exercises', [])
         
-        # Create workout
-        workout = Workout(
-            user_id=current_user.id,
-            date=workout_date,
-            note=note
-        )
-        db.session.add(workout)
-        db.session.flush()  # Get workout.id before adding exercises
-        
-        # Add exercises
-        for ex_data in exercises:
-            if not ex_data.get('name'):
-                continue
-            
-            exercise = WorkoutExercise(
-                workout_id=workout.id,
-                name=ex_data['name'],
-                sets=int(ex_data.get('sets', 3)),
-                reps=int(ex_data.get('reps', 10)),
-                weight=float(ex_data['weight']) if ex_data.get('weight') else None
-            )
-            db.session.add(exercise)
+        # Parse exercises before opening the write transaction
+        exercises = [
+            {
+                'name': ex_data['name'].strip(),
+                'sets': int(ex_data.get('sets', 3)),
+                'reps': int(ex_data.get('reps', 10)),
+                'weight': _finite_float(ex_data['weight']) if ex_data.get('weight') else None
+            }
+            for ex_data in data.get('exercises', [])
+            if (ex_data.get('name') or '').strip()
+        ]
         
+        workout_id = _insert_workout(current_user.id, workout_date, note, exercises)
+        _bump_data_version(current_user.id)
         db.session.commit()
         
-        logger.info(f'Workout created: {workout.id} for user {current_user.username}')
-        return jsonify({'ok': True, 'id': workout.id}), 201
+        logger.info(f'Workout created: {workout_id} for user {current_user.username}')
+        return jsonify({'ok': True, 'id': workout_id}), 201
     
     except ValueError as e:
         return jsonify({'ok': False, 'error': f'Invalid input: {str(e)}'}), 400
@@ -295,15 +762,29 @@ def create_workout():
 
 @api_bp.route('/workouts/<int:workout_id>', methods=['DELETE'])
 @login_required
+@query_budget(16)
 def delete_workout(workout_id):
-    """Delete a workout"""
+    """Delete a workout
+    
+    Also recomputes the affected rollup buckets and, if the workout held any
+    personal records, those exercises' records; hence the larger budget.
+    """
     try:
         workout = Workout.query.filter_by(id=workout_id, user_id=current_user.id).first()
         
         if not workout:
             return jsonify({'ok': False, 'error': 'Workout not found'}), 404
         
+        rows = db.session.query(WorkoutExercise.exercise_id)\
+            .filter(WorkoutExercise.workout_id == workout.id)\
+            .distinct()\
+            .all()
+        exercise_ids = [exercise_id for exercise_id, in rows]
         db.session.delete(workout)
+        db.session.flush()
+        rollups.refresh(current_user.id, [(exercise_id, workout.date) for exercise_id in exercise_ids])
+        records.refresh(current_user.id, workout_id, exercise_ids)
+        _bump_data_version(current_user.id)
         db.session.commit()
         
         logger.info(f'Workout deleted: {workout_id} by user {current_user.username}')
@@ -335,14 +816,28 @@ def add_exercise(workout_id):
         if not name:
             return jsonify({'ok': False, 'error': 'Exercise name is required'}), 400
         
-        exercise = WorkoutExercise(
-            workout_id=workout.id,
-            name=name,
-            sets=int(data.get('sets', 3)),
-            reps=int(data.get('reps', 10)),
-            weight=float(data['weight']) if data.get('weight') else None
-        )
+        exercise_data = {
+            'name': name,
+            'sets': int(data.get('sets', 3)),
+            'reps': int(data.get('reps', 10)),
+            'weight': _finite_float(data['weight']) if data.get('weight') else None
+        }
+        _resolve_exercise_ids([[exercise_data]])
+        # Same exercise already in this workout: one (workout_id, exercise_id) index lookup
+        same_count, same_volume = db.session.query(
+                db.func.count(WorkoutExercise.id),
+                db.func.coalesce(db.func.sum(exercise_volume(WorkoutExercise.__table__)), 0)
+            )\
+            .filter(WorkoutExercise.workout_id == workout.id,
+                    WorkoutExercise.exercise_id == exercise_data['exercise_id'])\
+            .one()
+        exercise = WorkoutExercise(**_exercise_row(exercise_data, workout.id))
         db.session.add(exercise)
+        db.session.flush()
+        _refresh_workout_totals(workout.id)
+        rollups.add_exercise(current_user.id, workout.date, exercise_data, new_session=not same_count)
+        records.add_exercise(current_user.id, workout.id, workout.date, exercise_data, prior_volume=same_volume)
+        _bump_data_version(current_user.id)
         db.session.commit()
         
         logger.info(f'Exercise added to workout {workout_id}: {name}')
@@ -363,6 +858,7 @@ def delete_exercise(exercise_id):
     try:
         exercise = WorkoutExercise.query\
             .join(Workout)\
+            .options(contains_eager(WorkoutExercise.workout))\
             .filter(Workout.user_id == current_user.id, WorkoutExercise.id == exercise_id)\
             .first()
         
@@ -370,7 +866,13 @@ def delete_exercise(exercise_id):
             return jsonify({'ok': False, 'error': 'Exercise not found'}), 404
         
         workout_id = exercise.workout_id
+        affected = [(exercise.exercise_id, exercise.workout.date)]
         db.session.delete(exercise)
+        db.session.flush()
+        _refresh_workout_totals(workout_id)
+        rollups.refresh(current_user.id, affected)
+        records.refresh(current_user.id, workout_id, [exercise.exercise_id])
+        _bump_data_version(current_user.id)
         db.session.commit()
         
         logger.info(f'Exercise deleted: {exercise_id}')
@@ -390,31 +892,51 @@ def delete_exercise(exercise_id):
 @login_required
 def get_exercise_catalog():
     """Get list of available exercises"""
-    catalog = [
-        'Bench press', 'Dřep', 'Mrtvý tah', 'Přítahy na hrazdě',
-        'Tlaky na ramena', 'Biceps zdvih', 'Triceps kliky',
-        'Výpady', 'Leg press', 'Veslování', 'Kettlebell swing', 'Plank'
-    ]
+    catalog = [name for name, _, _, _ in exercise_names.CATALOG]
     return jsonify({'ok': True, 'exercises': catalog})
 
 
 @api_bp.route('/stats', methods=['GET'])
 @login_required
+@etag_cached
 def get_stats():
-    """Get user statistics"""
+    """Get user statistics
+    
+    One aggregate statement over the workout table and its denormalized
+    totals, so the cost does not depend on materialising the user's history
+    in Python or on the number of exercise rows.
+    """
     try:
-        total_workouts = Workout.query.filter_by(user_id=current_user.id).count()
-        
-        recent_workouts = Workout.query.filter_by(user_id=current_user.id)\
-            .order_by(Workout.date.desc()).limit(5).all()
-        
-        recent_exercises = sum(workout.exercises.count() for workout in recent_workouts)
+        user_id = current_user.id
+        
+        recent = db.session.query(Workout.exercise_count)\
+            .filter(Workout.user_id == user_id)\
+            .order_by(Workout.date.desc(), Workout.id.desc())\
+            .limit(5)\
+            .subquery()
+        recent_exercises = db.select(db.func.coalesce(db.func.sum(recent.c.exercise_count), 0))\
+            .scalar_subquery()
+        
+        total_workouts, first_date, last_date, weeks_active, total_volume, recent_exercises = db.session.query(
+                db.func.count(Workout.id),
+                db.func.min(Workout.date),
+                db.func.max(Workout.date),
+                db.func.count(db.distinct(rollups.bucket_sql(Workout.date, 'week'))),
+                db.func.coalesce(db.func.sum(Workout.total_volume), 0),
+                recent_exercises
+            )\
+            .filter(Workout.user_id == user_id)\
+            .one()
         
         return jsonify({
             'ok': True,
             'stats': {
                 'total_workouts': total_workouts,
-                'recent_exercises': recent_exercises
+                'recent_exercises': recent_exercises,
+                'total_volume': float(total_volume or 0),
+                'weeks_active': weeks_active,
+                'first_workout_date': first_date.isoformat() if first_date else None,
+                'last_workout_date': last_date.isoformat() if last_date else None
             }
         })
     
@@ -423,6 +945,71 @@ def get_stats():
         return jsonify({'ok': False, 'error': 'Failed to fetch statistics'}), 500
 
 
+@api_bp.route('/stats/rollups', methods=['GET'])
+@login_required
+@etag_cached
+def get_stats_rollups():
+    """Per-exercise training aggregates by day, week or month
+    
+    Query params:
+        grain: 'day', 'week' (default) or 'month'
+        exercise: only this exercise (any spelling or alias of its name)
+        from, to: inclusive ISO date range on the bucket start
+    
+    Reads the precomputed exercise_rollup rows, so the cost grows with the
+    number of buckets rather than the length of the history.
+    """
+    try:
+        args = request.args
+        grain = args.get('grain', 'week')
+        if grain not in rollups.GRAINS:
+            return _json_err('Invalid grain (use: day, week, month)', 400)
+        try:
+            date_from = datetime.date.fromisoformat(args['from']) if args.get('from') else None
+            date_to = datetime.date.fromisoformat(args['to']) if args.get('to') else None
+        except ValueError:
+            return _json_err('Invalid date format (use YYYY-MM-DD)', 400)
+        
+        query = ExerciseRollup.query.filter_by(user_id=current_user.id, grain=grain)
+        if args.get('exercise'):
+            query = query.filter(ExerciseRollup.exercise_id == exercise_names.lookup_id(args['exercise']))
+        if date_from:
+            query = query.filter(ExerciseRollup.bucket >= date_from)
+        if date_to:
+            query = query.filter(ExerciseRollup.bucket <= date_to)
+        rows = query.order_by(ExerciseRollup.bucket, ExerciseRollup.exercise_id).all()
+        
+        return jsonify({'ok': True, 'grain': grain, 'rollups': [row.to_dict() for row in rows]})
+    
+    except Exception as e:
+        logger.error(f'Error fetching stats rollups: {str(e)}')
+        return jsonify({'ok': False, 'error': 'Failed to fetch statistics'}), 500
+
+
+@api_bp.route('/records', methods=['GET'])
+@login_required
+@etag_cached
+def get_records():
+    """Get the user's personal records
+    
+    Query params:
+        exercise: only this exercise (any spelling or alias of its name)
+    
+    One primary-key range read of personal_record; kinds are 'weight',
+    'one_rm' (Epley), 'set_volume' and 'session_volume'.
+    """
+    try:
+        query = PersonalRecord.query.filter_by(user_id=current_user.id)
+        if request.args.get('exercise'):
+            query = query.filter(PersonalRecord.exercise_id == exercise_names.lookup_id(request.args['exercise']))
+        rows = query.order_by(PersonalRecord.exercise_id, PersonalRecord.kind).all()
+        return jsonify({'ok': True, 'records': [row.to_dict() for row in rows]})
+    
+    except Exception as e:
+        logger.error(f'Error fetching records: {str(e)}')
+        return jsonify({'ok': False, 'error': 'Failed to fetch records'}), 500
+
+
 @api_bp.route('/quickstart/<level>', methods=['POST'])
 @login_required
 def quickstart_workout(level):
@@ -441,29 +1028,20 @@ def quickstart_workout(level):
         
         config = presets[level]
         
-        workout = Workout(
-            user_id=current_user.id,
-            date=datetime.date.today(),
-            note=f"Rychlý start – {config['label']}"
-        )
-        db.session.add(workout)
-        db.session.flush()
-        
-        # Add default exercises
+        # Default exercises
         default_exercises = ['Dřep', 'Bench press', 'Veslování']
-        for name in default_exercises:
-            exercise = WorkoutExercise(
-                workout_id=workout.id,
-                name=name,
-                sets=config['sets'],
-                reps=config['reps']
-            )
-            db.session.add(exercise)
-        
+        workout_id = _insert_workout(
+            current_user.id,
+            datetime.date.today(),
+            f"Rychlý start – {config['label']}",
+            [{'name': name, 'sets': config['sets'], 'reps': config['reps'], 'weight': None}
+             for name in default_exercises]
+        )
+        _bump_data_version(current_user.id)
         db.session.commit()
         
         logger.info(f'Quickstart workout created: {level} for user {current_user.username}')
-        return jsonify({'ok': True, 'id': workout.id})
+        return jsonify({'ok': True, 'id': workout_id})
     
     except Exception as e:
         logger.error(f'Error creating quickstart workout: {str(e)}')
@@ -475,40 +1053,27 @@ def quickstart_workout(level):
 # EXPORT
 # ============================================================================
 
+def _logged_csv_stream(user_id, username):
+    """Wrap the CSV generator so completion and mid-stream failures are logged"""
+    stats = {'rows': 0}
+    try:
+        yield from exports.iter_csv(exports.export_rows_query(user_id), stats)
+        logger.info(f'CSV export for user {username}: {stats["rows"]} rows')
+    except Exception as e:
+        # Headers are already sent; the client receives a truncated file
+        logger.error(f'CSV export error after {stats["rows"]} rows: {str(e)}')
+        raise
+
+
 @api_bp.route('/export/csv', methods=['GET'])
 @login_required
+@etag_cached
 def export_csv():
-    """Export user workouts to CSV"""
+    """Export user workouts to CSV (streamed)"""
     try:
-        si = io.StringIO()
-        # Use semicolon delimiter for Czech Excel compatibility
-        writer = csv.writer(si, delimiter=';', quoting=csv.QUOTE_MINIMAL)
-        
-        # CSV headers (Czech)
-        writer.writerow(['ID', 'Datum', 'Poznámka', 'Cvik', 'Série', 'Opakování', 'Váha (kg)'])
-        
-        workouts = Workout.query.filter_by(user_id=current_user.id)\
-            .order_by(Workout.date.desc()).all()
-        
-        for workout in workouts:
-            for exercise in workout.exercises:
-                writer.writerow([
-                    workout.id,
-                    workout.date.strftime('%d.%m.%Y'),
-                    workout.note or '',
-                    exercise.name,
-                    exercise.sets,
-                    exercise.reps,
-                    exercise.weight or ''
-                ])
-        
-        csv_data = si.getvalue()
-        logger.info(f'CSV export for user {current_user.username}: {len(workouts)} workouts')
-        
-        # Return CSV as proper response with correct headers
-        from flask import Response
+        from flask import Response, stream_with_context
         return Response(
-            csv_data,
+            stream_with_context(_logged_csv_stream(current_user.id, current_user.username)),
             mimetype='text/csv',
             headers={
                 'Content-Disposition': 'attachment; filename=fittrack_export.csv',
@@ -523,131 +1088,31 @@ def export_csv():
 
 @api_bp.route('/export/excel', methods=['GET'])
 @login_required
+@etag_cached
 def export_excel():
     """Export user workouts to Excel with styling"""
     try:
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-        from openpyxl.utils import get_column_letter
         import tempfile
+        from flask import send_file
         
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Tréninky"
-        
-        # Headers (bez ID)
-        headers = ['Datum', 'Trénink', 'Cvik', 'Série', 'Opakování', 'Váha (kg)']
-        ws.append(headers)
-        
-        # Style header row
-        header_fill = PatternFill(start_color="FFD700", end_color="FFD700", fill_type="solid")
-        header_font = Font(bold=True, size=12, color="000000")
-        
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-        
-        # Get workouts
-        workouts = Workout.query.filter_by(user_id=current_user.id)\
-            .order_by(Workout.date.desc()).all()
-        
-        # Add data rows grouped by workout
-        row_num = 2
-        workout_separator_fill = PatternFill(start_color="333333", end_color="333333", fill_type="solid")
-        workout_header_font = Font(bold=True, size=11, color="FFFFFF")
-        
-        for workout_idx, workout in enumerate(workouts):
-            # Add workout header row (separator)
-            workout_header = f"🏋️ {workout.note or 'Trénink'}"
-            ws.append([workout.date.strftime('%d.%m.%Y'), workout_header, '', '', '', ''])
-            
-            # Style workout header
-            for col_num in range(1, 7):
-                cell = ws.cell(row=row_num, column=col_num)
-                cell.fill = workout_separator_fill
-                cell.font = workout_header_font
-                cell.alignment = Alignment(horizontal='left', vertical='center')
-            
-            # Merge cells for workout header (columns B-F)
-            ws.merge_cells(f'B{row_num}:F{row_num}')
-            
-            row_num += 1
-            
-            # Add exercises for this workout
-            for exercise in workout.exercises:
-                ws.append([
-                    '',  # Empty datum (zobrazeno už v headeru)
-                    '',  # Empty trénink
-                    f"  • {exercise.name}",  # Odsazený cvik
-                    exercise.sets,
-                    exercise.reps,
-                    exercise.weight if exercise.weight else ''
-                ])
-                
-                # Style exercise row
-                for col_num in range(1, 7):
-                    cell = ws.cell(row=row_num, column=col_num)
-                    cell.alignment = Alignment(horizontal='left', vertical='center')
-                    
-                    # Light background for exercises
-                    cell.fill = PatternFill(start_color="F9F9F9", end_color="F9F9F9", fill_type="solid")
-                
-                row_num += 1
-            
-            # Add empty row between workouts (except last)
-            if workout_idx < len(workouts) - 1:
-                ws.append(['', '', '', '', '', ''])
-                row_num += 1
-        
-        # Auto-adjust column widths
-        column_widths = {
-            'A': 12,  # Datum
-            'B': 35,  # Trénink/Poznámka
-            'C': 30,  # Cvik
-            'D': 8,   # Série
-            'E': 12,  # Opakování
-            'F': 12   # Váha
-        }
-        
-        for col, width in column_widths.items():
-            ws.column_dimensions[col].width = width
-        
-        # Add borders (only to non-empty cells)
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        
-        for row in ws.iter_rows(min_row=1, max_row=row_num-1, min_col=1, max_col=6):
-            for cell in row:
-                if cell.value:  # Only add border if cell has content
-                    cell.border = thin_border
-        
-        # Save to temporary file
-        tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
-        wb.save(tmp_file.name)
-        tmp_file.close()
-        
-        # Read file and return
-        with open(tmp_file.name, 'rb') as f:
-            excel_data = f.read()
-        
-        import os
-        os.unlink(tmp_file.name)
+        # Small workbooks stay in memory; only very large ones spill to disk
+        buffer = tempfile.SpooledTemporaryFile(max_size=exports.XLSX_SPOOL_BYTES)
+        try:
+            rows = exports.export_rows_query(current_user.id, include_empty_workouts=True)
+            workout_count = exports.write_xlsx(rows, buffer)
+            buffer.seek(0)
+        except Exception:
+            buffer.close()
+            raise
         
-        logger.info(f'Excel export for user {current_user.username}: {len(workouts)} workouts')
+        logger.info(f'Excel export for user {current_user.username}: {workout_count} workouts')
         
-        from flask import Response
-        return Response(
-            excel_data,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            headers={
-                'Content-Disposition': 'attachment; filename=fittrack_export.xlsx',
-            }
+        # send_file streams the buffer and closes it when the response is done
+        return send_file(
+            buffer,
+            mimetype=exports.XLSX_MIMETYPE,
+            as_attachment=True,
+            download_name='fittrack_export.xlsx'
         )
     
     except Exception as e:
@@ -661,29 +1126,122 @@ def export_excel():
 # ADMIN ENDPOINTS
 # ============================================================================
 
+ADMIN_PAGE_MAX = 200
+ADMIN_USER_SORTS = ('id', 'username', 'workout_count')
+
+
 @api_bp.route('/admin/users', methods=['GET'])
 @login_required
 def admin_get_users():
-    """Get all users (admin only)"""
+    """Get users with their workout counts (admin only)
+    
+    Query params:
+        q: substring search in username or email
+        sort: 'id' (default), 'username' or 'workout_count'
+        order: 'asc' (default) or 'desc'
+        limit: page size (max 200); enables cursor pagination via 'next_cursor'
+        cursor: 'next_cursor' value from the previous page
+    
+    Workout counts come from a single LEFT JOIN / GROUP BY.
+    """
     if current_user.username != 'admin':
         return jsonify({'ok': False, 'error': 'Unauthorized'}), 403
     
     try:
-        users = User.query.order_by(User.id.asc()).all()
+        args = request.args
+        
+        sort = args.get('sort', 'id')
+        if sort not in ADMIN_USER_SORTS:
+            return _json_err('Invalid sort (use: id, username, workout_count)', 400)
+        order = args.get('order', 'asc')
+        if order not in ('asc', 'desc'):
+            return _json_err('Invalid order (use: asc, desc)', 400)
+        descending = order == 'desc'
+        
+        limit = None
+        if args.get('limit'):
+            try:
+                limit = int(args['limit'])
+            except ValueError:
+                return _json_err('Invalid limit', 400)
+            if not (1 <= limit <= ADMIN_PAGE_MAX):
+                return _json_err(f'Limit must be between 1 and {ADMIN_PAGE_MAX}', 400)
+        
+        cursor = None
+        if args.get('cursor'):
+            converters = {'id': [int], 'username': [str, int], 'workout_count': [int, int]}[sort]
+            try:
+                cursor = _decode_cursor(args['cursor'], converters)
+            except ValueError:
+                return _json_err('Invalid cursor', 400)
+        
+        search = args.get('q', '').strip()
+        search_filter = None
+        if search:
+            pattern = f'%{search}%'
+            search_filter = or_(User.username.ilike(pattern), User.email.ilike(pattern))
+        
+        total_query = db.session.query(db.func.count(User.id))
+        if search_filter is not None:
+            total_query = total_query.filter(search_filter)
+        total = total_query.scalar()
+        
+        workout_count = db.func.count(Workout.id)
+        query = db.session.query(User, workout_count.label('workout_count'))\
+            .outerjoin(Workout, Workout.user_id == User.id)
+        if search_filter is not None:
+            query = query.filter(search_filter)
+        query = query.group_by(User.id)
+        
+        sort_columns = {
+            'id': [User.id],
+            'username': [User.username, User.id],
+            'workout_count': [workout_count, User.id],
+        }[sort]
+        if cursor:
+            condition = _keyset_condition(sort_columns, cursor, descending)
+            query = query.having(condition) if sort == 'workout_count' else query.filter(condition)
+        query = query.order_by(*[col.desc() if descending else col.asc() for col in sort_columns])
+        
+        next_cursor = None
+        if limit is not None:
+            rows = query.limit(limit + 1).all()
+            if len(rows) > limit:
+                rows = rows[:limit]
+                last_user, last_count = rows[-1]
+                next_cursor = _encode_cursor({
+                    'id': [last_user.id],
+                    'username': [last_user.username, last_user.id],
+                    'workout_count': [last_count, last_user.id],
+                }[sort])
+        else:
+            rows = query.all()
         
         users_data = []
-        for user in users:
+        for user, count in rows:
             user_info = user.to_dict()
-            user_info['workout_count'] = Workout.query.filter_by(user_id=user.id).count()
+            user_info['workout_count'] = count
             users_data.append(user_info)
         
-        return jsonify({'ok': True, 'users': users_data})
+        payload = {'ok': True, 'users': users_data, 'total': total}
+        if limit is not None:
+            payload['next_cursor'] = next_cursor
+        return jsonify(payload)
     
     except Exception as e:
         logger.error(f'Admin users fetch error: {str(e)}')
         return jsonify({'ok': False, 'error': 'Failed to fetch users'}), 500
 
 
+@api_bp.route('/admin/cache', methods=['GET'])
+@login_required
+def admin_cache_stats():
+    """User-loader cache counters for this worker process (admin only)"""
+    if current_user.username != 'admin':
+        return jsonify({'ok': False, 'error': 'Unauthorized'}), 403
+    return jsonify({'ok': True, 'pid': os.getpid(), 'user_cache': user_cache.stats()})
+
+
 # ============================================================================
 # OAUTH (GOOGLE)
 # ============================================================================
@@ -915,12 +1473,13 @@ def google_callback():
                 email=email,
                 oauth_provider='google',
                 oauth_sub=sub,
-                password=generate_password_hash(os.urandom(16).hex())
+                password=passwords.hash_password(os.urandom(16).hex())
             )
             db.session.add(user)
             db.session.commit()
             logger.info(f'New user created: {user.id}')
         
+        user_cache.invalidate(user.id)
         login_user(user)
         logger.info(f'Google OAuth login successful: {user.username} (id={user.id})')
         print(f'=== LOGIN_USER CALLED for user {user.id} ===', flush=True)
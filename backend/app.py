@@ -5,15 +5,13 @@ Clean architecture with proper initialization
 """
 import os
 import logging
-from datetime import datetime
-from traceback import format_exc
 
 from flask import Flask, request, jsonify, g
 import uuid
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_cors import CORS
-from sqlalchemy import text
+from sqlalchemy import text, event
 
 # Initialize extensions (will be bound to app in create_app)
 db = SQLAlchemy()
@@ -33,6 +31,10 @@ def create_app(config_name='development'):
     """
     app = Flask(__name__)
     
+    # Fast JSON encoding for all jsonify() responses
+    from backend.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+    
     # Load configuration
     from backend.config import get_config
     config_class = get_config()
@@ -45,6 +47,11 @@ def create_app(config_name='development'):
     db.init_app(app)
     login_manager.init_app(app)
     
+    # Compress API responses (gzip/brotli) above COMPRESS_MIN_SIZE; registered
+    # before CORS so its after_request hook runs after CORS has added Vary
+    from backend.compression import init_compression
+    init_compression(app)
+    
     # Configure CORS
     CORS(app, 
          resources={r"/api/*": {"origins": app.config['CORS_ORIGINS']}},
@@ -96,20 +103,31 @@ def create_app(config_name='development'):
     def favicon():
         # Serve a real favicon if available in instance/static, otherwise 204
         try:
-            static_dir = os.path.join(app.instance_path, 'static')
-            ico_path = os.path.join(static_dir, 'favicon.ico')
-            if os.path.exists(ico_path):
+            ico_path = _ensure_favicon(app)
+            if ico_path:
                 from flask import send_file
                 return send_file(ico_path, mimetype='image/x-icon')
         except Exception:
             pass
         return ('', 204)
     
-    # User loader for Flask-Login
+    # Password hashing runs in a process pool, off the request threads
+    from backend import passwords
+    passwords.configure(
+        method=f"pbkdf2:sha256:{app.config['PASSWORD_HASH_ITERATIONS']}",
+        workers=app.config['PASSWORD_HASH_WORKERS'],
+        queue_size=app.config['PASSWORD_HASH_QUEUE'],
+        nice=app.config['PASSWORD_HASH_NICE'],
+        timeout=app.config['PASSWORD_HASH_TIMEOUT']
+    )
+    
+    # User loader for Flask-Login (served from a per-process cache)
+    from backend.user_cache import user_cache, load_user_cached
+    user_cache.configure(app.config['USER_CACHE_SIZE'], app.config['USER_CACHE_TTL'])
+    
     @login_manager.user_loader
     def load_user(user_id):
-        from backend.database_models import User
-        return User.query.get(int(user_id))
+        return load_user_cached(int(user_id))
     
     # Root endpoint
     @app.route('/')
@@ -135,8 +153,7 @@ def create_app(config_name='development'):
     # Global error handler
     @app.errorhandler(Exception)
     def handle_exception(e):
-        """Global exception handler with logging"""
-        tb = format_exc()
+        """Global exception handler; the traceback goes through the queued log pipeline"""
         # Include request id in the logs for traceability
         rid = getattr(g, 'request_id', None)
         if rid:
@@ -144,16 +161,6 @@ def create_app(config_name='development'):
         else:
             logger.exception(f'Unhandled exception: {str(e)}')
         
-        # Log to file as fallback
-        try:
-            log_path = os.path.join(app.instance_path, 'error.log')
-            with open(log_path, 'a', encoding='utf-8') as fh:
-                fh.write(f"=== {datetime.utcnow().isoformat()} UTC ===\n")
-                fh.write(tb)
-                fh.write("\n\n")
-        except Exception:
-            pass
-        
         # Return JSON for API routes and include request id so client can report it
         if request.path.startswith('/api'):
             payload = {'ok': False, 'error': 'Internal Server Error'}
@@ -166,55 +173,169 @@ def create_app(config_name='development'):
     
     # Create database tables
     with app.app_context():
+        _configure_sqlite(app)
         _init_database(app)
 
-        # Ensure instance/static and place favicon.ico if a base64 file exists
-        try:
-            static_dir = os.path.join(app.instance_path, 'static')
-            os.makedirs(static_dir, exist_ok=True)
-            b64_src = os.path.join(os.path.dirname(__file__), 'static', 'favicon.ico.b64')
-            ico_dest = os.path.join(static_dir, 'favicon.ico')
-            if os.path.exists(b64_src) and not os.path.exists(ico_dest):
-                import base64
-                with open(b64_src, 'rb') as f:
-                    b64 = f.read()
-                try:
-                    data = base64.b64decode(b64)
-                    with open(ico_dest, 'wb') as w:
-                        w.write(data)
-                    logger.info('Wrote favicon to instance static directory')
-                except Exception as e:
-                    logger.warning(f'Could not write favicon: {str(e)}')
-        except Exception:
-            pass
+        # Per-request SQL counting and query budgets
+        from backend.query_stats import init_query_stats
+        init_query_stats(app, db.engine)
+
+        # Latency / status / DB usage metrics at /metrics
+        from backend.metrics import init_metrics
+        init_metrics(app)
     
     return app
 
 
+def _ensure_favicon(app):
+    """Path of instance/static/favicon.ico, decoded from the bundled base64 on first use"""
+    static_dir = os.path.join(app.instance_path, 'static')
+    ico_dest = os.path.join(static_dir, 'favicon.ico')
+    if os.path.exists(ico_dest):
+        return ico_dest
+    b64_src = os.path.join(os.path.dirname(__file__), 'static', 'favicon.ico.b64')
+    if not os.path.exists(b64_src):
+        return None
+    try:
+        import base64
+        os.makedirs(static_dir, exist_ok=True)
+        with open(b64_src, 'rb') as f:
+            data = base64.b64decode(f.read())
+        with open(ico_dest, 'wb') as w:
+            w.write(data)
+        logger.info('Wrote favicon to instance static directory')
+        return ico_dest
+    except Exception as e:
+        logger.warning(f'Could not write favicon: {str(e)}')
+        return None
+
+
 def _setup_logging(app):
-    """Configure application logging"""
-    log_path = os.path.join(app.instance_path, 'error.log')
+    """Configure application logging (queued, rotated; see backend/log_pipeline.py)"""
+    from backend.log_pipeline import setup_logging
+    setup_logging(app, [logger, app.logger])
+
+
+def _configure_sqlite(app):
+    """Apply SQLITE_PRAGMAS to every new DB-API connection of the app engine"""
+    if db.engine.dialect.name != 'sqlite':
+        return
     
-    file_handler = logging.FileHandler(log_path)
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(
-        logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
-    )
+    pragmas = {name: value for name, value in app.config.get('SQLITE_PRAGMAS', {}).items() if value}
+    if not pragmas:
+        return
+    
+    @event.listens_for(db.engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
     
-    logger.setLevel(logging.DEBUG)
-    if not logger.handlers:
-        logger.addHandler(file_handler)
+    logger.info(f'SQLite pragmas: {pragmas}')
+
+
+def _alembic_revisions():
+    """(revisions, head) of backend/migrations, read from the revision files
+
+    Parsed with a regex instead of Alembic's ScriptDirectory so worker boot
+    does not import Alembic. head is None unless there is exactly one.
+    """
+    import re
+    import glob
     
-    app.logger.addHandler(file_handler)
+    revisions, parents = set(), set()
+    pattern = re.compile(r"^(revision|down_revision)\b[^=]*=\s*(.+)$", re.MULTILINE)
+    versions_dir = os.path.join(os.path.dirname(__file__), 'migrations', 'versions')
+    for path in glob.glob(os.path.join(versions_dir, '*.py')):
+        with open(path, encoding='utf-8') as f:
+            for key, value in pattern.findall(f.read()):
+                ids = re.findall(r"['\"]([0-9a-zA-Z_]+)['\"]", value)
+                (revisions if key == 'revision' else parents).update(ids)
+    heads = revisions - parents
+    return revisions, (heads.pop() if len(heads) == 1 else None)
+
+
+def _schema_stamp():
+    """Revision recorded in alembic_version, or None if the DB is not stamped"""
+    try:
+        with db.engine.connect() as conn:
+            return conn.execute(text('SELECT version_num FROM alembic_version')).scalar()
+    except Exception:
+        return None
 
 
 def _init_database(app):
-    """Initialize database schema"""
+    """Initialize database schema
+    
+    create_all() plus the column/index introspection bring any database
+    (fresh, unstamped, or stamped at an older revision) up to the models,
+    after which it is stamped with the Alembic head, so Alembic never
+    replays the changes made here. SCHEMA_CHECK=auto skips all of it when
+    the stamp already is the head; "full" always runs it, "skip" never
+    touches the schema.
+    """
+    mode = app.config['SCHEMA_CHECK']
+    if mode == 'skip':
+        return
     try:
+        revisions, head = _alembic_revisions()
+        stamp = _schema_stamp()
+        if mode == 'auto' and head and stamp == head:
+            logger.info(f'Database schema at revision {head}, skipping introspection')
+            return
+        if stamp is not None and stamp not in revisions:
+            # Stamped by newer code (e.g. after a rollback): leave it to Alembic
+            logger.error(f'Database stamped with unknown revision {stamp}, not touching the schema')
+            return
+        
+        from sqlalchemy import inspect
+        inspector = inspect(db.engine)
+        fresh = not inspector.has_table('user')
+        # Before the exercise dictionary, rollups and records were keyed by
+        # exercise name; drop them so create_all() recreates them by id
+        named_exercises = not fresh and not inspector.has_table('exercise')
+        if named_exercises:
+            for table in ('exercise_rollup', 'personal_record'):
+                db.session.execute(text(f'DROP TABLE IF EXISTS {table}'))
+            db.session.commit()
+        had_rollups = not named_exercises and inspector.has_table('exercise_rollup')
+        had_records = not named_exercises and inspector.has_table('personal_record')
         db.create_all()
         
+        if fresh or named_exercises:
+            from backend import exercise_names
+            exercise_names.seed()
+            db.session.commit()
+        
         # Ensure all columns exist (migration compatibility)
-        _ensure_schema_columns()
+        upgraded = _ensure_schema_columns()
+        
+        # create_all() just added derived tables to an existing database
+        if not fresh and not had_rollups:
+            from backend import rollups
+            written = rollups.rebuild()
+            db.session.commit()
+            logger.info(f'Backfilled exercise rollups: {written} rows')
+        if not fresh and not had_records:
+            from backend import records
+            written = records.rebuild()
+            db.session.commit()
+            logger.info(f'Backfilled personal records: {written} rows')
+        
+        # The database now matches the models, i.e. the head revision; stamp
+        # it so the next start takes the fast path and Alembic does not
+        # replay history. Not after a failed step: `alembic upgrade` must
+        # still see the old revision then.
+        if head and upgraded and stamp != head:
+            with db.engine.begin() as conn:
+                conn.execute(text('CREATE TABLE IF NOT EXISTS alembic_version '
+                                  '(version_num VARCHAR(32) NOT NULL PRIMARY KEY)'))
+                conn.execute(text('DELETE FROM alembic_version'))
+                conn.execute(text('INSERT INTO alembic_version (version_num) VALUES (:v)'), {'v': head})
+            logger.info(f'Database schema stamped at revision {head} (was {stamp or "unstamped"})')
         
         logger.info('Database initialized successfully')
     except Exception as e:
@@ -222,7 +343,11 @@ def _init_database(app):
 
 
 def _ensure_schema_columns():
-    """Ensure all required columns exist (backward compatibility)"""
+    """Ensure all required columns exist (backward compatibility)
+    
+    Returns True when every step succeeded, i.e. the schema is at head.
+    """
+    failed = []
     try:
         from sqlalchemy import inspect
         inspector = inspect(db.engine)
@@ -232,7 +357,7 @@ def _ensure_schema_columns():
         try:
             existing_cols = [col['name'] for col in inspector.get_columns('user')]
         except Exception:
-            return
+            return False
         
         # Define required columns with their ALTER statements
         required_columns = {
@@ -242,7 +367,8 @@ def _ensure_schema_columns():
             'created_at': "ALTER TABLE user ADD COLUMN created_at DATETIME",
             'age': "ALTER TABLE user ADD COLUMN age INTEGER",
             'height_cm': "ALTER TABLE user ADD COLUMN height_cm FLOAT",
-            'weight_kg': "ALTER TABLE user ADD COLUMN weight_kg FLOAT"
+            'weight_kg': "ALTER TABLE user ADD COLUMN weight_kg FLOAT",
+            'data_version': "ALTER TABLE user ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0"
         }
         
         # Add missing columns
@@ -253,6 +379,41 @@ def _ensure_schema_columns():
                     logger.info(f'Added column: {col_name}')
                 except Exception as e:
                     logger.warning(f'Could not add column {col_name}: {str(e)}')
+                    failed.append(col_name)
+        
+        # Denormalized workout totals (see migration c06905846ed9), backfilled once when added
+        workout_columns = {
+            'exercise_count': "ALTER TABLE workout ADD COLUMN exercise_count INTEGER NOT NULL DEFAULT 0",
+            'total_sets': "ALTER TABLE workout ADD COLUMN total_sets INTEGER NOT NULL DEFAULT 0",
+            'total_reps': "ALTER TABLE workout ADD COLUMN total_reps INTEGER NOT NULL DEFAULT 0",
+            'total_volume': "ALTER TABLE workout ADD COLUMN total_volume FLOAT NOT NULL DEFAULT 0",
+        }
+        existing_workout_cols = [col['name'] for col in inspector.get_columns('workout')]
+        added_totals = False
+        for col_name, alter_stmt in workout_columns.items():
+            if col_name not in existing_workout_cols:
+                try:
+                    db.session.execute(text(alter_stmt))
+                    logger.info(f'Added column: workout.{col_name}')
+                    added_totals = True
+                except Exception as e:
+                    logger.warning(f'Could not add column workout.{col_name}: {str(e)}')
+                    failed.append(f'workout.{col_name}')
+        if added_totals:
+            from backend.database_models import Workout, workout_totals_subqueries
+            db.session.execute(
+                Workout.__table__.update().values(workout_totals_subqueries(Workout.__table__.c.id))
+            )
+            logger.info('Backfilled workout exercise totals')
+        
+        # Exercise dictionary (see migration 7f3c2a9d1e40): names become exercise ids
+        existing_exercise_cols = [col['name'] for col in inspector.get_columns('workout_exercise')]
+        if 'exercise_id' not in existing_exercise_cols or 'name' in existing_exercise_cols:
+            try:
+                _convert_exercise_names(existing_exercise_cols)
+            except Exception as e:
+                logger.warning(f'Could not convert workout_exercise.name to exercise ids: {str(e)}')
+                failed.append('workout_exercise.exercise_id')
         
         # Create unique index on email if it doesn't exist
         try:
@@ -260,7 +421,47 @@ def _ensure_schema_columns():
         except Exception:
             pass
         
+        # Hot-path composite indexes (see migration 92e469e59795)
+        index_statements = [
+            "CREATE INDEX IF NOT EXISTS ix_workout_user_date_id ON workout(user_id, date DESC, id DESC)",
+            "CREATE INDEX IF NOT EXISTS ix_workout_exercise_workout_exercise ON workout_exercise(workout_id, exercise_id)",
+            "DROP INDEX IF EXISTS ix_workout_user_id",
+            "DROP INDEX IF EXISTS ix_workout_exercise_workout_id",
+        ]
+        for stmt in index_statements:
+            try:
+                db.session.execute(text(stmt))
+            except Exception as e:
+                logger.warning(f'Could not apply index statement ({stmt}): {str(e)}')
+                failed.append(stmt)
+        
         db.session.commit()
+        return not failed
     except Exception as e:
         logger.error(f'Schema migration failed: {str(e)}')
         db.session.rollback()
+        return False
+
+
+def _convert_exercise_names(existing_cols):
+    """Replace workout_exercise.name by an exercise_id into the exercise dictionary
+    
+    Names are resolved most used spelling first, so that spelling names a
+    new dictionary entry. Only names with the same normalized key share an
+    entry, as in migration 7f3c2a9d1e40; near-duplicates are merged by hand
+    (scripts/merge_exercise_names.py). Dropping the name column needs SQLite
+    3.35+; if that fails, the next start resumes here.
+    """
+    from backend import exercise_names
+    
+    if 'exercise_id' not in existing_cols:
+        db.session.execute(text('ALTER TABLE workout_exercise ADD COLUMN exercise_id INTEGER REFERENCES exercise(id)'))
+    names = [name for name, in db.session.execute(text(
+        'SELECT name FROM workout_exercise GROUP BY name ORDER BY COUNT(*) DESC, name'))]
+    ids = exercise_names.resolve(names)
+    if ids:
+        db.session.execute(text('UPDATE workout_exercise SET exercise_id = :exercise_id WHERE name = :name'),
+                           [{'exercise_id': exercise_id, 'name': name} for name, exercise_id in ids.items()])
+    db.session.execute(text('DROP INDEX IF EXISTS ix_workout_exercise_workout_name'))
+    db.session.execute(text('ALTER TABLE workout_exercise DROP COLUMN name'))
+    logger.info(f'Converted {len(names)} exercise names to the exercise dictionary')
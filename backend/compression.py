@@ -0,0 +1,115 @@
+# backend/compression.py
+"""
+Response Compression
+gzip / brotli encoding of API responses, including streamed exports
+"""
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+
+def _encodings():
+    """Supported encodings in order of preference"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+class _Compressor:
+    """Incremental compressor with a common interface for gzip and brotli"""
+
+    def __init__(self, encoding, level):
+        if encoding == 'br':
+            # Brotli quality 0-11; map the gzip-style level onto it
+            self._obj = brotli.Compressor(quality=min(level, 11))
+            self._compress = self._obj.process
+            self._flush = self._obj.flush
+            self._finish = self._obj.finish
+        else:
+            # wbits=31 -> gzip container
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+            self._compress = self._obj.compress
+            self._flush = lambda: self._obj.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._obj.flush
+
+    def compress(self, data):
+        """Compress data and flush it, so streamed chunks reach the client"""
+        return self._compress(data) + self._flush()
+
+    def finish(self):
+        return self._finish()
+
+
+def _compressed_stream(chunks, compressor):
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            if chunk:
+                yield compressor.compress(chunk)
+        yield compressor.finish()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+def _merge_vary(response):
+    """Fold repeated Vary headers into one
+
+    Flask-CORS appends "Vary: Origin" as a second header when Vary is already
+    set, and response.vary only reads the first one, so the next vary.add()
+    (ours, or the session's "Cookie") would drop it.
+    """
+    values = response.headers.getlist('Vary')
+    if len(values) > 1:
+        response.headers['Vary'] = ', '.join(values)
+
+
+def init_compression(app):
+    """Register the after_request hook that compresses eligible responses
+
+    Buffered responses are compressed when at least COMPRESS_MIN_SIZE bytes;
+    streamed ones (CSV export) are always compressed chunk by chunk. File
+    responses (send_file, e.g. the already-zipped XLSX export), non-200
+    responses and other mimetypes are left alone; 304s from etag_cached get
+    their weak ETag and Vary there.
+    """
+    level = app.config['COMPRESS_LEVEL']
+    if level <= 0:
+        return
+    min_size = app.config['COMPRESS_MIN_SIZE']
+    mimetypes = set(app.config['COMPRESS_MIMETYPES'])
+
+    @app.after_request
+    def _compress_response(response):
+        _merge_vary(response)
+        if response.status_code != 200 or response.mimetype not in mimetypes:
+            return response
+        response.vary.add('Accept-Encoding')
+        if response.direct_passthrough or 'Content-Encoding' in response.headers:
+            return response
+
+        encoding = request.accept_encodings.best_match(_encodings())
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = _compressed_stream(response.response, _Compressor(encoding, level))
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            compressor = _Compressor(encoding, level)
+            response.set_data(compressor.compress(data) + compressor.finish())
+
+        response.headers['Content-Encoding'] = encoding
+        # The representation differs per encoding, so a strong ETag would be wrong
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
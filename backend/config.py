@@ -5,6 +5,7 @@ Secure configuration management with environment variables
 """
 import os
 from dotenv import load_dotenv
+from sqlalchemy.engine import make_url
 
 load_dotenv()
 
@@ -19,6 +20,27 @@ def _read_secret_file(path: str) -> str | None:
         pass
     return None
 
+def _sqlite_engine_options(uri: str) -> dict:
+    """Connection-pool options for a file-backed SQLite database, tunable via environment variables.
+
+    Other databases keep SQLAlchemy's defaults. In-memory SQLite (including
+    file::memory: and mode=memory URIs) uses a singleton/static pool which
+    does not accept sizing options.
+    """
+    url = make_url(uri)
+    if url.get_backend_name() != 'sqlite':
+        return {}
+    database = url.database or ''
+    if database in ('', ':memory:') or database.startswith('file::memory:') or url.query.get('mode') == 'memory':
+        return {}
+    return {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '5')),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '5')),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', '10')),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '1800')),
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'False').lower() == 'true',
+    }
+
 class Config:
     """Base configuration"""
     # Security
@@ -29,6 +51,21 @@ class Config:
     _db_path = os.path.join(_basedir, 'instance', 'db.sqlite3')
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', f'sqlite:///{_db_path}')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = _sqlite_engine_options(SQLALCHEMY_DATABASE_URI)
+    # Startup schema handling: auto (trust a current Alembic stamp) | full | skip
+    SCHEMA_CHECK = os.getenv('SCHEMA_CHECK', 'auto')
+    
+    # SQLite tuning - applied as PRAGMAs on every new connection (empty value = SQLite default).
+    # WAL lets readers proceed while a writer commits; NORMAL sync is durable in WAL mode
+    # except for the last transactions on power loss.
+    SQLITE_PRAGMAS = {
+        'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'busy_timeout': os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'),
+        'cache_size': os.getenv('SQLITE_CACHE_SIZE', '-20000'),  # negative = KiB
+        'mmap_size': os.getenv('SQLITE_MMAP_SIZE', '268435456'),
+        'temp_store': os.getenv('SQLITE_TEMP_STORE', 'MEMORY'),
+    }
     
     # CSRF Protection
     WTF_CSRF_ENABLED = True
@@ -49,6 +86,52 @@ class Config:
     FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:8501')
     BACKEND_URL = os.getenv('BACKEND_URL', 'http://localhost:5000')
     
+    # Password hashing: PBKDF2 cost and the process pool that runs it (0 workers = inline)
+    PASSWORD_HASH_ITERATIONS = int(os.getenv('PASSWORD_HASH_ITERATIONS', '600000'))
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', str(min(os.cpu_count() or 1, 2))))
+    PASSWORD_HASH_QUEUE = int(os.getenv('PASSWORD_HASH_QUEUE', '32'))  # jobs in flight per process
+    PASSWORD_HASH_NICE = int(os.getenv('PASSWORD_HASH_NICE', '10'))
+    PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', '10'))
+    
+    # POST /api/workouts/bulk: maximum request body (JSON array or NDJSON)
+    BULK_MAX_BYTES = int(os.getenv('BULK_MAX_BYTES', str(8 * 1024 * 1024)))
+    
+    # Per-process cache for the Flask-Login user loader (0 disables it)
+    USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', '1024'))
+    USER_CACHE_TTL = float(os.getenv('USER_CACHE_TTL', '30'))
+    
+    # Response compression (gzip, or brotli when installed); 0 disables it
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', '6'))
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))  # bytes
+    COMPRESS_MIMETYPES = ('application/json', 'text/csv', 'text/plain', 'text/html')
+    
+    # Logging: queued, written by a background thread to instance/LOG_FILE
+    LOG_FILE = os.getenv('LOG_FILE', 'error.log')
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')  # text | json (JSON lines)
+    # LOG_ROTATE=external (default) writes through a WatchedFileHandler and
+    # leaves rotation to logrotate: every gunicorn worker appends to the same
+    # file and reopens it once logrotate has moved it away. size | time rotate
+    # in process, which is only safe with a single process; several workers
+    # would each rename the shared file and lose or split records.
+    LOG_ROTATE = os.getenv('LOG_ROTATE', 'external')  # external | size | time
+    LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+    LOG_ROTATE_WHEN = os.getenv('LOG_ROTATE_WHEN', 'midnight')
+    LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '5'))
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+    LOG_INFO_SAMPLE_RATE = float(os.getenv('LOG_INFO_SAMPLE_RATE', '1.0'))  # share of INFO/DEBUG kept
+    
+    # Prometheus metrics at /metrics: off unless enabled, and when METRICS_TOKEN
+    # is set scrapes must send "Authorization: Bearer <token>"
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'False').lower() == 'true'
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+    
+    # Per-request SQL budgets (0 disables a check); see backend/query_stats.py
+    QUERY_BUDGET = int(os.getenv('QUERY_BUDGET', '10'))
+    QUERY_REPEAT_THRESHOLD = int(os.getenv('QUERY_REPEAT_THRESHOLD', '5'))
+    QUERY_BUDGET_STRICT = os.getenv('QUERY_BUDGET_STRICT', 'False').lower() == 'true'
+    QUERY_COUNT_HEADER = False
+    
     # Admin
     ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'Admin&4')
     
@@ -63,6 +146,8 @@ class Config:
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
+    QUERY_COUNT_HEADER = True
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
     
 class ProductionConfig(Config):
     """Production configuration"""
@@ -28,9 +28,13 @@ class User(UserMixin, db.Model):
     
     # Metadata
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=True)
+    # Bumped by every write to the user's data; drives ETags on read endpoints
+    data_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Relationships
     workouts = db.relationship('Workout', back_populates='user', lazy='dynamic', cascade='all, delete-orphan')
+    exercise_rollups = db.relationship('ExerciseRollup', lazy='dynamic', cascade='all, delete-orphan')
+    personal_records = db.relationship('PersonalRecord', lazy='dynamic', cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<User {self.username}>'
@@ -67,10 +71,17 @@ class Workout(db.Model):
     __tablename__ = 'workout'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     date = db.Column(db.Date, nullable=False, index=True)
     note = db.Column(db.Text, nullable=True)
     
+    # Denormalized from workout_exercise; every write path keeps them exact
+    # (see api_routes._exercise_totals and scripts/verify_workout_totals.py)
+    exercise_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    total_sets = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    total_reps = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    total_volume = db.Column(db.Float, nullable=False, default=0.0, server_default='0')
+    
     # Relationships
     user = db.relationship('User', back_populates='workouts')
     exercises = db.relationship('WorkoutExercise', back_populates='workout', lazy='dynamic', cascade='all, delete-orphan')
@@ -85,11 +96,76 @@ class Workout(db.Model):
             'user_id': self.user_id,
             'date': self.date.isoformat(),
             'note': self.note or '',
-            'exercise_count': self.exercises.count()
+            'exercise_count': self.exercise_count or 0,
+            'total_sets': self.total_sets or 0,
+            'total_reps': self.total_reps or 0,
+            'total_volume': float(self.total_volume or 0)
         }
         if include_exercises:
             data['exercises'] = [ex.to_dict() for ex in self.exercises.all()]
         return data
+    
+    @staticmethod
+    def row_to_dict(row):
+        """Serialize a listing row (id, user_id, date, note and the totals)"""
+        return {
+            'id': row.id,
+            'user_id': row.user_id,
+            'date': row.date.isoformat(),
+            'note': row.note or '',
+            'exercise_count': row.exercise_count or 0,
+            'total_sets': row.total_sets or 0,
+            'total_reps': row.total_reps or 0,
+            'total_volume': float(row.total_volume or 0)
+        }
+
+
+# Serves per-user listings ordered by date and keyset pagination on (date, id).
+# Also replaces a separate user_id index, which would be a prefix of this one.
+db.Index('ix_workout_user_date_id', Workout.user_id, Workout.date.desc(), Workout.id.desc())
+
+
+class Exercise(db.Model):
+    """Canonical exercise of the dictionary, shared by all users
+    
+    Rows are added by backend.exercise_names.resolve() the first time a name is
+    logged; muscle_group and category are set once on insert.
+    """
+    __tablename__ = 'exercise'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(120), unique=True, nullable=False)
+    muscle_group = db.Column(db.String(20), nullable=True)
+    category = db.Column(db.String(20), nullable=True)
+    
+    # Relationships
+    aliases = db.relationship('ExerciseAlias', back_populates='exercise', cascade='all, delete-orphan')
+    
+    def __repr__(self):
+        return f'<Exercise {self.id} {self.name}>'
+    
+    def to_dict(self):
+        """Serialize exercise to dictionary"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'muscle_group': self.muscle_group,
+            'category': self.category
+        }
+
+
+class ExerciseAlias(db.Model):
+    """Normalized spelling of an exercise name (see backend.exercise_catalog.normalize_name)"""
+    __tablename__ = 'exercise_alias'
+    
+    key = db.Column(db.String(120), primary_key=True)
+    exercise_id = db.Column(db.Integer, db.ForeignKey('exercise.id'), nullable=False, index=True)
+    
+    # Relationships
+    exercise = db.relationship('Exercise', back_populates='aliases')
+    
+    def __repr__(self):
+        return f'<ExerciseAlias {self.key} -> {self.exercise_id}>'
 
 
 class WorkoutExercise(db.Model):
@@ -97,14 +173,20 @@ class WorkoutExercise(db.Model):
     __tablename__ = 'workout_exercise'
     
     id = db.Column(db.Integer, primary_key=True)
-    workout_id = db.Column(db.Integer, db.ForeignKey('workout.id'), nullable=False, index=True)
-    name = db.Column(db.String(120), nullable=False)
+    workout_id = db.Column(db.Integer, db.ForeignKey('workout.id'), nullable=False)
+    exercise_id = db.Column(db.Integer, db.ForeignKey('exercise.id'), nullable=False)
     sets = db.Column(db.Integer, nullable=False, default=3)
     reps = db.Column(db.Integer, nullable=False, default=10)
     weight = db.Column(db.Float, nullable=True)
     
     # Relationships
     workout = db.relationship('Workout', back_populates='exercises')
+    exercise = db.relationship('Exercise', lazy='joined', innerjoin=True)
+    
+    @property
+    def name(self):
+        """Canonical name from the exercise dictionary"""
+        return self.exercise.name
     
     def __repr__(self):
         return f'<Exercise {self.name} - {self.sets}x{self.reps}>'
@@ -114,8 +196,122 @@ class WorkoutExercise(db.Model):
         return {
             'id': self.id,
             'workout_id': self.workout_id,
-            'name': self.name,
+            'exercise_id': self.exercise_id,
+            'name': self.exercise.name,
+            'muscle_group': self.exercise.muscle_group,
+            'category': self.exercise.category,
             'sets': self.sets,
             'reps': self.reps,
             'weight': self.weight
         }
+
+
+# Exercises of a workout; also covers per-workout exercise lookups
+db.Index('ix_workout_exercise_workout_exercise', WorkoutExercise.workout_id, WorkoutExercise.exercise_id)
+
+
+def exercise_volume(exercise_table):
+    """SQL expression for the volume of one workout_exercise row (sets x reps x weight)"""
+    return exercise_table.c.sets * exercise_table.c.reps * db.func.coalesce(exercise_table.c.weight, 0)
+
+
+def workout_totals_subqueries(workout_column):
+    """Correlated aggregates over workout_exercise for each denormalized Workout total"""
+    exercises = WorkoutExercise.__table__
+    
+    def aggregate(expr):
+        return db.select(db.func.coalesce(expr, 0))\
+            .where(exercises.c.workout_id == workout_column)\
+            .scalar_subquery()
+    
+    return {
+        'exercise_count': aggregate(db.func.count(exercises.c.id)),
+        'total_sets': aggregate(db.func.sum(exercises.c.sets)),
+        'total_reps': aggregate(db.func.sum(exercises.c.reps)),
+        'total_volume': aggregate(db.func.sum(exercise_volume(exercises))),
+    }
+
+
+
+class ExerciseRollup(db.Model):
+    """Per-user, per-exercise training aggregates for one day/week/month bucket
+    
+    Maintained by backend.rollups inside the transactions that write
+    workout_exercise; bucket is the first day of the period (weeks start on
+    Monday).
+    """
+    __tablename__ = 'exercise_rollup'
+    
+    # Primary key order serves both chart reads: (user, grain) over all
+    # exercises and (user, grain, exercise) over a bucket range
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    grain = db.Column(db.String(5), primary_key=True)
+    exercise_id = db.Column(db.Integer, db.ForeignKey('exercise.id'), primary_key=True)
+    bucket = db.Column(db.Date, primary_key=True)
+    
+    entry_count = db.Column(db.Integer, nullable=False, default=0)
+    session_count = db.Column(db.Integer, nullable=False, default=0)
+    total_sets = db.Column(db.Integer, nullable=False, default=0)
+    total_reps = db.Column(db.Integer, nullable=False, default=0)
+    volume = db.Column(db.Float, nullable=False, default=0.0)
+    max_weight = db.Column(db.Float, nullable=True)
+    max_1rm = db.Column(db.Float, nullable=True)
+    
+    # Relationships
+    exercise = db.relationship('Exercise', lazy='joined', innerjoin=True)
+    
+    def __repr__(self):
+        return f'<ExerciseRollup {self.user_id} {self.exercise_id} {self.grain} {self.bucket}>'
+    
+    def to_dict(self):
+        """Serialize rollup to dictionary"""
+        return {
+            'bucket': self.bucket.isoformat(),
+            'exercise_id': self.exercise_id,
+            'exercise': self.exercise.name,
+            'muscle_group': self.exercise.muscle_group,
+            'category': self.exercise.category,
+            'entry_count': self.entry_count,
+            'session_count': self.session_count,
+            'total_sets': self.total_sets,
+            'total_reps': self.total_reps,
+            'volume': self.volume,
+            'max_weight': self.max_weight,
+            'max_1rm': self.max_1rm
+        }
+
+
+class PersonalRecord(db.Model):
+    """Best result of a user in one exercise, per record kind
+    
+    Kinds are listed in backend.records.KINDS. Maintained by backend.records
+    alongside every workout_exercise write.
+    """
+    __tablename__ = 'personal_record'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    exercise_id = db.Column(db.Integer, db.ForeignKey('exercise.id'), primary_key=True)
+    kind = db.Column(db.String(20), primary_key=True)
+    
+    value = db.Column(db.Float, nullable=False)
+    # No foreign key: a deleted workout's records are replaced right after
+    # the delete is flushed, in the same transaction
+    workout_id = db.Column(db.Integer, nullable=False)
+    achieved_on = db.Column(db.Date, nullable=False)
+    
+    # Relationships
+    exercise = db.relationship('Exercise', lazy='joined', innerjoin=True)
+    
+    def __repr__(self):
+        return f'<PersonalRecord {self.user_id} {self.exercise_id} {self.kind}={self.value}>'
+    
+    def to_dict(self):
+        """Serialize record to dictionary"""
+        return {
+            'exercise_id': self.exercise_id,
+            'exercise': self.exercise.name,
+            'kind': self.kind,
+            'value': self.value,
+            'workout_id': self.workout_id,
+            'date': self.achieved_on.isoformat()
+        }
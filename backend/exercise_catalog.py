@@ -0,0 +1,107 @@
+# backend/exercise_catalog.py
+"""
+Exercise Catalog
+Seeded exercises and the rules that map a logged name onto a dictionary key
+
+Imports nothing from the app: migration 7f3c2a9d1e40 loads this file by
+path, so the migration and the app's startup conversion canonicalize names
+with the same code.
+"""
+import unicodedata
+
+# Keyword classification of names that are not in CATALOG, evaluated once
+# when a name enters the dictionary (first match wins)
+MUSCLE_KEYWORDS = {
+    'hrudník': ['bench', 'tlak', 'press', 'fly', 'chest'],
+    'záda': ['pull', 'tah', 'row', 'deadlift', 'mrtvý', 'lat'],
+    'ramena': ['shoulder', 'rameno', 'lateral', 'overhead', 'deltoid'],
+    'biceps': ['curl', 'bicep'],
+    'triceps': ['tricep', 'extension', 'dip'],
+    'nohy': ['squat', 'dřep', 'leg', 'lunge', 'calf'],
+    'core': ['plank', 'abs', 'crunch', 'core'],
+}
+CATEGORY_KEYWORDS = {
+    'Tlaky': ['bench', 'tlak', 'press'],
+    'Dřepy': ['squat', 'dřep'],
+    'Mrtvé tahy': ['deadlift', 'mrtvý'],
+    'Tahy': ['pull', 'tah', 'row'],
+    'Biceps': ['curl', 'bicep'],
+    'Triceps': ['tricep', 'extension'],
+    'Ramena': ['shoulder', 'rameno'],
+}
+OTHER_MUSCLE_GROUP = 'ostatní'
+OTHER_CATEGORY = 'Ostatní'
+
+# Seeded dictionary: (canonical name, muscle group, category, aliases)
+CATALOG = [
+    ('Bench press', 'hrudník', 'Tlaky', ('Bench', 'Tlak na lavici', 'Tlak na lavičce')),
+    ('Dřep', 'nohy', 'Dřepy', ('Dřepy', 'Squat', 'Squats', 'Back squat')),
+    ('Mrtvý tah', 'záda', 'Mrtvé tahy', ('Deadlift', 'Deadlifts')),
+    ('Přítahy na hrazdě', 'záda', 'Tahy', ('Shyby', 'Pull-up', 'Pull-ups', 'Pullups')),
+    ('Tlaky na ramena', 'ramena', 'Ramena', ('Shoulder press', 'Overhead press', 'OHP', 'Military press')),
+    ('Biceps zdvih', 'biceps', 'Biceps', ('Biceps curl', 'Bicep curl', 'Bicepscurl')),
+    ('Triceps kliky', 'triceps', 'Triceps', ('Dips', 'Tricep dips', 'Triceps dips')),
+    ('Výpady', 'nohy', 'Dřepy', ('Lunge', 'Lunges')),
+    ('Leg press', 'nohy', 'Dřepy', ()),
+    ('Veslování', 'záda', 'Tahy', ('Barbell row', 'Barbell rows', 'Bent over row')),
+    ('Kettlebell swing', OTHER_MUSCLE_GROUP, OTHER_CATEGORY, ('Kettlebell swings', 'KB swing')),
+    ('Plank', 'core', OTHER_CATEGORY, ('Prkno',)),
+]
+
+
+def display_name(name):
+    """Name as stored in the dictionary: trimmed, inner whitespace collapsed"""
+    return ' '.join(name.split())
+
+
+def normalize_name(name):
+    """Lookup key of a name: case, diacritics, spaces and punctuation removed
+
+    "Bench press", "Bench Press" and "Benchpress" share the key "benchpress";
+    "Dřep" and "drep" share "drep".
+    """
+    decomposed = unicodedata.normalize('NFKD', name.casefold())
+    key = ''.join(ch for ch in decomposed if ch.isalnum())
+    return key or display_name(name).casefold()
+
+
+def classify(name):
+    """Muscle group and category of a name not in CATALOG (keyword match)"""
+    lowered = name.lower()
+
+    def first_match(keywords, default):
+        for label, words in keywords.items():
+            if any(word in lowered for word in words):
+                return label
+        return default
+
+    return {
+        'muscle_group': first_match(MUSCLE_KEYWORDS, OTHER_MUSCLE_GROUP),
+        'category': first_match(CATEGORY_KEYWORDS, OTHER_CATEGORY),
+    }
+
+
+def catalog_keys():
+    """(name, attributes, keys) of every CATALOG entry, keys covering its aliases"""
+    return [
+        (name, {'muscle_group': muscle_group, 'category': category},
+         {normalize_name(n) for n in (name, *aliases)})
+        for name, muscle_group, category, aliases in CATALOG
+    ]
+
+
+def new_entries(names, known_keys):
+    """Dictionary entries to add so that every name has a key
+
+    names are visited in order (most used spelling first when converting
+    history), so the first spelling of a new key names its entry. Only
+    exact key matches count; near-duplicates stay separate entries until
+    merged on purpose (scripts/merge_exercise_names.py). Returns
+    {key: display name} for the keys not in known_keys.
+    """
+    missing = {}
+    for name in names:
+        key = normalize_name(name)
+        if key not in known_keys and key not in missing:
+            missing[key] = display_name(name)
+    return missing
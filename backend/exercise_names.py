@@ -0,0 +1,169 @@
+# backend/exercise_names.py
+"""
+Exercise Dictionary
+Canonical exercise names, their aliases and muscle group/category, referenced
+by id from workout_exercise, exercise_rollup and personal_record
+"""
+import re
+import difflib
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from backend.app import db
+from backend.database_models import (
+    Exercise, ExerciseAlias, ExerciseRollup, PersonalRecord, User, Workout, WorkoutExercise
+)
+# Naming rules and the seeded catalog, shared with migration 7f3c2a9d1e40
+from backend.exercise_catalog import CATALOG, catalog_keys, classify, new_entries, normalize_name
+
+# Near-duplicate keys (typos, plurals) proposed by merge_similar(), which
+# only runs from scripts/merge_exercise_names.py: difflib ratio of the
+# normalized keys, and no fuzzy matching for short keys, where one letter is
+# a different exercise ("row" / "rows" are fine, "dip" / "hip" not). Keys
+# with different numbers never match ("bench press 80kg" / "90kg").
+FUZZY_CUTOFF = 0.9
+FUZZY_MIN_LENGTH = 6
+_NUMBERS = re.compile(r'\d+')
+
+
+def _insert_ignore(model, rows, index_elements):
+    dialect = db.session.get_bind().dialect.name
+    stmt = (postgresql.insert if dialect == 'postgresql' else sqlite.insert)(model.__table__)
+    db.session.execute(stmt.on_conflict_do_nothing(index_elements=index_elements), rows)
+
+
+def _add(entries):
+    """Add (name, attributes, keys) entries and their aliases; existing keys are kept"""
+    if not entries:
+        return
+    _insert_ignore(Exercise, [dict(attributes, name=name) for name, attributes, _ in entries], ['name'])
+    names = [name for name, _, _ in entries]
+    ids = dict(db.session.query(Exercise.name, Exercise.id).filter(Exercise.name.in_(names)))
+    _insert_ignore(ExerciseAlias, [
+        {'key': key, 'exercise_id': ids[name]}
+        for name, _, keys in entries
+        for key in keys
+    ], ['key'])
+
+
+def seed():
+    """Add the CATALOG entries and aliases (idempotent)"""
+    _add(catalog_keys())
+
+
+def lookup_id(name):
+    """Scalar subquery resolving a name (or alias) to its exercise id"""
+    return select(ExerciseAlias.exercise_id)\
+        .where(ExerciseAlias.key == normalize_name(name))\
+        .scalar_subquery()
+
+
+def resolve(names):
+    """Exercise id of every name, adding unknown names to the dictionary
+
+    One primary-key read of exercise_alias; names whose key is new cost
+    three more statements. A new exercise is named after its first
+    spelling and classified by keyword. Runs in the caller's transaction.
+    """
+    keys = {name: normalize_name(name) for name in names}
+    if not keys:
+        return {}
+
+    def known():
+        return dict(db.session.query(ExerciseAlias.key, ExerciseAlias.exercise_id)
+                    .filter(ExerciseAlias.key.in_(set(keys.values()))))
+
+    found = known()
+    missing = new_entries(keys, found)
+    if missing:
+        _add([(name, classify(name), {key}) for key, name in missing.items()])
+        # Re-read: a concurrent writer may have added the same key first
+        found = known()
+    return {name: found[key] for name, key in keys.items()}
+
+
+# ============================================================================
+# CANONICALIZATION
+# ============================================================================
+
+def similar_groups(weighted_keys, cutoff=FUZZY_CUTOFF):
+    """Map near-identical keys onto one canonical key
+
+    weighted_keys maps key -> weight (e.g. rows using it); heavier keys are
+    visited first and become the canonical key of the lighter ones that
+    fuzzy-match them. Returns {key: canonical key} for merged keys only.
+    """
+    canonical, merged = [], {}
+    for key in sorted(weighted_keys, key=lambda k: (-weighted_keys[k], k)):
+        if len(key) >= FUZZY_MIN_LENGTH:
+            numbers = _NUMBERS.findall(key)
+            candidates = [c for c in canonical if _NUMBERS.findall(c) == numbers]
+            match = difflib.get_close_matches(key, candidates, n=1, cutoff=cutoff)
+            if match:
+                merged[key] = match[0]
+                continue
+        canonical.append(key)
+    return merged
+
+
+def merge(source_id, target_id):
+    """Fold one dictionary entry into another; returns the affected user ids
+
+    Repoints exercise rows and aliases and deletes the source entry. The
+    rollups and records of the returned users are stale afterwards (see
+    merge_similar, which rebuilds them).
+    """
+    rows = db.session.query(Workout.user_id)\
+        .join(WorkoutExercise, WorkoutExercise.workout_id == Workout.id)\
+        .filter(WorkoutExercise.exercise_id == source_id)\
+        .distinct()\
+        .all()
+    user_ids = [user_id for user_id, in rows]
+    db.session.execute(update(WorkoutExercise).where(WorkoutExercise.exercise_id == source_id)
+                       .values(exercise_id=target_id))
+    db.session.execute(update(ExerciseAlias).where(ExerciseAlias.exercise_id == source_id)
+                       .values(exercise_id=target_id))
+    for model in (ExerciseRollup, PersonalRecord):
+        db.session.execute(delete(model).where(model.exercise_id == source_id))
+    db.session.execute(delete(Exercise).where(Exercise.id == source_id))
+    return user_ids
+
+
+def merge_similar(dry_run=True, cutoff=FUZZY_CUTOFF, skip=()):
+    """Merge dictionary entries whose names are near-identical
+
+    Heavier entries (CATALOG names first, then by number of exercise rows)
+    absorb the lighter ones; entries named in skip are left alone. A merge
+    rewrites the users' exercise rows and cannot be undone, so nothing is
+    written unless dry_run is False; the rollups and personal records of
+    the affected users are then rebuilt. Returns [(source name, target
+    name)] and the affected user ids.
+    """
+    from backend import records, rollups
+
+    usage = dict(db.session.query(WorkoutExercise.exercise_id, db.func.count(WorkoutExercise.id))
+                 .group_by(WorkoutExercise.exercise_id))
+    catalog = {name for name, _, _, _ in CATALOG}
+    skipped = {normalize_name(name) for name in skip}
+    entries = {normalize_name(name): (exercise_id, name)
+               for exercise_id, name in db.session.query(Exercise.id, Exercise.name)}
+    weights = {
+        key: float('inf') if name in catalog else usage.get(exercise_id, 0)
+        for key, (exercise_id, name) in entries.items()
+        if key not in skipped
+    }
+
+    merges, user_ids = [], set()
+    for key, target in similar_groups(weights, cutoff).items():
+        (source_id, source_name), (target_id, target_name) = entries[key], entries[target]
+        merges.append((source_name, target_name))
+        if not dry_run:
+            user_ids.update(merge(source_id, target_id))
+    for user_id in sorted(user_ids):
+        rollups.rebuild(user_id)
+        records.rebuild(user_id)
+    if user_ids:
+        db.session.execute(update(User).where(User.id.in_(user_ids))
+                           .values(data_version=User.data_version + 1))
+    return merges, sorted(user_ids)
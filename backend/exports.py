@@ -0,0 +1,206 @@
+# backend/exports.py
+"""
+Export Engine
+Streams workout history to CSV and XLSX from a single joined query
+"""
+import io
+import csv
+from itertools import groupby
+
+from backend.app import db
+from backend.database_models import Exercise, Workout, WorkoutExercise
+
+EXPORT_CHUNK_SIZE = 1000        # rows fetched per DB round trip
+EXPORT_FLUSH_BYTES = 64 * 1024  # text buffered before yielding to the client
+XLSX_SPOOL_BYTES = 8 * 1024 * 1024  # finished workbooks above this spill to disk
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+XLSX_COLUMN_WIDTHS = {
+    'A': 12,  # Datum
+    'B': 35,  # Trénink/Poznámka
+    'C': 30,  # Cvik
+    'D': 8,   # Série
+    'E': 12,  # Opakování
+    'F': 12   # Váha
+}
+
+
+def export_rows_query(user_id, include_empty_workouts=False):
+    """Joined (workout, exercise) rows in export order, fetched in chunks
+
+    With include_empty_workouts, workouts without exercises yield one row
+    whose exercise columns are NULL.
+    """
+    query = db.session.query(
+            Workout.id, Workout.date, Workout.note,
+            Exercise.name, WorkoutExercise.sets, WorkoutExercise.reps, WorkoutExercise.weight
+        )
+    if include_empty_workouts:
+        query = query.outerjoin(WorkoutExercise, WorkoutExercise.workout_id == Workout.id)\
+            .outerjoin(Exercise, Exercise.id == WorkoutExercise.exercise_id)
+    else:
+        query = query.join(WorkoutExercise, WorkoutExercise.workout_id == Workout.id)\
+            .join(Exercise, Exercise.id == WorkoutExercise.exercise_id)
+
+    return query\
+        .filter(Workout.user_id == user_id)\
+        .order_by(Workout.date.desc(), Workout.id.desc(), WorkoutExercise.id)\
+        .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+
+
+# ============================================================================
+# CSV
+# ============================================================================
+
+def iter_csv(rows, stats=None):
+    """Yield CSV text in chunks; memory use is bounded by EXPORT_FLUSH_BYTES
+
+    The header is yielded before the first row is fetched so the download
+    starts immediately. If given, stats['rows'] is updated as rows are written.
+    """
+    buffer = io.StringIO()
+    # Use semicolon delimiter for Czech Excel compatibility
+    writer = csv.writer(buffer, delimiter=';', quoting=csv.QUOTE_MINIMAL)
+
+    # CSV headers (Czech)
+    writer.writerow(['ID', 'Datum', 'Poznámka', 'Cvik', 'Série', 'Opakování', 'Váha (kg)'])
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate(0)
+
+    row_count = 0
+    for row in rows:
+        writer.writerow([
+            row.id,
+            row.date.strftime('%d.%m.%Y'),
+            row.note or '',
+            row.name,
+            row.sets,
+            row.reps,
+            row.weight or ''
+        ])
+        row_count += 1
+        if stats is not None:
+            stats['rows'] = row_count
+        if buffer.tell() >= EXPORT_FLUSH_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    yield buffer.getvalue()
+
+
+# ============================================================================
+# XLSX
+# ============================================================================
+
+def _register_xlsx_styles(wb):
+    """Register the shared named styles once per workbook
+
+    Every cell references one of these by name instead of carrying its own
+    Font/Fill/Alignment/Border objects.
+    """
+    from openpyxl.styles import NamedStyle, Font, PatternFill, Alignment, Border, Side
+
+    thin = Side(style='thin')
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    dark_fill = PatternFill(start_color="333333", end_color="333333", fill_type="solid")
+    light_fill = PatternFill(start_color="F9F9F9", end_color="F9F9F9", fill_type="solid")
+    left = Alignment(horizontal='left', vertical='center')
+
+    styles = [
+        NamedStyle(
+            name='ft_header',
+            font=Font(bold=True, size=12, color="000000"),
+            fill=PatternFill(start_color="FFD700", end_color="FFD700", fill_type="solid"),
+            alignment=Alignment(horizontal='center', vertical='center'),
+            border=border
+        ),
+        NamedStyle(name='ft_workout', font=Font(bold=True, size=11, color="FFFFFF"),
+                   fill=dark_fill, alignment=left, border=border),
+        NamedStyle(name='ft_workout_blank', font=Font(bold=True, size=11, color="FFFFFF"),
+                   fill=dark_fill, alignment=left),
+        NamedStyle(name='ft_exercise', fill=light_fill, alignment=left, border=border),
+        NamedStyle(name='ft_exercise_blank', fill=light_fill, alignment=left),
+    ]
+    for style in styles:
+        wb.add_named_style(style)
+
+
+def write_xlsx(rows, fileobj):
+    """Write the workout export workbook to fileobj in a single pass
+
+    Uses openpyxl's write-only mode, so only the current row is held in
+    memory. rows must come from export_rows_query(include_empty_workouts=True).
+    Returns the number of workouts written.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.worksheet.cell_range import CellRange
+
+    wb = Workbook(write_only=True)
+    _register_xlsx_styles(wb)
+    ws = wb.create_sheet("Tréninky")
+
+    # Column widths must be set before the first row is written
+    for col, width in XLSX_COLUMN_WIDTHS.items():
+        ws.column_dimensions[col].width = width
+
+    def styled_cells(*styles):
+        cells = []
+        for style in styles:
+            cell = WriteOnlyCell(ws)
+            cell.style = style
+            cells.append(cell)
+        return cells
+
+    # Headers (bez ID)
+    headers = ['Datum', 'Trénink', 'Cvik', 'Série', 'Opakování', 'Váha (kg)']
+    header_row = styled_cells(*['ft_header'] * len(headers))
+    for cell, header in zip(header_row, headers):
+        cell.value = header
+    ws.append(header_row)
+
+    # Write-only rows are serialised as soon as they are appended, so one
+    # pre-styled cell per column is reused for every row of the same kind
+    workout_row = styled_cells('ft_workout', 'ft_workout', *['ft_workout_blank'] * 4)
+    exercise_row = styled_cells('ft_exercise_blank', 'ft_exercise_blank',
+                                'ft_exercise', 'ft_exercise', 'ft_exercise', 'ft_exercise')
+    blank_weight = styled_cells('ft_exercise_blank')[0]
+    weighted = exercise_row[5]
+
+    row_num = 2
+    workout_count = 0
+    for (workout_id, workout_date, note), exercises in groupby(rows, key=lambda r: (r.id, r.date, r.note)):
+        # Empty row between workouts
+        if workout_count:
+            ws.append([])
+            row_num += 1
+        workout_count += 1
+
+        # Workout header row (separator), merged across columns B-F
+        workout_row[0].value = workout_date.strftime('%d.%m.%Y')
+        workout_row[1].value = f"🏋️ {note or 'Trénink'}"
+        ws.append(workout_row)
+        # Ranges never overlap here, so skip MultiCellRange.add()'s linear overlap
+        # check, which makes merging quadratic in the number of workouts
+        ws.merged_cells.ranges.add(CellRange(f'B{row_num}:F{row_num}'))
+        row_num += 1
+
+        for exercise in exercises:
+            if exercise.name is None:
+                continue  # workout without exercises (outer join)
+            # Empty datum/trénink columns (already shown in the workout header)
+            exercise_row[2].value = f"  • {exercise.name}"  # Odsazený cvik
+            exercise_row[3].value = exercise.sets
+            exercise_row[4].value = exercise.reps
+            if exercise.weight:
+                weighted.value = exercise.weight
+                exercise_row[5] = weighted
+            else:
+                exercise_row[5] = blank_weight
+            ws.append(exercise_row)
+            row_num += 1
+
+    wb.save(fileobj)
+    return workout_count
@@ -1,7 +1,75 @@
-bind = "0.0.0.0:8000"
-workers = 2
+# backend/gunicorn.conf.py
+"""
+Gunicorn configuration used by `python -m backend.run serve`
+
+Worker and thread counts are derived from the CPU count and the database
+backend unless GUNICORN_WORKERS / GUNICORN_THREADS are set.
+"""
+import os
+import glob
+import shutil
+import tempfile
+import multiprocessing
+
+
+def _default_concurrency():
+    cpus = multiprocessing.cpu_count()
+    database_url = os.getenv('DATABASE_URL', 'sqlite://')
+    if database_url.startswith('sqlite'):
+        # SQLite allows one writer at a time: extra processes only add lock
+        # contention, threads cover the I/O waits of reads
+        return min(max(cpus, 2), 4), 4
+    # Client/server databases scale with processes (the usual 2 x CPU + 1)
+    return 2 * cpus + 1, 2
+
+
+_workers, _threads = _default_concurrency()
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv('GUNICORN_WORKERS', _workers))
 worker_class = "gthread"
-threads = 4
+threads = int(os.getenv('GUNICORN_THREADS', _threads))
 preload_app = True
+
+# Restart workers periodically (jittered so they do not all restart at once)
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+
+# Exports can take a while on long histories; give in-flight requests time to finish on reload
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = 5
+
 accesslog = "-"
 errorlog = "-"
+
+# Shared directory for prometheus_client multiprocess metrics. Must be set
+# before the app (and so prometheus_client) is imported by preload_app.
+# An operator-provided directory only loses the samples of a previous master
+# (*.db); otherwise each master gets its own directory, removed on exit.
+if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+    _metrics_dir, _own_metrics_dir = os.environ['PROMETHEUS_MULTIPROC_DIR'], False
+    os.makedirs(_metrics_dir, exist_ok=True)
+    for _stale in glob.glob(os.path.join(_metrics_dir, '*.db')):
+        os.remove(_stale)
+else:
+    _metrics_dir, _own_metrics_dir = tempfile.mkdtemp(prefix='fittrack_metrics_'), True
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = _metrics_dir
+
+def post_fork(server, worker):
+    # The preloaded master may have opened DB connections (schema check);
+    # drop the inherited pool without closing the parent's sockets
+    from backend import app, db
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    # Drop the dead worker's live gauges (in-flight requests) from /metrics
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+    if _own_metrics_dir:
+        shutil.rmtree(_metrics_dir, ignore_errors=True)
@@ -0,0 +1,78 @@
+# backend/json_provider.py
+"""
+JSON Provider
+Fast JSON encoding for API responses (orjson when installed, stdlib otherwise)
+"""
+import uuid
+import datetime
+import dataclasses
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def _default(o):
+    """Encode the non-JSON types used by the API
+
+    Dates are ISO 8601 in both encoders (Flask's stdlib provider would emit
+    HTTP dates), so the wire format does not depend on orjson being present.
+    """
+    if isinstance(o, (datetime.date, datetime.datetime, datetime.time)):
+        return o.isoformat()
+    if isinstance(o, Decimal):
+        return float(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if isinstance(o, uuid.UUID):
+        return str(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, falling back to the stdlib encoder
+
+    Honours sort_keys and the debug-mode pretty printing of the default
+    provider; response bodies are built from bytes without a str round trip.
+    """
+
+    default = staticmethod(_default)
+
+    @property
+    def fast(self):
+        return orjson is not None
+
+    def _orjson_options(self, indent=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            # Explicit stdlib options (cls, separators, ...) need the stdlib encoder
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self._orjson_options()).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        body = orjson.dumps(obj, default=_default, option=self._orjson_options(indent=pretty))
+        if pretty:
+            body += b'\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -0,0 +1,167 @@
+# backend/log_pipeline.py
+"""
+Logging Pipeline
+Non-blocking logging: request threads enqueue, one listener thread writes
+"""
+import os
+import copy
+import json
+import queue
+import random
+import atexit
+import logging
+import logging.handlers
+from datetime import datetime, timezone
+
+
+_EXC_FORMATTER = logging.Formatter()
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per line (ts, level, logger, msg, request_id, exc)"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'pid': record.process,
+        }
+        request_id = getattr(record, 'request_id', None)
+        if request_id:
+            entry['request_id'] = request_id
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        elif record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class InfoSampler(logging.Filter):
+    """Keep a fraction of records below WARNING; warnings and errors always pass"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Attach the request id while still on the request thread
+        if not hasattr(record, 'request_id'):
+            try:
+                from flask import g, has_app_context
+                record.request_id = g.get('request_id') if has_app_context() else None
+            except Exception:
+                record.request_id = None
+        # Like QueueHandler.prepare, but keep the traceback in exc_text so the
+        # listener's formatter decides where it goes
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _EXC_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _file_handler(config, log_path):
+    """File handler for LOG_ROTATE (see config.py: only external is multi-process safe)"""
+    if config['LOG_ROTATE'] == 'external':
+        handler = logging.handlers.WatchedFileHandler(log_path, encoding='utf-8', delay=True)
+    elif config['LOG_ROTATE'] == 'time':
+        handler = logging.handlers.TimedRotatingFileHandler(
+            log_path, when=config['LOG_ROTATE_WHEN'], backupCount=config['LOG_BACKUP_COUNT'],
+            encoding='utf-8', delay=True
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            log_path, maxBytes=config['LOG_MAX_BYTES'], backupCount=config['LOG_BACKUP_COUNT'],
+            encoding='utf-8', delay=True
+        )
+    if config['LOG_FORMAT'] == 'json':
+        handler.setFormatter(JsonLinesFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s'))
+    return handler
+
+
+# The current pipeline (queue handler, listener, queue size); the fork and
+# exit hooks below act on whichever setup_logging() call ran last
+_pipeline = {}
+
+
+def _start_listener(log_queue, handlers):
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def _stop_listener():
+    """Flush whatever is still queued and stop the listener thread"""
+    listener = _pipeline.pop('listener', None)
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+def _restart_in_child():
+    # The listener thread does not survive fork(); a fresh queue also drops
+    # records the parent had queued but not yet written
+    if 'listener' not in _pipeline:
+        return
+    queue_handler = _pipeline['queue_handler']
+    queue_handler.queue = queue.Queue(_pipeline['queue_size'])
+    _pipeline['listener'] = _start_listener(queue_handler.queue, _pipeline['listener'].handlers)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_in_child)
+atexit.register(_stop_listener)
+
+
+def setup_logging(app, loggers):
+    """Route the given loggers through a queue to the LOG_FILE handler
+
+    A listener from an earlier call is flushed and stopped. gunicorn workers
+    forked from a preloaded master get a fresh queue and listener of their own.
+    Returns the queue handler (its .dropped counts records lost to a full queue).
+    """
+    config = app.config
+    log_path = os.path.join(app.instance_path, config['LOG_FILE'])
+    file_handler = _file_handler(config, log_path)
+
+    queue_handler = DroppingQueueHandler(queue.Queue(config['LOG_QUEUE_SIZE']))
+    if config['LOG_INFO_SAMPLE_RATE'] < 1.0:
+        queue_handler.addFilter(InfoSampler(config['LOG_INFO_SAMPLE_RATE']))
+
+    level = getattr(logging, config['LOG_LEVEL'].upper(), logging.INFO)
+    for target in loggers:
+        target.setLevel(level)
+        for handler in list(target.handlers):
+            if isinstance(handler, DroppingQueueHandler):
+                target.removeHandler(handler)
+        target.addHandler(queue_handler)
+
+    _stop_listener()
+    _pipeline.update(queue_handler=queue_handler, queue_size=config['LOG_QUEUE_SIZE'],
+                     listener=_start_listener(queue_handler.queue, [file_handler]))
+    return queue_handler
@@ -0,0 +1,99 @@
+# backend/metrics.py
+"""
+Request Metrics
+Per-endpoint latency, status, in-flight and DB usage exported for Prometheus
+"""
+import os
+import hmac
+import time
+
+from flask import Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+
+# Under gunicorn, PROMETHEUS_MULTIPROC_DIR is set before the app is imported
+# (see gunicorn.conf.py), so every worker writes its samples to mmap files
+# there and /metrics merges all workers, whichever one serves the scrape.
+
+REQUEST_LATENCY = Histogram(
+    'fittrack_http_request_duration_seconds', 'Request latency until the response is returned',
+    ['endpoint', 'method'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+REQUESTS = Counter(
+    'fittrack_http_requests_total', 'Requests by endpoint and status code',
+    ['endpoint', 'method', 'status']
+)
+IN_FLIGHT = Gauge(
+    'fittrack_http_requests_in_flight', 'Requests currently being handled',
+    multiprocess_mode='livesum'
+)
+DB_QUERIES = Histogram(
+    'fittrack_db_queries_per_request', 'SQL statements executed per request',
+    ['endpoint'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+)
+DB_TIME = Histogram(
+    'fittrack_db_seconds_per_request', 'Time spent in SQL statements per request',
+    ['endpoint'],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+)
+
+
+def _endpoint_label():
+    # Route endpoints (e.g. "api.get_workouts") keep label cardinality bounded
+    return request.endpoint or 'unmatched'
+
+
+def _registry():
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def init_metrics(app):
+    """Register the request hooks and the /metrics endpoint
+
+    SQL statement counts and DB time come from backend.query_stats. Off by
+    default outside development; with METRICS_TOKEN set, /metrics answers 404
+    to scrapes without the bearer token.
+    """
+    if not app.config['METRICS_ENABLED']:
+        return
+
+    @app.before_request
+    def _start_request_metrics():
+        g.metrics_start = time.perf_counter()
+        IN_FLIGHT.inc()
+
+    @app.after_request
+    def _record_request_metrics(response):
+        start = g.get('metrics_start')
+        if start is None or request.endpoint == 'metrics':
+            return response
+        endpoint = _endpoint_label()
+        REQUEST_LATENCY.labels(endpoint, request.method).observe(time.perf_counter() - start)
+        REQUESTS.labels(endpoint, request.method, str(response.status_code)).inc()
+        DB_QUERIES.labels(endpoint).observe(g.get('db_queries', 0))
+        DB_TIME.labels(endpoint).observe(g.get('db_time', 0.0))
+        return response
+
+    @app.teardown_request
+    def _finish_request_metrics(exc):
+        # Runs even when after_request hooks are skipped
+        if g.pop('metrics_start', None) is not None:
+            IN_FLIGHT.dec()
+
+    token = app.config.get('METRICS_TOKEN')
+
+    @app.route('/metrics')
+    def metrics():
+        """Prometheus text exposition of all workers' metrics"""
+        if token and not hmac.compare_digest(request.headers.get('Authorization', '').encode(),
+                                            f'Bearer {token}'.encode()):
+            return Response('Not Found', status=404, mimetype='text/plain')
+        return Response(generate_latest(_registry()), mimetype=CONTENT_TYPE_LATEST)
@@ -0,0 +1,72 @@
+"""exercise rollups
+
+Revision ID: 4b62569f5c83
+Revises: c06905846ed9
+Create Date: 2026-10-17 16:05:47.902113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b62569f5c83'
+down_revision: Union[str, Sequence[str], None] = 'c06905846ed9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BUCKETS = {
+    'sqlite': {
+        'day': 'w.date',
+        'week': "date(w.date, 'weekday 0', '-6 days')",
+        'month': "date(w.date, 'start of month')",
+    },
+    'postgresql': {
+        'day': 'w.date',
+        'week': "CAST(date_trunc('week', w.date) AS DATE)",
+        'month': "CAST(date_trunc('month', w.date) AS DATE)",
+    },
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('exercise_rollup',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('grain', sa.String(length=5), nullable=False),
+    sa.Column('exercise', sa.String(length=120), nullable=False),
+    sa.Column('bucket', sa.Date(), nullable=False),
+    sa.Column('entry_count', sa.Integer(), nullable=False),
+    sa.Column('session_count', sa.Integer(), nullable=False),
+    sa.Column('total_sets', sa.Integer(), nullable=False),
+    sa.Column('total_reps', sa.Integer(), nullable=False),
+    sa.Column('volume', sa.Float(), nullable=False),
+    sa.Column('max_weight', sa.Float(), nullable=True),
+    sa.Column('max_1rm', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'grain', 'exercise', 'bucket')
+    )
+
+    # Backfill from the existing exercise rows (same aggregates as
+    # backend/rollups.py; other dialects: run backend/scripts/rebuild_rollups.py)
+    buckets = BUCKETS.get(op.get_bind().dialect.name)
+    if buckets is None:
+        return
+    for grain, bucket in buckets.items():
+        op.execute(f"""
+            INSERT INTO exercise_rollup (user_id, grain, exercise, bucket, entry_count, session_count,
+                                         total_sets, total_reps, volume, max_weight, max_1rm)
+            SELECT w.user_id, '{grain}', e.name, {bucket}, COUNT(e.id), COUNT(DISTINCT e.workout_id),
+                   SUM(e.sets), SUM(e.reps), SUM(e.sets * e.reps * COALESCE(e.weight, 0)), MAX(e.weight),
+                   MAX(CASE WHEN e.reps <= 1 THEN e.weight ELSE e.weight * (1 + e.reps / 30.0) END)
+            FROM workout_exercise e JOIN workout w ON w.id = e.workout_id
+            GROUP BY w.user_id, e.name, {bucket}
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('exercise_rollup')
@@ -0,0 +1,256 @@
+"""exercise dictionary
+
+Revision ID: 7f3c2a9d1e40
+Revises: db49d6fffc29
+Create Date: 2026-10-17 20:12:38.455102
+
+"""
+import importlib.util
+from pathlib import Path
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f3c2a9d1e40'
+down_revision: Union[str, Sequence[str], None] = 'db49d6fffc29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _load_catalog():
+    """backend/exercise_catalog.py, loaded by path
+
+    Importing it through the backend package would create the app; the
+    module itself imports nothing from it. Sharing it keeps this migration
+    and the app's startup conversion on the same naming rules.
+    """
+    path = Path(__file__).resolve().parents[2] / 'exercise_catalog.py'
+    spec = importlib.util.spec_from_file_location('fittrack_exercise_catalog', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+BUCKETS = {
+    'sqlite': {
+        'day': 'w.date',
+        'week': "date(w.date, 'weekday 0', '-6 days')",
+        'month': "date(w.date, 'start of month')",
+    },
+    'postgresql': {
+        'day': 'w.date',
+        'week': "CAST(date_trunc('week', w.date) AS DATE)",
+        'month': "CAST(date_trunc('month', w.date) AS DATE)",
+    },
+}
+
+
+# ============================================================================
+# DERIVED TABLES (rollups and records, keyed by exercise id or by name)
+# ============================================================================
+
+def _exercise_column(by_id):
+    if by_id:
+        return sa.Column('exercise_id', sa.Integer(), sa.ForeignKey('exercise.id'), nullable=False)
+    return sa.Column('exercise', sa.String(length=120), nullable=False)
+
+
+def _create_rollups(by_id):
+    key = 'exercise_id' if by_id else 'exercise'
+    op.create_table('exercise_rollup',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('grain', sa.String(length=5), nullable=False),
+    _exercise_column(by_id),
+    sa.Column('bucket', sa.Date(), nullable=False),
+    sa.Column('entry_count', sa.Integer(), nullable=False),
+    sa.Column('session_count', sa.Integer(), nullable=False),
+    sa.Column('total_sets', sa.Integer(), nullable=False),
+    sa.Column('total_reps', sa.Integer(), nullable=False),
+    sa.Column('volume', sa.Float(), nullable=False),
+    sa.Column('max_weight', sa.Float(), nullable=True),
+    sa.Column('max_1rm', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'grain', key, 'bucket')
+    )
+
+    # Same aggregates as backend/rollups.py; other dialects:
+    # run backend/scripts/rebuild_rollups.py
+    buckets = BUCKETS.get(op.get_bind().dialect.name)
+    if buckets is None:
+        return
+    source = 'e.exercise_id' if by_id else 'e.name'
+    for grain, bucket in buckets.items():
+        op.execute(f"""
+            INSERT INTO exercise_rollup (user_id, grain, {key}, bucket, entry_count, session_count,
+                                         total_sets, total_reps, volume, max_weight, max_1rm)
+            SELECT w.user_id, '{grain}', {source}, {bucket}, COUNT(e.id), COUNT(DISTINCT e.workout_id),
+                   SUM(e.sets), SUM(e.reps), SUM(e.sets * e.reps * COALESCE(e.weight, 0)), MAX(e.weight),
+                   MAX(CASE WHEN e.reps <= 1 THEN e.weight ELSE e.weight * (1 + e.reps / 30.0) END)
+            FROM workout_exercise e JOIN workout w ON w.id = e.workout_id
+            GROUP BY w.user_id, {source}, {bucket}
+        """)
+
+
+def _create_records(by_id):
+    key = 'exercise_id' if by_id else 'exercise'
+    op.create_table('personal_record',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    _exercise_column(by_id),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('value', sa.Float(), nullable=False),
+    sa.Column('workout_id', sa.Integer(), nullable=False),
+    sa.Column('achieved_on', sa.Date(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', key, 'kind')
+    )
+
+    # Same rules as backend/records.py (ties: earliest date, then lowest workout id)
+    source = 'e.exercise_id' if by_id else 'e.name'
+    op.execute(f"""
+        INSERT INTO personal_record (user_id, {key}, kind, value, workout_id, achieved_on)
+        SELECT user_id, exercise, kind, value, workout_id, achieved_on FROM (
+            SELECT c.*, ROW_NUMBER() OVER (
+                PARTITION BY user_id, exercise, kind ORDER BY value DESC, achieved_on, workout_id
+            ) AS rn
+            FROM (
+                SELECT w.user_id, {source} AS exercise, 'weight' AS kind, e.weight AS value,
+                       w.id AS workout_id, w.date AS achieved_on
+                FROM workout_exercise e JOIN workout w ON w.id = e.workout_id WHERE e.weight > 0
+                UNION ALL
+                SELECT w.user_id, {source}, 'one_rm',
+                       CASE WHEN e.reps <= 1 THEN e.weight ELSE e.weight * (1 + e.reps / 30.0) END, w.id, w.date
+                FROM workout_exercise e JOIN workout w ON w.id = e.workout_id WHERE e.weight > 0
+                UNION ALL
+                SELECT w.user_id, {source}, 'set_volume', e.reps * e.weight, w.id, w.date
+                FROM workout_exercise e JOIN workout w ON w.id = e.workout_id WHERE e.weight > 0
+                UNION ALL
+                SELECT w.user_id, {source}, 'session_volume', SUM(e.sets * e.reps * COALESCE(e.weight, 0)), w.id, w.date
+                FROM workout_exercise e JOIN workout w ON w.id = e.workout_id
+                GROUP BY w.user_id, {source}, w.id, w.date
+            ) c
+            WHERE c.value > 0
+        ) ranked
+        WHERE rn = 1
+    """)
+
+
+# ============================================================================
+# CANONICALIZATION
+# ============================================================================
+
+def _canonicalize(conn, exercise, alias):
+    """Seed the dictionary and map every distinct workout_exercise.name onto it
+
+    Names are visited most used first: a name whose normalized key is known
+    (catalog name or alias, or a key seen before) reuses that entry, anything
+    else starts a new entry named after that spelling. Near-duplicates are
+    not merged here (see scripts/merge_exercise_names.py). Returns
+    {name: exercise id}.
+    """
+    catalog = _load_catalog()
+    known = {}
+
+    def add_exercise(name, attributes, keys):
+        exercise_id = conn.execute(
+            exercise.insert().values(name=name, **attributes)
+        ).inserted_primary_key[0]
+        for key in keys:
+            if key not in known:
+                conn.execute(alias.insert().values(key=key, exercise_id=exercise_id))
+                known[key] = exercise_id
+
+    for name, attributes, keys in catalog.catalog_keys():
+        add_exercise(name, attributes, keys)
+
+    names = conn.execute(sa.text(
+        'SELECT name FROM workout_exercise GROUP BY name ORDER BY COUNT(*) DESC, name'
+    )).scalars().all()
+    for key, display in catalog.new_entries(names, known).items():
+        add_exercise(display, catalog.classify(display), {key})
+    return {name: known[catalog.normalize_name(name)] for name in names}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    exercise = op.create_table('exercise',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=120), nullable=False),
+    sa.Column('muscle_group', sa.String(length=20), nullable=True),
+    sa.Column('category', sa.String(length=20), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    alias = op.create_table('exercise_alias',
+    sa.Column('key', sa.String(length=120), nullable=False),
+    sa.Column('exercise_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['exercise_id'], ['exercise.id'], ),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index('ix_exercise_alias_exercise_id', 'exercise_alias', ['exercise_id'], unique=False)
+
+    mapping = _canonicalize(op.get_bind(), exercise, alias)
+
+    # Rewrite names as ids through a temporary name -> id table (one pass
+    # over workout_exercise instead of one per distinct name)
+    name_map = op.create_table('exercise_name_map',
+    sa.Column('name', sa.String(length=120), nullable=False),
+    sa.Column('exercise_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    if mapping:
+        op.bulk_insert(name_map, [{'name': name, 'exercise_id': exercise_id}
+                                  for name, exercise_id in mapping.items()])
+    with op.batch_alter_table('workout_exercise', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('exercise_id', sa.Integer(), nullable=True))
+    op.execute("""
+        UPDATE workout_exercise SET exercise_id =
+            (SELECT m.exercise_id FROM exercise_name_map m WHERE m.name = workout_exercise.name)
+    """)
+    op.drop_table('exercise_name_map')
+
+    with op.batch_alter_table('workout_exercise', schema=None) as batch_op:
+        batch_op.drop_index('ix_workout_exercise_workout_name')
+        batch_op.alter_column('exercise_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('fk_workout_exercise_exercise_id', 'exercise', ['exercise_id'], ['id'])
+        batch_op.drop_column('name')
+        batch_op.create_index('ix_workout_exercise_workout_exercise', ['workout_id', 'exercise_id'], unique=False)
+
+    # Rollups and records were keyed by name; canonicalization may have
+    # merged names, so rebuild them keyed by id
+    op.drop_table('exercise_rollup')
+    op.drop_table('personal_record')
+    _create_rollups(by_id=True)
+    _create_records(by_id=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Exercise rows get back their canonical name, not the spelling they
+    were logged with.
+    """
+    op.drop_table('exercise_rollup')
+    op.drop_table('personal_record')
+
+    with op.batch_alter_table('workout_exercise', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('name', sa.String(length=120), nullable=True))
+    op.execute("""
+        UPDATE workout_exercise SET name =
+            (SELECT x.name FROM exercise x WHERE x.id = workout_exercise.exercise_id)
+    """)
+    with op.batch_alter_table('workout_exercise', schema=None) as batch_op:
+        batch_op.drop_index('ix_workout_exercise_workout_exercise')
+        batch_op.drop_constraint('fk_workout_exercise_exercise_id', type_='foreignkey')
+        batch_op.drop_column('exercise_id')
+        batch_op.alter_column('name', existing_type=sa.String(length=120), nullable=False)
+        batch_op.create_index('ix_workout_exercise_workout_name', ['workout_id', 'name'], unique=False)
+
+    _create_rollups(by_id=False)
+    _create_records(by_id=False)
+
+    op.drop_index('ix_exercise_alias_exercise_id', table_name='exercise_alias')
+    op.drop_table('exercise_alias')
+    op.drop_table('exercise')
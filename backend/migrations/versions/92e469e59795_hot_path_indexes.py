@@ -0,0 +1,43 @@
+"""hot path indexes
+
+Revision ID: 92e469e59795
+Revises: fbbce6714b21
+Create Date: 2026-10-17 09:12:04.118532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '92e469e59795'
+down_revision: Union[str, Sequence[str], None] = 'fbbce6714b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Per-user listings ordered by date + keyset pagination on (date, id)
+    op.create_index('ix_workout_user_date_id', 'workout',
+                    ['user_id', sa.text('date DESC'), sa.text('id DESC')],
+                    if_not_exists=True)
+    # Exercises of a workout, optionally narrowed by exercise name
+    op.create_index('ix_workout_exercise_workout_name', 'workout_exercise',
+                    ['workout_id', 'name'],
+                    if_not_exists=True)
+
+    # Single-column indexes that are now a prefix of the composite ones.
+    # They only exist on databases created by db.create_all().
+    op.drop_index('ix_workout_user_id', table_name='workout', if_exists=True)
+    op.drop_index('ix_workout_exercise_workout_id', table_name='workout_exercise', if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_workout_exercise_workout_id', 'workout_exercise', ['workout_id'], if_not_exists=True)
+    op.create_index('ix_workout_user_id', 'workout', ['user_id'], if_not_exists=True)
+    op.drop_index('ix_workout_exercise_workout_name', table_name='workout_exercise', if_exists=True)
+    op.drop_index('ix_workout_user_date_id', table_name='workout', if_exists=True)
@@ -0,0 +1,46 @@
+"""workout exercise totals
+
+Revision ID: c06905846ed9
+Revises: a55b863fe606
+Create Date: 2026-10-17 14:20:05.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c06905846ed9'
+down_revision: Union[str, Sequence[str], None] = 'a55b863fe606'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('workout', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('exercise_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('total_sets', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('total_reps', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('total_volume', sa.Float(), nullable=False, server_default='0'))
+
+    # Backfill from the existing exercise rows
+    op.execute("""
+        UPDATE workout SET
+            exercise_count = (SELECT COUNT(*) FROM workout_exercise e WHERE e.workout_id = workout.id),
+            total_sets = (SELECT COALESCE(SUM(e.sets), 0) FROM workout_exercise e WHERE e.workout_id = workout.id),
+            total_reps = (SELECT COALESCE(SUM(e.reps), 0) FROM workout_exercise e WHERE e.workout_id = workout.id),
+            total_volume = (SELECT COALESCE(SUM(e.sets * e.reps * COALESCE(e.weight, 0)), 0)
+                            FROM workout_exercise e WHERE e.workout_id = workout.id)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('workout', schema=None) as batch_op:
+        batch_op.drop_column('total_volume')
+        batch_op.drop_column('total_reps')
+        batch_op.drop_column('total_sets')
+        batch_op.drop_column('exercise_count')
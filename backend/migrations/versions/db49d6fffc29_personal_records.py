@@ -0,0 +1,66 @@
+"""personal records
+
+Revision ID: db49d6fffc29
+Revises: 4b62569f5c83
+Create Date: 2026-10-17 18:31:12.640274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'db49d6fffc29'
+down_revision: Union[str, Sequence[str], None] = '4b62569f5c83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('personal_record',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('exercise', sa.String(length=120), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('value', sa.Float(), nullable=False),
+    sa.Column('workout_id', sa.Integer(), nullable=False),
+    sa.Column('achieved_on', sa.Date(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'exercise', 'kind')
+    )
+
+    # Backfill: best candidate per (user, exercise, kind), ties to the earliest
+    # date then lowest workout id (same rules as backend/records.py)
+    op.execute("""
+        INSERT INTO personal_record (user_id, exercise, kind, value, workout_id, achieved_on)
+        SELECT user_id, exercise, kind, value, workout_id, achieved_on FROM (
+            SELECT c.*, ROW_NUMBER() OVER (
+                PARTITION BY user_id, exercise, kind ORDER BY value DESC, achieved_on, workout_id
+            ) AS rn
+            FROM (
+                SELECT w.user_id, e.name AS exercise, 'weight' AS kind, e.weight AS value,
+                       w.id AS workout_id, w.date AS achieved_on
+                FROM workout_exercise e JOIN workout w ON w.id = e.workout_id WHERE e.weight > 0
+                UNION ALL
+                SELECT w.user_id, e.name, 'one_rm',
+                       CASE WHEN e.reps <= 1 THEN e.weight ELSE e.weight * (1 + e.reps / 30.0) END, w.id, w.date
+                FROM workout_exercise e JOIN workout w ON w.id = e.workout_id WHERE e.weight > 0
+                UNION ALL
+                SELECT w.user_id, e.name, 'set_volume', e.reps * e.weight, w.id, w.date
+                FROM workout_exercise e JOIN workout w ON w.id = e.workout_id WHERE e.weight > 0
+                UNION ALL
+                SELECT w.user_id, e.name, 'session_volume', SUM(e.sets * e.reps * COALESCE(e.weight, 0)), w.id, w.date
+                FROM workout_exercise e JOIN workout w ON w.id = e.workout_id
+                GROUP BY w.user_id, e.name, w.id, w.date
+            ) c
+            WHERE c.value > 0
+        ) ranked
+        WHERE rn = 1
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('personal_record')
@@ -0,0 +1,52 @@
+"""user profile columns
+
+Revision ID: e5a1c47b9d02
+Revises: 7f3c2a9d1e40
+Create Date: 2026-10-18 09:41:07.218633
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a1c47b9d02'
+down_revision: Union[str, Sequence[str], None] = '7f3c2a9d1e40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _profile_columns():
+    return [
+        sa.Column('age', sa.Integer(), nullable=True),
+        sa.Column('height_cm', sa.Float(), nullable=True),
+        sa.Column('weight_kg', sa.Float(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    The profile columns used to be added only by the app's startup schema
+    check (backend/app.py _ensure_schema_columns), so databases that went
+    through it already have them.
+    """
+    existing = {col['name'] for col in sa.inspect(op.get_bind()).get_columns('user')}
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        for column in _profile_columns():
+            if column.name not in existing:
+                batch_op.add_column(column)
+        # Password hashes are longer than the original 150 characters
+        batch_op.alter_column('password', existing_type=sa.String(length=150),
+                              type_=sa.String(length=255), existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.alter_column('password', existing_type=sa.String(length=255),
+                              type_=sa.String(length=150), existing_nullable=False)
+        for column in reversed(_profile_columns()):
+            batch_op.drop_column(column.name)
@@ -3,7 +3,6 @@
 Google OAuth integration using Authlib
 """
 import os
-from authlib.integrations.flask_client import OAuth
 from flask import current_app
 
 
@@ -22,6 +21,8 @@ def init_oauth(app):
         oauth = None
         return None
     
+    # Imported only when configured: Authlib pulls in requests/cryptography
+    from authlib.integrations.flask_client import OAuth
     oauth = OAuth(app)
     
     # Register Google OAuth client
@@ -0,0 +1,95 @@
+# backend/passwords.py
+"""
+Password Hashing
+PBKDF2 hashing off the request threads, in a small low-priority process pool
+"""
+import os
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class HashingBusy(RuntimeError):
+    """Raised when too many hash jobs are already waiting, one timed out, or the pool keeps failing"""
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+_settings = {'method': 'pbkdf2:sha256:600000', 'workers': 0, 'nice': 10, 'timeout': 10.0}
+_slots = threading.BoundedSemaphore(32)
+
+
+def configure(method, workers, queue_size, nice, timeout):
+    """Set the hashing parameters; the pool itself is created on first use"""
+    global _slots
+    _settings.update(method=method, workers=workers, nice=nice, timeout=timeout)
+    _slots = threading.BoundedSemaphore(max(queue_size, 1))
+
+
+def _executor():
+    """The calling process's pool (a forked gunicorn worker builds its own)"""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            # spawn, not fork: forking a multi-threaded worker can copy held locks
+            # (spawned children re-import __main__, so entry scripts need a
+            # __name__ guard). The pool runs at a lower priority so request
+            # threads win the CPU.
+            _pool = ProcessPoolExecutor(
+                max_workers=_settings['workers'],
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=os.nice,
+                initargs=(_settings['nice'],)
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def _discard(pool):
+    """Drop a broken pool so the next job builds a new one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _run(func, *args):
+    if _settings['workers'] <= 0:
+        return func(*args)
+    # One deadline for the queue wait and the job itself
+    deadline = time.monotonic() + _settings['timeout']
+    if not _slots.acquire(timeout=_settings['timeout']):
+        raise HashingBusy('Password hashing queue is full')
+    try:
+        for _ in range(2):
+            pool = _executor()
+            try:
+                return pool.submit(func, *args).result(timeout=max(deadline - time.monotonic(), 0))
+            except BrokenProcessPool:
+                # A pool process died (e.g. OOM-killed): rebuild and retry once
+                _discard(pool)
+        raise HashingBusy('Password hashing pool keeps failing')
+    except FuturesTimeout:
+        raise HashingBusy('Password hashing timed out') from None
+    finally:
+        _slots.release()
+
+
+def hash_password(password):
+    """Hash with the configured method and cost"""
+    return _run(generate_password_hash, password, _settings['method'])
+
+
+def verify_password(pwhash, password):
+    return _run(check_password_hash, pwhash, password)
+
+
+def needs_rehash(pwhash):
+    """True if pwhash was made with another method or cost than configured"""
+    return pwhash.split('$', 1)[0] != _settings['method']
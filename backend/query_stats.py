@@ -0,0 +1,107 @@
+# backend/query_stats.py
+"""
+Query Statistics
+Per-request SQL statement counting, N+1 detection and query budgets
+"""
+import re
+import time
+from collections import Counter
+from functools import wraps
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+from backend.app import logger
+
+# Expanded IN lists ("IN (?, ?, ?)") collapse to one shape
+_IN_LIST = re.compile(r'\(\s*(?:\?|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+))*\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised after a request in QUERY_BUDGET_STRICT mode (tests)"""
+
+
+def query_budget(limit, repeats=None):
+    """Override QUERY_BUDGET (and optionally QUERY_REPEAT_THRESHOLD) for one view
+
+    0 disables the check. Apply below the route decorator.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            g.query_budget = limit
+            if repeats is not None:
+                g.query_repeat_threshold = repeats
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def statement_shape(statement):
+    """Normalise a parameterised statement so repeats of one query compare equal"""
+    return _IN_LIST.sub('(?)', _WHITESPACE.sub(' ', statement.strip()))
+
+
+def _instrument_engine(engine):
+    # The start time lives on the execution context, which is discarded with
+    # the statement, so a statement that raises leaves nothing behind
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.query_stats_start = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not has_request_context() or 'db_shapes' not in g:
+            return
+        started = getattr(context, 'query_stats_start', None)
+        g.db_queries += 1
+        if started is not None:
+            g.db_time += time.perf_counter() - started
+        g.db_shapes[statement_shape(statement)] += 1
+
+
+def init_query_stats(app, engine):
+    """Count SQL statements per request and enforce the query budgets
+
+    Exposes g.db_queries / g.db_time for the metrics layer. Requests over
+    their budget, or repeating one statement shape QUERY_REPEAT_THRESHOLD
+    times (a likely N+1), are logged as warnings with the request id.
+    """
+    _instrument_engine(engine)
+
+    @app.before_request
+    def _reset_query_stats():
+        g.db_queries = 0
+        g.db_time = 0.0
+        g.db_shapes = Counter()
+
+    @app.after_request
+    def _check_query_stats(response):
+        if 'db_shapes' not in g:
+            return response
+        config = current_app.config
+        count = g.db_queries
+        if config['QUERY_COUNT_HEADER']:
+            response.headers['X-DB-Queries'] = str(count)
+            response.headers['X-DB-Time-Ms'] = f'{g.db_time * 1000:.1f}'
+
+        problems = []
+        budget = g.get('query_budget', config['QUERY_BUDGET'])
+        if budget and count > budget:
+            problems.append(f'{count} queries (budget {budget})')
+        threshold = g.get('query_repeat_threshold', config['QUERY_REPEAT_THRESHOLD'])
+        if threshold:
+            for shape, repeats in g.db_shapes.most_common(3):
+                if repeats < threshold:
+                    break
+                problems.append(f'{repeats}x possible N+1: {shape[:200]}')
+
+        if problems:
+            message = f'Query budget: {request.method} {request.path} ({request.endpoint}): ' \
+                      + '; '.join(problems) + f" (rid={g.get('request_id')})"
+            logger.warning(message)
+            if config['QUERY_BUDGET_STRICT']:
+                raise QueryBudgetExceeded(message)
+        return response
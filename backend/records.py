@@ -0,0 +1,171 @@
+# backend/records.py
+"""
+Personal Records
+Per-user, per-exercise bests kept current on every write
+"""
+from sqlalchemy import and_, delete, insert, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from backend.app import db
+from backend.database_models import PersonalRecord, User, Workout, WorkoutExercise
+from backend.rollups import epley_1rm
+
+# weight: heaviest weight lifted; one_rm: best Epley estimate; set_volume:
+# reps x weight of one set; session_volume: sets x reps x weight of the
+# exercise summed over one workout
+KINDS = ('weight', 'one_rm', 'set_volume', 'session_volume')
+
+
+def _volume(exercise):
+    """sets x reps x weight of one exercise dict (missing weight counts as 0)"""
+    return exercise['sets'] * exercise['reps'] * (exercise['weight'] or 0)
+
+
+def _row_values(exercise):
+    """Record candidates of a single exercise row; unweighted rows set none"""
+    weight = exercise['weight']
+    if not weight or weight <= 0:
+        return {}
+    return {
+        'weight': float(weight),
+        'one_rm': epley_1rm(weight, exercise['reps']),
+        'set_volume': exercise['reps'] * weight,
+    }
+
+
+class _Bests:
+    """Best (value, date, workout_id) per (exercise id, kind)
+
+    Ties go to the earliest date, then the lowest workout id, the same order
+    the upsert condition and the migration backfill use.
+    """
+
+    def __init__(self):
+        self.records = {}
+
+    def offer(self, exercise_id, kind, value, day, workout_id):
+        if value is None or value <= 0:
+            return
+        current = self.records.get((exercise_id, kind))
+        if current is None or (-value, day, workout_id) < (-current[0], current[1], current[2]):
+            self.records[(exercise_id, kind)] = (value, day, workout_id)
+
+    def add_workout(self, workout_id, day, exercises):
+        sessions = {}
+        for exercise in exercises:
+            exercise_id = exercise['exercise_id']
+            for kind, value in _row_values(exercise).items():
+                self.offer(exercise_id, kind, value, day, workout_id)
+            sessions[exercise_id] = sessions.get(exercise_id, 0) + _volume(exercise)
+        for exercise_id, volume in sessions.items():
+            self.offer(exercise_id, 'session_volume', float(volume), day, workout_id)
+
+    def rows(self, user_id):
+        return [
+            {'user_id': user_id, 'exercise_id': exercise_id, 'kind': kind,
+             'value': value, 'achieved_on': day, 'workout_id': workout_id}
+            for (exercise_id, kind), (value, day, workout_id) in self.records.items()
+        ]
+
+
+def _offer(user_id, bests):
+    """Upsert candidate records, replacing only those they beat"""
+    rows = bests.rows(user_id)
+    if not rows:
+        return
+    table = PersonalRecord.__table__
+    dialect = db.session.get_bind().dialect.name
+    stmt = (postgresql.insert if dialect == 'postgresql' else sqlite.insert)(table)
+    new = stmt.excluded
+    beats = or_(
+        new.value > table.c.value,
+        and_(new.value == table.c.value, or_(
+            new.achieved_on < table.c.achieved_on,
+            and_(new.achieved_on == table.c.achieved_on, new.workout_id < table.c.workout_id)
+        ))
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(table.primary_key.columns),
+        set_={'value': new.value, 'achieved_on': new.achieved_on, 'workout_id': new.workout_id},
+        where=beats
+    )
+    db.session.execute(stmt, rows)
+
+
+def add_workouts(user_id, workouts):
+    """Compare newly inserted workouts, given as (id, date, [exercise dicts]), with the records
+
+    One upsert in the caller's transaction, whatever the number of workouts.
+    """
+    bests = _Bests()
+    for workout_id, day, exercises in workouts:
+        bests.add_workout(workout_id, day, exercises)
+    _offer(user_id, bests)
+
+
+def add_exercise(user_id, workout_id, day, exercise, prior_volume=0):
+    """Compare one exercise added to an existing workout with the records
+
+    prior_volume is the workout's volume of that exercise before the new
+    row, so the session record needs no recount.
+    """
+    bests = _Bests()
+    for kind, value in _row_values(exercise).items():
+        bests.offer(exercise['exercise_id'], kind, value, day, workout_id)
+    bests.offer(exercise['exercise_id'], 'session_volume', float(prior_volume + _volume(exercise)), day, workout_id)
+    _offer(user_id, bests)
+
+
+def recompute(user_id, exercise_ids=None):
+    """Rebuild the records of one user from workout_exercise (all exercises, or exercise_ids)"""
+    exercises = WorkoutExercise.__table__
+    workouts = Workout.__table__
+    query = select(workouts.c.id, workouts.c.date, exercises.c.exercise_id, exercises.c.sets,
+                   exercises.c.reps, exercises.c.weight)\
+        .select_from(exercises.join(workouts, workouts.c.id == exercises.c.workout_id))\
+        .where(workouts.c.user_id == user_id)\
+        .order_by(workouts.c.id)
+    table = PersonalRecord.__table__
+    stmt = delete(table).where(table.c.user_id == user_id)
+    if exercise_ids is not None:
+        query = query.where(exercises.c.exercise_id.in_(exercise_ids))
+        stmt = stmt.where(table.c.exercise_id.in_(exercise_ids))
+
+    bests = _Bests()
+    current_id, current_day, current = None, None, []
+    for row in db.session.execute(query):
+        if row.id != current_id:
+            if current:
+                bests.add_workout(current_id, current_day, current)
+            current_id, current_day, current = row.id, row.date, []
+        current.append({'exercise_id': row.exercise_id, 'sets': row.sets, 'reps': row.reps, 'weight': row.weight})
+    if current:
+        bests.add_workout(current_id, current_day, current)
+
+    db.session.execute(stmt)
+    rows = bests.rows(user_id)
+    if rows:
+        db.session.execute(insert(table), rows)
+    return len(rows)
+
+
+def refresh(user_id, workout_id, exercise_ids):
+    """Recompute records that pointed at a deleted workout (or one of its exercises)
+
+    Call after the delete is flushed. Records held by other workouts cannot
+    be affected, so usually this is a single primary-key range read.
+    """
+    stale = db.session.query(PersonalRecord.exercise_id)\
+        .filter(PersonalRecord.user_id == user_id,
+                PersonalRecord.workout_id == workout_id,
+                PersonalRecord.exercise_id.in_(set(exercise_ids)))\
+        .distinct()\
+        .all()
+    if stale:
+        recompute(user_id, [exercise_id for exercise_id, in stale])
+
+
+def rebuild(user_id=None):
+    """Rebuild the records of one user (or everyone); returns rows written"""
+    user_ids = [user_id] if user_id is not None else [uid for uid, in db.session.query(User.id)]
+    return sum(recompute(uid) for uid in user_ids)
@@ -0,0 +1,194 @@
+# backend/rollups.py
+"""
+Exercise Rollups
+Per-user, per-exercise day/week/month aggregates kept current on every write
+"""
+import datetime
+
+from sqlalchemy import case, delete, distinct, func, insert, literal, literal_column, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+
+from backend.app import db
+from backend.database_models import ExerciseRollup, Workout, WorkoutExercise, exercise_volume
+
+GRAINS = ('day', 'week', 'month')
+SUMMED = ('entry_count', 'session_count', 'total_sets', 'total_reps', 'volume')
+MAXED = ('max_weight', 'max_1rm')
+COLUMNS = ('user_id', 'grain', 'exercise_id', 'bucket', *SUMMED, *MAXED)
+CHUNK_SIZE = 500
+
+
+def epley_1rm(weight, reps):
+    """Estimated one-rep max (Epley), as calculate_1rm in frontend/utils.py"""
+    if weight is None:
+        return None
+    if reps <= 1:
+        return float(weight)
+    return weight * (1 + reps / 30.0)
+
+
+def bucket_start(day, grain):
+    """First day of the day/week/month containing day (weeks start on Monday)"""
+    if grain == 'week':
+        return day - datetime.timedelta(days=day.weekday())
+    if grain == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def bucket_end(start, grain):
+    """Last day of the bucket starting at start"""
+    if grain == 'week':
+        return start + datetime.timedelta(days=6)
+    if grain == 'month':
+        return (start + datetime.timedelta(days=32)).replace(day=1) - datetime.timedelta(days=1)
+    return start
+
+
+# ============================================================================
+# INCREMENTAL UPDATES
+# ============================================================================
+
+def _greater_sql(current, new):
+    """Larger of two nullable columns (SQLite's scalar max() returns NULL on NULL)"""
+    return case((new.is_(None), current), (current.is_(None), new), (new > current, new), else_=current)
+
+
+def _merge(stmt):
+    """Make an INSERT into exercise_rollup add its rows onto existing buckets"""
+    table = ExerciseRollup.__table__
+    merged = {name: table.c[name] + stmt.excluded[name] for name in SUMMED}
+    merged.update({name: _greater_sql(table.c[name], stmt.excluded[name]) for name in MAXED})
+    return stmt.on_conflict_do_update(index_elements=list(table.primary_key.columns), set_=merged)
+
+
+def _upsert_insert():
+    dialect = db.session.get_bind().dialect.name
+    return (postgresql.insert if dialect == 'postgresql' else sqlite.insert)(ExerciseRollup.__table__)
+
+
+def add_workouts(user_id, workout_ids):
+    """Count newly inserted workouts and all of their exercises
+
+    Call after the exercise rows are inserted, in the same transaction. Each
+    chunk of workouts is aggregated and merged with one INSERT ... SELECT
+    ... ON CONFLICT; a workout only ever lands in one chunk, so session
+    counts add up.
+    """
+    for start in range(0, len(workout_ids), CHUNK_SIZE):
+        chunk = workout_ids[start:start + CHUNK_SIZE]
+        query = union_all(*[
+            # By id only: with a user_id filter SQLite walks the user's whole
+            # history through the (user_id, date, id) index for every chunk
+            _aggregate_query(grain, Workout.id.in_(chunk))
+            for grain in GRAINS
+        ])
+        db.session.execute(_merge(_upsert_insert().from_select(COLUMNS, query)))
+
+
+def add_exercise(user_id, day, exercise, new_session):
+    """Count one exercise added to an existing workout
+
+    new_session is False when the workout already contains the same
+    exercise, so its session is not counted twice.
+    """
+    delta = {
+        'entry_count': 1,
+        'session_count': int(new_session),
+        'total_sets': exercise['sets'],
+        'total_reps': exercise['reps'],
+        'volume': exercise['sets'] * exercise['reps'] * (exercise['weight'] or 0),
+        'max_weight': exercise['weight'],
+        'max_1rm': epley_1rm(exercise['weight'], exercise['reps']),
+    }
+    db.session.execute(_merge(_upsert_insert()), [
+        dict(delta, user_id=user_id, grain=grain, exercise_id=exercise['exercise_id'],
+             bucket=bucket_start(day, grain))
+        for grain in GRAINS
+    ])
+
+
+# ============================================================================
+# RECOMPUTE
+# ============================================================================
+
+def bucket_sql(column, grain):
+    """SQL expression of bucket_start(column, grain), on SQLite and PostgreSQL"""
+    if grain == 'day':
+        return column
+    if db.session.get_bind().dialect.name == 'sqlite':
+        modifiers = {'week': ("'weekday 0'", "'-6 days'"), 'month': ("'start of month'",)}[grain]
+        return func.date(column, *[literal_column(m) for m in modifiers])
+    return db.cast(func.date_trunc(literal_column(f"'{grain}'"), column), db.Date)
+
+
+def _aggregate_query(grain, *filters):
+    """SELECT the rollup rows of one grain from workout_exercise"""
+    exercises = WorkoutExercise.__table__
+    workouts = Workout.__table__
+    bucket = bucket_sql(workouts.c.date, grain)
+    one_rm = case(
+        (exercises.c.reps <= 1, exercises.c.weight),
+        else_=exercises.c.weight * (1 + exercises.c.reps / 30.0)
+    )
+    return select(
+            workouts.c.user_id, literal(grain), exercises.c.exercise_id, bucket,
+            func.count(exercises.c.id), func.count(distinct(exercises.c.workout_id)),
+            func.sum(exercises.c.sets), func.sum(exercises.c.reps), func.sum(exercise_volume(exercises)),
+            func.max(exercises.c.weight), func.max(one_rm)
+        )\
+        .select_from(exercises.join(workouts, workouts.c.id == exercises.c.workout_id))\
+        .where(*filters)\
+        .group_by(workouts.c.user_id, exercises.c.exercise_id, bucket)
+
+
+def _insert_aggregates(queries):
+    """One INSERT ... SELECT for the aggregate queries of several grains"""
+    stmt = insert(ExerciseRollup.__table__).from_select(COLUMNS, union_all(*queries))
+    return db.session.execute(stmt).rowcount
+
+
+def refresh(user_id, affected):
+    """Recompute the buckets touched by deleted exercises
+
+    affected holds (exercise id, date) pairs; call after the delete is
+    flushed. Maxima and session counts cannot be decremented, so the
+    affected buckets are rebuilt from the remaining rows (bounded by one
+    week/month of those exercises) with a DELETE per grain and one INSERT.
+    """
+    affected = set(affected)
+    if not affected:
+        return
+    exercise_ids = {exercise_id for exercise_id, _ in affected}
+    days = [day for _, day in affected]
+    table = ExerciseRollup.__table__
+    ranges = {
+        grain: (bucket_start(min(days), grain), bucket_end(bucket_start(max(days), grain), grain))
+        for grain in GRAINS
+    }
+    for grain, (lo, hi) in ranges.items():
+        # One DELETE per grain: with the grains OR-ed together SQLite cannot
+        # seek the primary key past user_id and scans all the user's rollups
+        db.session.execute(delete(table).where(
+            table.c.user_id == user_id,
+            table.c.grain == grain,
+            table.c.exercise_id.in_(exercise_ids),
+            table.c.bucket.between(lo, hi)
+        ))
+    _insert_aggregates([
+        _aggregate_query(grain, Workout.user_id == user_id,
+                         WorkoutExercise.exercise_id.in_(exercise_ids), Workout.date.between(lo, hi))
+        for grain, (lo, hi) in ranges.items()
+    ])
+
+
+def rebuild(user_id=None):
+    """Drop and rebuild the rollups of one user (or everyone); returns rows written"""
+    table = ExerciseRollup.__table__
+    stmt = delete(table)
+    filters = []
+    if user_id is not None:
+        stmt = stmt.where(table.c.user_id == user_id)
+        filters.append(Workout.user_id == user_id)
+    db.session.execute(stmt)
+    return _insert_aggregates([_aggregate_query(grain, *filters) for grain in GRAINS])
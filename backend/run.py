@@ -1,12 +1,25 @@
 # backend/run.py
 """
 Backend Server Entry Point
-Run the Flask application
+Run the Flask development server, or gunicorn with `serve`
+
+    python -m backend.run          # Werkzeug dev server (PORT, FLASK_DEBUG)
+    python -m backend.run serve    # gunicorn with backend/gunicorn.conf.py
 """
 import os
-from backend import app
+import sys
 
-if __name__ == '__main__':
+
+def serve(extra_args=()):
+    """Replace this process with gunicorn so it receives signals directly"""
+    config = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gunicorn.conf.py')
+    args = [sys.executable, '-m', 'gunicorn', '--config', config, *extra_args, 'backend:app']
+    os.execv(sys.executable, args)
+
+
+def run_dev():
+    from backend import app
+    
     # Get configuration from environment
     port = int(os.getenv('PORT', 5000))
     debug = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
@@ -23,3 +36,10 @@ if __name__ == '__main__':
         port=port,
         debug=debug
     )
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        serve(sys.argv[2:])
+    else:
+        run_dev()
@@ -0,0 +1,169 @@
+"""
+Index benchmark for the hot access paths.
+
+Builds a large synthetic SQLite dataset, then runs the hot queries with the
+old single-column indexes ("before") and with the composite indexes from
+migrations 92e469e59795 and 7f3c2a9d1e40 ("after"), printing the query plan and latency of
+each. Run from the repository root:
+
+    python backend/scripts/bench_indexes.py [--users 200] [--workouts 250] [--exercises 5]
+"""
+import sys, os
+import time
+import random
+import argparse
+import datetime
+import statistics
+import tempfile
+
+from sqlalchemy import text
+
+# Ensure repository root is on sys.path so 'import backend' works when running from scripts/
+sys.path.insert(0, os.getcwd())
+
+# The app is imported in main(), once DATABASE_URL points at the throwaway database
+EXERCISE_NAMES = [
+    'Bench press', 'Dřep', 'Mrtvý tah', 'Přítahy na hrazdě', 'Tlaky na ramena',
+    'Biceps zdvih', 'Triceps kliky', 'Výpady', 'Leg press', 'Veslování',
+]
+
+INDEX_SETS = {
+    'before': [
+        "CREATE INDEX ix_workout_user_id ON workout(user_id)",
+        "CREATE INDEX ix_workout_exercise_workout_id ON workout_exercise(workout_id)",
+    ],
+    'after': [
+        "CREATE INDEX ix_workout_user_date_id ON workout(user_id, date DESC, id DESC)",
+        "CREATE INDEX ix_workout_exercise_workout_exercise ON workout_exercise(workout_id, exercise_id)",
+    ],
+}
+MANAGED_INDEXES = [
+    'ix_workout_user_id', 'ix_workout_exercise_workout_id',
+    'ix_workout_user_date_id', 'ix_workout_exercise_workout_exercise',
+]
+
+
+def seed(n_users, n_workouts, n_exercises):
+    """Insert the synthetic dataset with Core executemany"""
+    from backend import db, exercise_names
+    from backend.database_models import User, Workout, WorkoutExercise
+
+    rng = random.Random(42)
+    start = datetime.date(2015, 1, 1)
+    users = [{'id': u, 'username': f'bench{u}', 'password': 'x'} for u in range(1, n_users + 1)]
+    db.session.execute(User.__table__.insert(), users)
+    exercise_ids = exercise_names.resolve(EXERCISE_NAMES)
+
+    workouts, exercises = [], []
+    workout_id = exercise_id = 0
+    # Interleave users day by day so each user's rows are scattered across the table
+    for day in range(n_workouts):
+        for u in range(1, n_users + 1):
+            workout_id += 1
+            workouts.append({'id': workout_id, 'user_id': u,
+                             'date': start + datetime.timedelta(days=day), 'note': f'Workout {day}'})
+            for name in rng.sample(EXERCISE_NAMES, n_exercises):
+                exercise_id += 1
+                exercises.append({'id': exercise_id, 'workout_id': workout_id, 'exercise_id': exercise_ids[name],
+                                  'sets': rng.randint(2, 5), 'reps': rng.randint(5, 12),
+                                  'weight': float(rng.randint(10, 120))})
+    db.session.execute(Workout.__table__.insert(), workouts)
+    db.session.execute(WorkoutExercise.__table__.insert(), exercises)
+    db.session.commit()
+    return workout_id, exercise_id
+
+
+def use_index_set(name):
+    from backend import db
+
+    for index in MANAGED_INDEXES:
+        db.session.execute(text(f'DROP INDEX IF EXISTS {index}'))
+    for stmt in INDEX_SETS[name]:
+        db.session.execute(text(stmt))
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
+
+
+def hot_queries(user_id, workout_id, n_workouts):
+    """Query builders for the endpoints' hot paths, keyed by label"""
+    from backend import db, exercise_names
+    from backend.database_models import Workout, WorkoutExercise
+    from backend.api_routes import _workout_listing_query
+
+    middle = datetime.date(2015, 1, 1) + datetime.timedelta(days=n_workouts // 2)
+    return {
+        'listing first page': lambda: _workout_listing_query(user_id).limit(21),
+        'listing cursor page': lambda: _workout_listing_query(user_id, cursor=[middle, 10 ** 9]).limit(21),
+        'listing full history': lambda: _workout_listing_query(user_id),
+        'exercise progress by name': lambda: db.session.query(
+                Workout.date, WorkoutExercise.sets, WorkoutExercise.reps, WorkoutExercise.weight
+            )
+            .join(Workout, Workout.id == WorkoutExercise.workout_id)
+            .filter(Workout.user_id == user_id,
+                    WorkoutExercise.exercise_id == exercise_names.lookup_id('Bench press'))
+            .order_by(Workout.date),
+        'workout detail exercises': lambda: WorkoutExercise.query.filter_by(workout_id=workout_id),
+        'workout count': lambda: db.session.query(db.func.count(Workout.id)).filter(Workout.user_id == user_id),
+    }
+
+
+def query_plan(query):
+    from backend import db
+
+    sql = str(query.statement.compile(db.engine, compile_kwargs={'literal_binds': True}))
+    rows = db.session.execute(text(f'EXPLAIN QUERY PLAN {sql}')).all()
+    return '; '.join(row[-1] for row in rows)
+
+
+def run(label, n_users, n_workouts, repeats):
+    rng = random.Random(7)
+    results = {}
+    for _ in range(repeats):
+        user_id = rng.randint(1, n_users)
+        workout_id = rng.randint(1, n_users * n_workouts)
+        for name, build in hot_queries(user_id, workout_id, n_workouts).items():
+            t0 = time.perf_counter()
+            build().all()
+            results.setdefault(name, []).append((time.perf_counter() - t0) * 1000)
+
+    print(f'\n=== {label} ===')
+    for name, build in hot_queries(1, 1, n_workouts).items():
+        timings = sorted(results[name])
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f'{name:28s} median {statistics.median(timings):8.2f} ms  p95 {p95:8.2f} ms')
+        print(f'    plan: {query_plan(build())}')
+    return {name: statistics.median(t) for name, t in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--workouts', type=int, default=250, help='workouts per user')
+    parser.add_argument('--exercises', type=int, default=5, help='exercises per workout')
+    parser.add_argument('--repeats', type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='fittrack_bench_') as tmpdir:
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmpdir, 'bench.sqlite3')}"
+        import backend
+        from backend import db
+
+        with backend.app.app_context():
+            db.create_all()
+            t0 = time.perf_counter()
+            total_workouts, total_exercises = seed(args.users, args.workouts, args.exercises)
+            print(f'Seeded {total_workouts} workouts / {total_exercises} exercises '
+                  f'in {time.perf_counter() - t0:.1f}s ({tmpdir})')
+
+            medians = {}
+            for label in ('before', 'after'):
+                use_index_set(label)
+                medians[label] = run(label, args.users, args.workouts, args.repeats)
+
+            print('\n=== speedup (median before / after) ===')
+            for name in medians['before']:
+                print(f"{name:28s} {medians['before'][name] / medians['after'][name]:6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+JSON serialization micro-benchmark for realistic /workouts payloads.
+
+Builds /api/workouts?include=exercises style payloads (plus one carrying raw
+dates, Decimals and dataclasses) and times Flask's stdlib DefaultJSONProvider
+against backend.json_provider.FastJSONProvider, both for dumps() and for the
+full jsonify() response. Run from the repository root:
+
+    python backend/scripts/bench_json.py [--workouts 1000] [--exercises 5] [--repeats 50]
+"""
+import sys, os
+import time
+import random
+import argparse
+import datetime
+import statistics
+import dataclasses
+from decimal import Decimal
+
+# Ensure repository root is on sys.path so 'import backend' works when running from scripts/
+sys.path.insert(0, os.getcwd())
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from backend.json_provider import FastJSONProvider, _default
+
+EXERCISE_NAMES = ['Bench press', 'Dřep', 'Mrtvý tah', 'Veslování', 'Tlaky na ramena', 'Výpady']
+
+
+@dataclasses.dataclass
+class ExerciseRow:
+    name: str
+    sets: int
+    reps: int
+    weight: Decimal
+
+
+class StdlibProvider(DefaultJSONProvider):
+    """Flask's provider with the same type coverage, to compare like with like"""
+    default = staticmethod(_default)
+
+
+def workouts_payload(n_workouts, n_exercises, typed=False):
+    """Payload shaped like GET /api/workouts?include=exercises
+
+    With typed=True, dates, weights and exercises are left as date, Decimal
+    and dataclass objects for the provider's default hook to encode.
+    """
+    rng = random.Random(3)
+    start = datetime.date(2020, 1, 1)
+    workouts = []
+    for i in range(n_workouts):
+        day = start + datetime.timedelta(days=i)
+        exercises = []
+        for j in range(n_exercises):
+            weight = rng.randint(40, 2800) / 20
+            if typed:
+                exercises.append(ExerciseRow(rng.choice(EXERCISE_NAMES), 3, rng.randint(5, 12), Decimal(str(weight))))
+            else:
+                exercises.append({'id': i * n_exercises + j + 1, 'workout_id': i + 1,
+                                  'name': rng.choice(EXERCISE_NAMES), 'sets': 3,
+                                  'reps': rng.randint(5, 12), 'weight': weight})
+        workouts.append({
+            'id': i + 1,
+            'user_id': 1,
+            'date': day if typed else day.isoformat(),
+            'note': f'Trénink {i}',
+            'exercise_count': n_exercises,
+            'exercises': exercises
+        })
+    return {'ok': True, 'workouts': workouts, 'next_cursor': None}
+
+
+def timeit(func, repeats):
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workouts', type=int, default=1000)
+    parser.add_argument('--exercises', type=int, default=5, help='exercises per workout')
+    parser.add_argument('--repeats', type=int, default=50)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    providers = {'stdlib': StdlibProvider(app), 'fast': FastJSONProvider(app)}
+    if not providers['fast'].fast:
+        print('orjson is not installed: FastJSONProvider runs on the stdlib encoder')
+
+    payloads = {
+        'page (20 workouts)': workouts_payload(20, args.exercises),
+        f'history ({args.workouts} workouts)': workouts_payload(args.workouts, args.exercises),
+        f'typed ({args.workouts} workouts)': workouts_payload(args.workouts, args.exercises, typed=True),
+    }
+
+    print(f"{'payload':28s} {'op':9s} {'stdlib ms':>10s} {'fast ms':>9s} {'speedup':>8s} {'KB':>7s}")
+    with app.app_context():
+        for label, payload in payloads.items():
+            size_kb = len(providers['fast'].response(payload).get_data()) / 1024
+            for op in ('dumps', 'response'):
+                medians = {}
+                for name, provider in providers.items():
+                    func = getattr(provider, op)
+                    medians[name] = timeit(lambda: func(payload), args.repeats)
+                print(f"{label:28s} {op:9s} {medians['stdlib']:10.3f} {medians['fast']:9.3f} "
+                      f"{medians['stdlib'] / medians['fast']:7.1f}x {size_kb:7.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Login-storm benchmark: latency of unrelated endpoints during a burst of logins.
+
+Runs one simulated gthread worker (a thread pool over the app in a single
+process) twice in fresh subprocesses: hashing inline on the request threads
+(PASSWORD_HASH_WORKERS=0) and in the low-priority process pool. --storm
+threads log in back to back while --probes logged-in sessions keep reading
+/api/workouts?limit=20 and /api/stats; the probes' latencies are reported.
+Run from the repository root:
+
+    python backend/scripts/bench_login_storm.py [--storm 6] [--probes 2] [--seconds 10]
+"""
+import sys, os
+import json
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+
+# Ensure repository root is on sys.path so 'import backend' works when running from scripts/
+sys.path.insert(0, os.getcwd())
+
+PASSWORD = 'stormpass123'
+MODES = {
+    'inline': {'PASSWORD_HASH_WORKERS': '0'},
+    'process pool': {},
+}
+
+
+def percentile(values, q):
+    values = sorted(values) or [0.0]
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def run_child(args):
+    import backend
+    from backend import db, passwords
+    from backend.database_models import User
+
+    app = backend.app
+    n_users = args.storm + args.probes
+    with app.app_context():
+        # Seed hashes inline so setup time does not depend on the mode
+        pwhash = passwords.generate_password_hash(PASSWORD, passwords._settings['method'])
+        db.session.execute(User.__table__.insert(),
+                           [{'username': f'storm{i}', 'password': pwhash} for i in range(n_users)])
+        db.session.commit()
+
+    stop = threading.Event()
+    barrier = threading.Barrier(args.storm + args.probes + 1)
+    logins, probe_latencies = [], []
+    lock = threading.Lock()
+
+    def storm(i):
+        client = app.test_client()
+        barrier.wait()
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            r = client.post('/api/login', json={'username': f'storm{i}', 'password': PASSWORD})
+            with lock:
+                logins.append((time.perf_counter() - t0) * 1000 if r.status_code == 200 else None)
+
+    def probe(i):
+        client = app.test_client()
+        client.post('/api/login', json={'username': f'storm{args.storm + i}', 'password': PASSWORD})
+        client.post('/api/workouts', json={'note': 'probe', 'exercises': [{'name': 'Dřep'}]})
+        barrier.wait()
+        urls = ['/api/workouts?limit=20', '/api/stats']
+        n = 0
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            client.get(urls[n % 2])
+            n += 1
+            with lock:
+                probe_latencies.append((time.perf_counter() - t0) * 1000)
+
+    threads = [threading.Thread(target=storm, args=(i,)) for i in range(args.storm)]
+    threads += [threading.Thread(target=probe, args=(i,)) for i in range(args.probes)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    time.sleep(args.seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    ok_logins = [ms for ms in logins if ms is not None]
+    print(json.dumps({
+        'logins_per_s': len(ok_logins) / args.seconds,
+        'login_errors': len(logins) - len(ok_logins),
+        'login_p50_ms': percentile(ok_logins, 0.5),
+        'probe_count': len(probe_latencies),
+        'probe_p50_ms': percentile(probe_latencies, 0.5),
+        'probe_p99_ms': percentile(probe_latencies, 0.99),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--storm', type=int, default=6, help='threads logging in back to back')
+    parser.add_argument('--probes', type=int, default=2, help='threads reading unrelated endpoints')
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    results = {}
+    for mode, overrides in MODES.items():
+        with tempfile.TemporaryDirectory(prefix='fittrack_storm_') as tmpdir:
+            env = dict(os.environ, METRICS_ENABLED='false', **overrides)
+            env['DATABASE_URL'] = f"sqlite:///{os.path.join(tmpdir, 'storm.sqlite3')}"
+            out = subprocess.run(
+                [sys.executable, __file__, '--child', '--storm', str(args.storm),
+                 '--probes', str(args.probes), '--seconds', str(args.seconds)],
+                env=env, capture_output=True, text=True, check=True
+            )
+            results[mode] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    print(f"{'mode':13s} {'logins/s':>9s} {'login p50':>10s} {'probes':>7s} {'probe p50':>10s} {'probe p99':>10s}")
+    for mode, r in results.items():
+        print(f"{mode:13s} {r['logins_per_s']:9.1f} {r['login_p50_ms']:10.1f} {r['probe_count']:7d} "
+              f"{r['probe_p50_ms']:10.1f} {r['probe_p99_ms']:10.1f}")
+
+
+if __name__ == '__main__':
+    main()
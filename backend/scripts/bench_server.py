@@ -0,0 +1,138 @@
+"""
+Throughput comparison: Werkzeug dev server vs gunicorn (backend/gunicorn.conf.py).
+
+Starts each server in turn on the same seeded SQLite database, then drives
+it over HTTP with --clients concurrent logged-in sessions for --seconds,
+mixing the hot read routes (paged /api/workouts, /api/stats, a workout
+detail) with occasional workout creation. Run from the repository root:
+
+    python backend/scripts/bench_server.py [--clients 16] [--seconds 15] [--write-ratio 0.1]
+"""
+import sys, os
+import time
+import random
+import signal
+import argparse
+import tempfile
+import threading
+import subprocess
+
+import requests
+
+PASSWORD = 'benchpass123'
+
+SERVERS = {
+    # FLASK_DEBUG=False: threaded Werkzeug server without the reloader
+    'dev server': (['-m', 'backend.run'], {'FLASK_DEBUG': 'False'}),
+    'gunicorn': (['-m', 'backend.run', 'serve'], {}),
+}
+
+
+def wait_until_up(base, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(f'{base}/health', timeout=1).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f'{base} did not come up')
+
+
+def login(base, username):
+    session = requests.Session()
+    session.post(f'{base}/api/register', json={'username': username, 'password': PASSWORD}, timeout=30)
+    r = session.post(f'{base}/api/login', json={'username': username, 'password': PASSWORD}, timeout=30)
+    r.raise_for_status()
+    for i in range(30):
+        session.post(f'{base}/api/workouts', json={
+            'date': f'2024-01-{i % 28 + 1:02d}', 'note': f'seed {i}',
+            'exercises': [{'name': 'Dřep', 'sets': 3, 'reps': 10, 'weight': 80}] * 4
+        }, timeout=30)
+    return session
+
+
+def client(base, session, seconds, write_ratio, seed, stats, lock, barrier):
+    rng = random.Random(seed)
+    workout_ids = [w['id'] for w in session.get(f'{base}/api/workouts', timeout=30).json()['workouts']]
+    barrier.wait()
+    deadline = time.perf_counter() + seconds
+    ok = errors = 0
+    latencies = []
+    while time.perf_counter() < deadline:
+        roll = rng.random()
+        t0 = time.perf_counter()
+        try:
+            if roll < write_ratio:
+                r = session.post(f'{base}/api/workouts', json={
+                    'note': 'bench', 'exercises': [{'name': 'Bench press', 'sets': 3, 'reps': 8, 'weight': 60}]
+                }, timeout=30)
+            elif roll < 0.6:
+                r = session.get(f'{base}/api/workouts', params={'limit': 20}, timeout=30)
+            elif roll < 0.8:
+                r = session.get(f'{base}/api/stats', timeout=30)
+            else:
+                r = session.get(f'{base}/api/workouts/{rng.choice(workout_ids)}', timeout=30)
+            ok += r.status_code < 400
+            errors += r.status_code >= 400
+        except requests.RequestException:
+            errors += 1
+        latencies.append((time.perf_counter() - t0) * 1000)
+    with lock:
+        stats['ok'] += ok
+        stats['errors'] += errors
+        stats['latencies'].extend(latencies)
+
+
+def bench(name, args, tmpdir, port):
+    module_args, overrides = SERVERS[name]
+    env = dict(os.environ, PYTHONPATH=os.getcwd(), PORT=str(port), METRICS_ENABLED='false',
+               DATABASE_URL=f"sqlite:///{os.path.join(tmpdir, 'bench.sqlite3')}", **overrides)
+    server = subprocess.Popen([sys.executable, *module_args], env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+    base = f'http://127.0.0.1:{port}'
+    try:
+        wait_until_up(base)
+        # Separate users per server run so both start from the same history size
+        sessions = [login(base, f'{name[:3]}_{i}') for i in range(args.clients)]
+        stats = {'ok': 0, 'errors': 0, 'latencies': []}
+        lock = threading.Lock()
+        barrier = threading.Barrier(args.clients)
+        threads = [threading.Thread(target=client, args=(base, s, args.seconds, args.write_ratio, i, stats, lock, barrier))
+                   for i, s in enumerate(sessions)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        os.killpg(server.pid, signal.SIGTERM)
+        server.wait(timeout=30)
+
+    latencies = sorted(stats['latencies']) or [0.0]
+    return {
+        'req_per_s': stats['ok'] / args.seconds,
+        'errors': stats['errors'],
+        'p50_ms': latencies[len(latencies) // 2],
+        'p99_ms': latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=15)
+    parser.add_argument('--write-ratio', type=float, default=0.1)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='fittrack_server_') as tmpdir:
+        results = {name: bench(name, args, tmpdir, args.port) for name in SERVERS}
+
+    print(f"{'server':12s} {'req/s':>8s} {'errors':>7s} {'p50 ms':>8s} {'p99 ms':>8s}")
+    for name, r in results.items():
+        print(f"{name:12s} {r['req_per_s']:8.1f} {r['errors']:7d} {r['p50_ms']:8.2f} {r['p99_ms']:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
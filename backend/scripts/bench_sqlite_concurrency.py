@@ -0,0 +1,127 @@
+"""
+Mixed read/write throughput benchmark for the SQLite tuning layer.
+
+Runs the same workload twice in fresh subprocesses and databases: once with
+SQLite defaults (rollback journal, synchronous=FULL, no extra pragmas) and
+once with the SQLITE_PRAGMAS from backend/config.py. Each run uses a pool of
+threads (gunicorn gthread style) where every thread is a logged-in user doing
+paged workout listings with occasional workout creation. Run from the
+repository root:
+
+    python backend/scripts/bench_sqlite_concurrency.py [--threads 8] [--seconds 10] [--write-ratio 0.2]
+"""
+import sys, os
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+import subprocess
+
+# Ensure repository root is on sys.path so 'import backend' works when running from scripts/
+sys.path.insert(0, os.getcwd())
+
+MODES = {
+    # SQLite defaults: rollback journal, full fsync on every commit
+    'before': {
+        'SQLITE_JOURNAL_MODE': 'DELETE',
+        'SQLITE_SYNCHRONOUS': 'FULL',
+        'SQLITE_BUSY_TIMEOUT_MS': '',
+        'SQLITE_CACHE_SIZE': '',
+        'SQLITE_MMAP_SIZE': '',
+        'SQLITE_TEMP_STORE': '',
+    },
+    # Values from Config.SQLITE_PRAGMAS
+    'after': {},
+}
+
+
+def worker(app, username, seconds, write_ratio, seed, stats, lock, barrier):
+    rng = random.Random(seed)
+    client = app.test_client()
+    client.post('/api/register', json={'username': username, 'password': 'benchpass123'})
+    client.post('/api/login', json={'username': username, 'password': 'benchpass123'})
+
+    # Start measuring only once every thread has logged in (password hashing is slow)
+    barrier.wait()
+    deadline = time.perf_counter() + seconds
+    reads = writes = errors = 0
+    latencies = []
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        if rng.random() < write_ratio:
+            r = client.post('/api/workouts', json={
+                'note': 'bench',
+                'exercises': [{'name': 'Bench press', 'sets': 3, 'reps': 10, 'weight': 60}] * 4
+            })
+            writes += r.status_code < 400
+        else:
+            r = client.get('/api/workouts?limit=20')
+            reads += r.status_code < 400
+        errors += r.status_code >= 400
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+    with lock:
+        stats['reads'] += reads
+        stats['writes'] += writes
+        stats['errors'] += errors
+        stats['latencies'].extend(latencies)
+
+
+def run_child(args):
+    """Runs inside the subprocess: DATABASE_URL and SQLITE_* are already set"""
+    import backend
+    app = backend.app
+
+    stats = {'reads': 0, 'writes': 0, 'errors': 0, 'latencies': []}
+    lock = threading.Lock()
+    barrier = threading.Barrier(args.threads)
+    threads = [
+        threading.Thread(target=worker, args=(app, f'bench_{i}', args.seconds, args.write_ratio, i, stats, lock, barrier))
+        for i in range(args.threads)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    latencies = sorted(stats.pop('latencies')) or [0.0]
+    stats['p50_ms'] = latencies[len(latencies) // 2]
+    stats['p99_ms'] = latencies[int(len(latencies) * 0.99) - 1]
+    stats['ops_per_s'] = (stats['reads'] + stats['writes']) / args.seconds
+    print(json.dumps(stats))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8, help='concurrent request threads (2 workers x 4 gthreads)')
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    results = {}
+    for mode, overrides in MODES.items():
+        with tempfile.TemporaryDirectory(prefix=f'fittrack_conc_{mode}_') as tmpdir:
+            env = dict(os.environ, **overrides)
+            env['DATABASE_URL'] = f"sqlite:///{os.path.join(tmpdir, 'bench.sqlite3')}"
+            out = subprocess.run(
+                [sys.executable, __file__, '--child', '--threads', str(args.threads),
+                 '--seconds', str(args.seconds), '--write-ratio', str(args.write_ratio)],
+                env=env, capture_output=True, text=True, check=True
+            )
+            results[mode] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    print(f"{'mode':8s} {'ops/s':>9s} {'reads':>7s} {'writes':>7s} {'errors':>7s} {'p50 ms':>8s} {'p99 ms':>8s}")
+    for mode, r in results.items():
+        print(f"{mode:8s} {r['ops_per_s']:9.1f} {r['reads']:7d} {r['writes']:7d} {r['errors']:7d} "
+              f"{r['p50_ms']:8.2f} {r['p99_ms']:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
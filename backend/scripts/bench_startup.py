@@ -0,0 +1,100 @@
+"""
+Startup-time benchmark and import-time budget for the backend.
+
+Measures `import backend` (module imports + create_app) in fresh
+subprocesses against one SQLite database:
+
+  first start      empty database: create_all + introspection + stamp
+  full check       SCHEMA_CHECK=full on the stamped database (old behaviour)
+  auto (stamped)   SCHEMA_CHECK=auto, the stamp matches -> no introspection
+
+The schema check alone (_init_database, in a process started with
+SCHEMA_CHECK=skip) is timed separately for full and auto, since on a
+small machine its share is lost in the noise of the module imports. The
+script also lists the slowest imports from `python -X importtime`. With --budget-ms
+the script exits non-zero when the median "auto" start exceeds the budget,
+so it can gate CI. Run from the repository root:
+
+    python backend/scripts/bench_startup.py [--runs 7] [--budget-ms 1500]
+"""
+import sys, os
+import re
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+CHILD = (
+    "import time; t0 = time.perf_counter(); import backend; "
+    "print('STARTUP_MS', (time.perf_counter() - t0) * 1000)"
+)
+
+SCHEMA_CHILD = (
+    "import sys, time, backend; from backend.app import _init_database; "
+    "backend.app.config['SCHEMA_CHECK'] = sys.argv[1]; t0 = time.perf_counter(); "
+    "ctx = backend.app.app_context(); ctx.push(); _init_database(backend.app); "
+    "print('STARTUP_MS', (time.perf_counter() - t0) * 1000)"
+)
+
+
+def start_ms(env):
+    out = subprocess.run([sys.executable, '-c', CHILD], env=env, cwd=os.getcwd(),
+                         capture_output=True, text=True, check=True)
+    return float(re.search(r'STARTUP_MS ([\d.]+)', out.stdout).group(1))
+
+
+def schema_check_ms(env, mode):
+    out = subprocess.run([sys.executable, '-c', SCHEMA_CHILD, mode], env=dict(env, SCHEMA_CHECK='skip'),
+                         cwd=os.getcwd(), capture_output=True, text=True, check=True)
+    return float(re.search(r'STARTUP_MS ([\d.]+)', out.stdout).group(1))
+
+
+def slowest_imports(env, top):
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import backend'], env=env,
+                         cwd=os.getcwd(), capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        m = re.match(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)', line)
+        # Modules imported by backend and its submodules (two levels below the root);
+        # figures are cumulative, so a package includes its own dependencies
+        if m and len(m.group(3)) in (3, 5):
+            rows.append((int(m.group(2)) / 1000, m.group(4)))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--top', type=int, default=10, help='slowest imports to list')
+    parser.add_argument('--budget-ms', type=float, help='fail if the median auto start exceeds this')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='fittrack_startup_') as tmpdir:
+        env = dict(os.environ, PYTHONPATH=os.getcwd(),
+                   DATABASE_URL=f"sqlite:///{os.path.join(tmpdir, 'startup.sqlite3')}")
+
+        results = {'first start': [start_ms(dict(env, SCHEMA_CHECK='auto'))]}
+        for label, mode in (('full check', 'full'), ('auto (stamped)', 'auto')):
+            results[label] = [start_ms(dict(env, SCHEMA_CHECK=mode)) for _ in range(args.runs)]
+        for mode in ('full', 'auto'):
+            results[f'schema {mode}'] = [schema_check_ms(env, mode) for _ in range(args.runs)]
+        slowest = slowest_imports(dict(env, SCHEMA_CHECK='auto'), args.top)
+
+    print(f"{'mode':16s} {'median ms':>10s} {'min ms':>8s} {'max ms':>8s}")
+    for label, timings in results.items():
+        print(f"{label:16s} {statistics.median(timings):10.1f} {min(timings):8.1f} {max(timings):8.1f}")
+
+    print(f'\nslowest imports under backend (cumulative ms):')
+    for ms, module in slowest:
+        print(f'{ms:8.1f}  {module}')
+
+    if args.budget_ms is not None:
+        median = statistics.median(results['auto (stamped)'])
+        if median > args.budget_ms:
+            print(f'\nFAIL: startup {median:.0f} ms exceeds budget {args.budget_ms:.0f} ms')
+            sys.exit(1)
+        print(f'\nOK: startup {median:.0f} ms within budget {args.budget_ms:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Write-throughput benchmark: ORM unit of work vs the batched insert path.
+
+Each writer thread repeatedly creates one workout with --exercises exercises
+in its own transaction, either the old way (ORM add + flush for the id +
+one add per exercise) or with api_routes._insert_workout (INSERT ... RETURNING
+plus one multi-row INSERT). Both paths store the denormalized workout totals
+and update the rollups and personal records the same way, so the difference
+is the insert step alone. Every (path, writers) combination runs in a
+fresh subprocess and SQLite database with the configured pragmas. Run from
+the repository root:
+
+    python backend/scripts/bench_write_paths.py [--writers 1 8 32] [--seconds 5] [--exercises 6]
+"""
+import sys, os
+import json
+import time
+import argparse
+import datetime
+import tempfile
+import threading
+import subprocess
+
+# Ensure repository root is on sys.path so 'import backend' works when running from scripts/
+sys.path.insert(0, os.getcwd())
+
+PATHS = ('orm', 'batched')
+
+
+def exercise_rows(n):
+    names = ['Dřep', 'Bench press', 'Veslování', 'Mrtvý tah', 'Tlaky na ramena', 'Výpady']
+    return [{'name': names[i % len(names)], 'sets': 3, 'reps': 10, 'weight': 60.0} for i in range(n)]
+
+
+def orm_path(user_id, exercises):
+    """create_workout before the batched path, with the same derived-table upkeep"""
+    from backend import db, records, rollups
+    from backend.api_routes import _exercise_totals, _resolve_exercise_ids
+    from backend.database_models import Workout, WorkoutExercise
+
+    _resolve_exercise_ids([exercises])
+    workout = Workout(user_id=user_id, date=datetime.date.today(), note='bench', **_exercise_totals(exercises))
+    db.session.add(workout)
+    db.session.flush()
+    for ex in exercises:
+        db.session.add(WorkoutExercise(workout_id=workout.id, exercise_id=ex['exercise_id'],
+                                       sets=ex['sets'], reps=ex['reps'], weight=ex['weight']))
+    db.session.flush()
+    rollups.add_workouts(user_id, [workout.id])
+    records.add_workouts(user_id, [(workout.id, workout.date, exercises)])
+    db.session.commit()
+
+
+def batched_path(user_id, exercises):
+    from backend import db
+    from backend.api_routes import _insert_workout
+
+    _insert_workout(user_id, datetime.date.today(), 'bench', exercises)
+    db.session.commit()
+
+
+def run_child(args):
+    import backend
+    from backend import db
+    from backend.database_models import User
+
+    app = backend.app
+    with app.app_context():
+        db.session.execute(User.__table__.insert(),
+                           [{'id': i + 1, 'username': f'writer{i}', 'password': 'x'} for i in range(args.writers)])
+        db.session.commit()
+
+    write = {'orm': orm_path, 'batched': batched_path}[args.path]
+    exercises = exercise_rows(args.exercises)
+    barrier = threading.Barrier(args.writers)
+    lock = threading.Lock()
+    stats = {'workouts': 0, 'errors': 0, 'latencies': []}
+
+    def writer(user_id):
+        latencies, done, errors = [], 0, 0
+        with app.app_context():
+            barrier.wait()
+            deadline = time.perf_counter() + args.seconds
+            while time.perf_counter() < deadline:
+                t0 = time.perf_counter()
+                try:
+                    write(user_id, exercises)
+                    done += 1
+                except Exception:
+                    db.session.rollback()
+                    errors += 1
+                latencies.append((time.perf_counter() - t0) * 1000)
+            db.session.remove()
+        with lock:
+            stats['workouts'] += done
+            stats['errors'] += errors
+            stats['latencies'].extend(latencies)
+
+    threads = [threading.Thread(target=writer, args=(i + 1,)) for i in range(args.writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    latencies = sorted(stats.pop('latencies')) or [0.0]
+    stats['workouts_per_s'] = stats['workouts'] / args.seconds
+    stats['p50_ms'] = latencies[len(latencies) // 2]
+    stats['p99_ms'] = latencies[int(len(latencies) * 0.99) - 1]
+    print(json.dumps(stats))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--writers', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--exercises', type=int, default=6, help='exercises per workout')
+    parser.add_argument('--path', choices=PATHS, help=argparse.SUPPRESS)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        args.writers = args.writers[0]
+        run_child(args)
+        return
+
+    print(f"{'path':8s} {'writers':>7s} {'workouts/s':>11s} {'rows/s':>8s} {'errors':>7s} {'p50 ms':>8s} {'p99 ms':>8s}")
+    for writers in args.writers:
+        for path in PATHS:
+            with tempfile.TemporaryDirectory(prefix=f'fittrack_write_{path}_') as tmpdir:
+                env = dict(os.environ, METRICS_ENABLED='false',
+                           DATABASE_URL=f"sqlite:///{os.path.join(tmpdir, 'bench.sqlite3')}")
+                out = subprocess.run(
+                    [sys.executable, __file__, '--child', '--path', path, '--writers', str(writers),
+                     '--seconds', str(args.seconds), '--exercises', str(args.exercises)],
+                    env=env, capture_output=True, text=True, check=True
+                )
+                r = json.loads(out.stdout.strip().splitlines()[-1])
+                rows = r['workouts_per_s'] * (1 + args.exercises)
+                print(f"{path:8s} {writers:7d} {r['workouts_per_s']:11.1f} {rows:8.0f} {r['errors']:7d} "
+                      f"{r['p50_ms']:8.2f} {r['p99_ms']:8.2f}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+XLSX export benchmark: legacy in-memory Workbook vs the write-only engine.
+
+Seeds one user with --exercises exercise rows (default 100k), then runs each
+export path in a fresh subprocess and reports wall time, peak RSS growth and
+output size. The legacy path is quadratic in the number of merged workout
+rows, so it is cut off after --legacy-timeout seconds. Run from the
+repository root:
+
+    python backend/scripts/bench_xlsx_export.py [--exercises 100000] [--per-workout 5] [--legacy-timeout 600]
+"""
+import sys, os
+import io
+import time
+import json
+import random
+import argparse
+import datetime
+import resource
+import tempfile
+import subprocess
+
+# Ensure repository root is on sys.path so 'import backend' works when running from scripts/
+sys.path.insert(0, os.getcwd())
+
+
+def _peak_rss_mb():
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def legacy_export(user_id):
+    """The pre-engine implementation: full Workbook, per-cell style objects,
+    a second border pass and a NamedTemporaryFile round trip"""
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+    from backend.database_models import Workout
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Tréninky"
+    headers = ['Datum', 'Trénink', 'Cvik', 'Série', 'Opakování', 'Váha (kg)']
+    ws.append(headers)
+    for col_num, header in enumerate(headers, 1):
+        cell = ws.cell(row=1, column=col_num)
+        cell.fill = PatternFill(start_color="FFD700", end_color="FFD700", fill_type="solid")
+        cell.font = Font(bold=True, size=12, color="000000")
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+
+    workouts = Workout.query.filter_by(user_id=user_id).order_by(Workout.date.desc()).all()
+    row_num = 2
+    for workout_idx, workout in enumerate(workouts):
+        ws.append([workout.date.strftime('%d.%m.%Y'), f"🏋️ {workout.note or 'Trénink'}", '', '', '', ''])
+        for col_num in range(1, 7):
+            cell = ws.cell(row=row_num, column=col_num)
+            cell.fill = PatternFill(start_color="333333", end_color="333333", fill_type="solid")
+            cell.font = Font(bold=True, size=11, color="FFFFFF")
+            cell.alignment = Alignment(horizontal='left', vertical='center')
+        ws.merge_cells(f'B{row_num}:F{row_num}')
+        row_num += 1
+        for exercise in workout.exercises:
+            ws.append(['', '', f"  • {exercise.name}", exercise.sets, exercise.reps,
+                       exercise.weight if exercise.weight else ''])
+            for col_num in range(1, 7):
+                cell = ws.cell(row=row_num, column=col_num)
+                cell.alignment = Alignment(horizontal='left', vertical='center')
+                cell.fill = PatternFill(start_color="F9F9F9", end_color="F9F9F9", fill_type="solid")
+            row_num += 1
+        if workout_idx < len(workouts) - 1:
+            ws.append(['', '', '', '', '', ''])
+            row_num += 1
+
+    thin_border = Border(left=Side(style='thin'), right=Side(style='thin'),
+                         top=Side(style='thin'), bottom=Side(style='thin'))
+    for row in ws.iter_rows(min_row=1, max_row=row_num - 1, min_col=1, max_col=6):
+        for cell in row:
+            if cell.value:
+                cell.border = thin_border
+
+    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
+    wb.save(tmp_file.name)
+    tmp_file.close()
+    with open(tmp_file.name, 'rb') as f:
+        data = f.read()
+    os.unlink(tmp_file.name)
+    return len(data)
+
+
+def engine_export(user_id):
+    from backend import exports
+    buffer = tempfile.SpooledTemporaryFile(max_size=exports.XLSX_SPOOL_BYTES)
+    exports.write_xlsx(exports.export_rows_query(user_id, include_empty_workouts=True), buffer)
+    size = buffer.tell()
+    buffer.close()
+    return size
+
+
+def seed(n_exercises, per_workout):
+    from backend import db, exercise_names
+    from backend.database_models import User, Workout, WorkoutExercise
+
+    rng = random.Random(1)
+    names = ['Bench press', 'Dřep', 'Mrtvý tah', 'Veslování', 'Tlaky na ramena', 'Výpady']
+    exercise_ids = exercise_names.resolve(names)
+    db.session.execute(User.__table__.insert(), [{'id': 1, 'username': 'bench', 'password': 'x'}])
+    workouts, exercises = [], []
+    start = datetime.date(2000, 1, 1)
+    for i in range(n_exercises // per_workout):
+        workouts.append({'id': i + 1, 'user_id': 1, 'date': start + datetime.timedelta(days=i),
+                         'note': f'Workout {i}'})
+        for j in range(per_workout):
+            exercises.append({'workout_id': i + 1, 'exercise_id': exercise_ids[rng.choice(names)], 'sets': 3,
+                              'reps': rng.randint(5, 12), 'weight': float(rng.randint(20, 140))})
+    db.session.execute(Workout.__table__.insert(), workouts)
+    db.session.execute(WorkoutExercise.__table__.insert(), exercises)
+    db.session.commit()
+
+
+def run_child(path):
+    import backend
+    with backend.app.app_context():
+        func = {'legacy': legacy_export, 'engine': engine_export}[path]
+        rss_before = _peak_rss_mb()
+        t0 = time.perf_counter()
+        size = func(1)
+        elapsed = time.perf_counter() - t0
+        print(json.dumps({'seconds': elapsed, 'peak_rss_delta_mb': _peak_rss_mb() - rss_before,
+                          'size_kb': size / 1024}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--exercises', type=int, default=100_000)
+    parser.add_argument('--per-workout', type=int, default=5)
+    parser.add_argument('--legacy-timeout', type=float, default=600)
+    parser.add_argument('--child', choices=['legacy', 'engine'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='fittrack_xlsx_') as tmpdir:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmpdir, 'bench.sqlite3')}")
+        os.environ.update(env)
+        import backend
+        with backend.app.app_context():
+            seed(args.exercises, args.per_workout)
+        print(f'Seeded {args.exercises} exercises in {args.exercises // args.per_workout} workouts ({tmpdir})')
+
+        print(f"{'path':8s} {'wall s':>8s} {'peak RSS +MB':>13s} {'size KB':>9s}", flush=True)
+        for path in ('legacy', 'engine'):
+            try:
+                out = subprocess.run([sys.executable, __file__, '--child', path],
+                                     env=env, capture_output=True, text=True, check=True,
+                                     timeout=args.legacy_timeout if path == 'legacy' else None)
+            except subprocess.TimeoutExpired:
+                print(f"{path:8s} {'>' + str(int(args.legacy_timeout)):>8s} {'-':>13s} {'-':>9s}", flush=True)
+                continue
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"{path:8s} {r['seconds']:8.2f} {r['peak_rss_delta_mb']:13.1f} {r['size_kb']:9.0f}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""
+Query-count guard for the hot API endpoints.
+
+Seeds a throwaway SQLite database with users of different history sizes and
+asserts that the number of SQL statements per request does not grow with the
+number of workouts. Also fails when `import backend` on the stamped database
+takes longer than STARTUP_BUDGET_MS (median of 3 fresh processes, default
+1500). Run from the repository root:
+
+    python backend/scripts/check_query_counts.py
+"""
+import sys, os
+import re
+import tempfile
+import statistics
+import subprocess
+import datetime
+from contextlib import contextmanager
+
+from sqlalchemy import event, func
+from werkzeug.security import generate_password_hash
+
+# Ensure repository root is on sys.path so 'import backend' works when running from scripts/
+sys.path.insert(0, os.getcwd())
+
+# The app is imported in main(), once DATABASE_URL points at the throwaway
+# database: logins hash in a spawn pool whose workers re-import this module
+PASSWORD = 'testpass123'
+STARTUP_BUDGET_MS = float(os.getenv('STARTUP_BUDGET_MS', '1500'))
+STARTUP_CHILD = (
+    "import time; t0 = time.perf_counter(); import backend; "
+    "print('STARTUP_MS', (time.perf_counter() - t0) * 1000)"
+)
+ROLLUP_DELETE_PLAN = 'SEARCH exercise_rollup USING INDEX sqlite_autoindex_exercise_rollup_1 ' \
+                     '(user_id=? AND grain=? AND exercise_id=? AND bucket>? AND bucket<?)'
+
+
+@contextmanager
+def count_queries():
+    """Count SQL statements executed on the app engine inside the block"""
+    import backend
+    from backend import db
+
+    statements = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with backend.app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', _before)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', _before)
+
+
+def seed_user(username, n_workouts, exercises_per_workout=4):
+    """Create a user with n_workouts workouts, each with a few exercises"""
+    import backend
+    from backend import db
+    from backend.database_models import User
+    from backend.api_routes import _insert_workout
+
+    with backend.app.app_context():
+        user = User(username=username, password=generate_password_hash(PASSWORD, method='pbkdf2:sha256'))
+        db.session.add(user)
+        db.session.flush()
+        start = datetime.date(2020, 1, 1)
+        exercises = [{'name': f'Exercise {j}', 'sets': 3, 'reps': 10, 'weight': 20.0 + j}
+                     for j in range(exercises_per_workout)]
+        for i in range(n_workouts):
+            _insert_workout(user.id, start + datetime.timedelta(days=i), f'W{i}', exercises)
+        db.session.commit()
+
+
+def logged_in_client(username):
+    import backend
+
+    client = backend.app.test_client()
+    r = client.post('/api/login', json={'username': username, 'password': PASSWORD})
+    assert r.status_code == 200, r.get_json()
+    return client
+
+
+def queries_for(client, method, url, headers=None):
+    with count_queries() as statements:
+        r = client.open(url, method=method, headers=headers)
+        r.get_data()  # drain streamed responses inside the counting window
+    assert r.status_code < 400, (url, r.status_code)
+    return len(statements)
+
+
+def revalidation_queries(client, url):
+    """Queries for a GET revalidated with the ETag of the previous response"""
+    etag = client.get(url).headers['ETag']
+    return queries_for(client, 'GET', url, headers={'If-None-Match': etag})
+
+
+
+def workout_delete_queries(client, username):
+    """Delete the user's latest workout
+
+    Returns the statement count and the SQLite query plans of the DELETEs
+    that refresh the rollup buckets.
+    """
+    import backend
+    from backend import db
+    from backend.database_models import User, Workout
+
+    with backend.app.app_context():
+        workout_id = db.session.query(func.max(Workout.id))\
+            .join(User, User.id == Workout.user_id)\
+            .filter(User.username == username)\
+            .scalar()
+        engine = db.engine
+
+    deletes = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('DELETE FROM exercise_rollup'):
+            deletes.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', _before)
+    try:
+        n = queries_for(client, 'DELETE', f'/api/workouts/{workout_id}')
+    finally:
+        event.remove(engine, 'before_cursor_execute', _before)
+
+    with engine.connect() as conn:
+        plans = [' / '.join(row[-1] for row in conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters))
+                 for statement, parameters in deletes]
+    return n, plans
+
+
+def startup_ms():
+    """`import backend` in a fresh process against the (stamped) check database"""
+    out = subprocess.run([sys.executable, '-c', STARTUP_CHILD], env=dict(os.environ, PYTHONPATH=os.getcwd()),
+                         cwd=os.getcwd(), capture_output=True, text=True, check=True)
+    return float(re.search(r'STARTUP_MS ([\d.]+)', out.stdout).group(1))
+
+def main():
+    with tempfile.TemporaryDirectory(prefix='fittrack_qc_') as tmpdir:
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmpdir, 'qc.sqlite3')}"
+        import backend
+        from backend import db
+
+        with backend.app.app_context():
+            db.create_all()
+
+        sizes = {'qc_small': 5, 'qc_large': 200}
+        for username, n in sizes.items():
+            seed_user(username, n)
+
+        clients = {username: logged_in_client(username) for username in sizes}
+        checks = [
+            ('GET', '/api/workouts'),
+            ('GET', '/api/workouts?include=exercises'),
+            ('GET', '/api/stats'),
+            ('GET', '/api/stats/rollups?grain=month'),
+            ('GET', '/api/records'),
+            ('GET', '/api/export/csv'),
+        ]
+
+        failed = False
+        for method, url in checks:
+            counts = {username: queries_for(client, method, url) for username, client in clients.items()}
+            flat = len(set(counts.values())) == 1
+            failed = failed or not flat
+            print(f"{method} {url} => queries {counts} {'OK' if flat else 'GROWS WITH HISTORY'}")
+
+            # A 304 only reads the user's data version
+            counts = {username: revalidation_queries(client, url) for username, client in clients.items()}
+            ok = set(counts.values()) == {1}
+            failed = failed or not ok
+            print(f"{method} {url} (If-None-Match) => queries {counts} {'OK' if ok else 'EXPECTED 1'}")
+
+        # Rollup refresh on a long history: each DELETE seeks the primary key
+        # down to the bucket range instead of walking all the user's rollups
+        results = {username: workout_delete_queries(client, username) for username, client in clients.items()}
+        counts = {username: n for username, (n, _) in results.items()}
+        plans = [plan for _, user_plans in results.values() for plan in user_plans]
+        ok = len(set(counts.values())) == 1 and plans and all(ROLLUP_DELETE_PLAN in plan for plan in plans)
+        failed = failed or not ok
+        print(f"DELETE /api/workouts/<id> => queries {counts} {'OK' if ok else 'ROLLUP DELETE SCANS'}")
+        if not ok:
+            for plan in plans:
+                print(f'    {plan}')
+
+        median = statistics.median(startup_ms() for _ in range(3))
+        ok = median <= STARTUP_BUDGET_MS
+        failed = failed or not ok
+        print(f"import backend => {median:.0f} ms (budget {STARTUP_BUDGET_MS:.0f} ms) "
+              f"{'OK' if ok else 'OVER BUDGET'}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
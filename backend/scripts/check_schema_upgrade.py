@@ -0,0 +1,167 @@
+"""
+Schema ownership check: startup schema upgrade vs Alembic.
+
+For each starting point a throwaway SQLite database is booted once in a
+fresh process (SCHEMA_CHECK=auto), then `alembic upgrade head` is run on it:
+
+  stamped baseline   `alembic upgrade fbbce6714b21` plus a few workouts
+  unstamped legacy   the same database without alembic_version (create_all era)
+  migrated baseline  the stamped baseline taken to head by Alembic first
+  alembic head       `alembic upgrade head`, never booted before
+
+Fails unless the boot leaves the database stamped at head, Alembic then has
+nothing left to apply, the columns of every table match a database built by
+Alembic alone, and the seeded workouts are still there with their exercises.
+The seeded names include near-duplicates that are different exercises; the
+startup conversion and the migration must both keep them apart and build
+the same exercise dictionary.
+Run from the repository root:
+
+    python backend/scripts/check_schema_upgrade.py
+"""
+import sys, os
+import json
+import sqlite3
+import tempfile
+import subprocess
+
+BASELINE = 'fbbce6714b21'
+BACKEND_DIR = os.path.join(os.getcwd(), 'backend')
+
+CHILD = """
+import json
+import backend
+from sqlalchemy import text
+from backend import db
+from backend.database_models import User, WorkoutExercise
+with backend.app.app_context():
+    print('RESULT', json.dumps({
+        'stamp': db.session.execute(text('SELECT version_num FROM alembic_version')).scalar(),
+        'users': [user.to_dict()['username'] for user in User.query.order_by(User.id)],
+        'exercises': sorted(exercise.name for exercise in WorkoutExercise.query),
+        'dictionary': sorted(list(row) for row in db.session.execute(text(
+            'SELECT a.key, x.name FROM exercise_alias a JOIN exercise x ON x.id = a.exercise_id'))),
+        'rollups': db.session.execute(text('SELECT COUNT(*) FROM exercise_rollup')).scalar(),
+    }))
+"""
+
+
+def env_for(path):
+    return dict(os.environ, DATABASE_URL=f'sqlite:///{path}', SCHEMA_CHECK='auto',
+                PASSWORD_HASH_WORKERS='0', PYTHONPATH=os.getcwd())
+
+
+def alembic_upgrade(path, revision='head'):
+    """Run `alembic upgrade`; returns the revisions it applied"""
+    out = subprocess.run([sys.executable, '-m', 'alembic', 'upgrade', revision], env=env_for(path),
+                         cwd=BACKEND_DIR, capture_output=True, text=True)
+    if out.returncode != 0:
+        raise RuntimeError(f'alembic upgrade {revision} failed:\n{out.stderr[-2000:]}')
+    return [line.split('Running upgrade ', 1)[1] for line in out.stderr.splitlines()
+            if 'Running upgrade ' in line]
+
+
+def boot(path):
+    """Import the app in a fresh process; returns what CHILD reports"""
+    out = subprocess.run([sys.executable, '-c', CHILD], env=env_for(path), cwd=os.getcwd(),
+                         capture_output=True, text=True)
+    for line in out.stdout.splitlines():
+        if line.startswith('RESULT '):
+            return json.loads(line[len('RESULT '):])
+    raise RuntimeError(f'boot failed:\n{out.stderr[-2000:]}')
+
+
+def columns(path):
+    with sqlite3.connect(path) as conn:
+        tables = [name for name, in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name != 'alembic_version'")]
+        return {table: sorted(row[1] for row in conn.execute(f'PRAGMA table_info("{table}")'))
+                for table in tables}
+
+
+# Different exercises whose names fuzzy-match each other
+DISTINCT_NAMES = ['Incline barbell bench press', 'Decline barbell bench press', 'Incline dumbbell press',
+                  'Decline dumbbell press', 'Bench press 80kg', 'Bench press 90kg']
+
+
+def seed_baseline(path):
+    """Baseline schema with one user and two workouts (names in two spellings)"""
+    alembic_upgrade(path, BASELINE)
+    with sqlite3.connect(path) as conn:
+        conn.execute("INSERT INTO user (id, username, password) VALUES (1, 'baseline', 'x')")
+        conn.execute("INSERT INTO workout (id, user_id, date, note) VALUES (1, 1, '2026-01-05', 'a'), "
+                     "(2, 1, '2026-01-07', 'b')")
+        conn.execute("INSERT INTO workout_exercise (workout_id, name, sets, reps, weight) VALUES "
+                     "(1, 'Bench Press', 3, 10, 60), (1, 'Dřep', 5, 5, 100), (2, 'benchpress', 3, 8, 65)")
+        conn.executemany("INSERT INTO workout_exercise (workout_id, name, sets, reps, weight) VALUES (2, ?, 3, 8, 40)",
+                         [(name,) for name in DISTINCT_NAMES])
+
+
+def main():
+    failed = False
+    with tempfile.TemporaryDirectory(prefix='fittrack_schema_') as tmpdir:
+        reference = os.path.join(tmpdir, 'reference.sqlite3')
+        alembic_upgrade(reference)
+        expected_columns = columns(reference)
+
+        dictionaries = {}
+
+        def scenario(label, prepare, expected_exercises):
+            nonlocal failed
+            path = os.path.join(tmpdir, label.replace(' ', '_') + '.sqlite3')
+            prepare(path)
+            problems = []
+            try:
+                result = boot(path)
+                applied = alembic_upgrade(path)
+                head = boot(path)['stamp']
+            except RuntimeError as e:
+                problems.append(str(e))
+            else:
+                if result['stamp'] != head:
+                    problems.append(f"boot left the stamp at {result['stamp']}, head is {head}")
+                if applied:
+                    problems.append(f'alembic still applied {applied}')
+                if columns(path) != expected_columns:
+                    problems.append('columns differ from a database built by Alembic')
+                if result['exercises'] != expected_exercises:
+                    problems.append(f"exercises {result['exercises']}, expected {expected_exercises}")
+                if expected_exercises and not result['rollups']:
+                    problems.append('rollups were not backfilled')
+                if expected_exercises:
+                    dictionaries[label] = result['dictionary']
+            failed = failed or bool(problems)
+            print(f"{label:18s} {'OK' if not problems else 'FAIL'}")
+            for problem in problems:
+                print(f'    {problem}')
+
+        def unstamped(path):
+            seed_baseline(path)
+            with sqlite3.connect(path) as conn:
+                conn.execute('DROP TABLE alembic_version')
+
+        def migrated(path):
+            seed_baseline(path)
+            alembic_upgrade(path)
+
+        seeded = sorted(['Bench press', 'Bench press', 'Dřep', *DISTINCT_NAMES])
+        scenario('stamped baseline', seed_baseline, seeded)
+        scenario('unstamped legacy', unstamped, seeded)
+        scenario('migrated baseline', migrated, seeded)
+        scenario('alembic head', alembic_upgrade, [])
+
+        same = len(dictionaries) == 3 and len({json.dumps(d) for d in dictionaries.values()}) == 1
+        failed = failed or not same
+        print(f"{'same dictionary':18s} {'OK' if same else 'FAIL'}")
+        if not same and dictionaries:
+            reference_label, reference_dictionary = next(iter(dictionaries.items()))
+            for label, dictionary in dictionaries.items():
+                differing = sorted(set(map(tuple, dictionary)) ^ set(map(tuple, reference_dictionary)))
+                if differing:
+                    print(f'    {label} vs {reference_label}: {differing}')
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
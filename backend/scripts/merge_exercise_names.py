@@ -0,0 +1,54 @@
+"""
+Merge near-duplicate entries of the exercise dictionary.
+
+Write paths only match names by normalized key ("Bench Press" and
+"Benchpress" are one exercise), so typos and plurals ("Bench pres",
+"Leg extensions") start entries of their own. This proposes folding them
+into the closest heavier entry by fuzzy matching. Fuzzy matching also pairs
+different exercises ("Incline ..." / "Decline ..."), and a merge rewrites
+the users' exercise rows for good, so by default the merges are only
+listed. Review them, exclude wrong pairs with --skip, then rerun with
+--apply: the merges and the rebuilt rollups and personal records of the
+affected users are written in one transaction. Uses the configured
+database (DATABASE_URL); run from the repository root:
+
+    python backend/scripts/merge_exercise_names.py [--cutoff 0.9] [--skip NAME ...] [--apply]
+"""
+import sys, os
+import time
+import argparse
+
+# Ensure repository root is on sys.path so 'import backend' works when running from scripts/
+sys.path.insert(0, os.getcwd())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--apply', action='store_true', help='write the merges (default: only list them)')
+    parser.add_argument('--skip', action='append', default=[], metavar='NAME',
+                        help='dictionary entry to leave alone (repeatable)')
+    parser.add_argument('--cutoff', type=float, default=None,
+                        help='similarity of normalized names, 0-1 (default: FUZZY_CUTOFF)')
+    args = parser.parse_args()
+
+    import backend
+    from backend import db, exercise_names
+
+    with backend.app.app_context():
+        t0 = time.perf_counter()
+        cutoff = args.cutoff if args.cutoff is not None else exercise_names.FUZZY_CUTOFF
+        merges, user_ids = exercise_names.merge_similar(dry_run=not args.apply, cutoff=cutoff, skip=args.skip)
+        for source, target in merges:
+            print(f'{source!r} -> {target!r}')
+        if not args.apply:
+            print(f'{len(merges)} merges proposed (nothing written; rerun with --apply, '
+                  f'--skip NAME for wrong pairs)')
+            return
+
+        db.session.commit()
+        print(f'{len(merges)} entries merged, {len(user_ids)} users rebuilt '
+              f'in {(time.perf_counter() - t0) * 1000:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
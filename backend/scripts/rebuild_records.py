@@ -0,0 +1,36 @@
+"""
+Rebuild the personal records from workout_exercise.
+
+Every write path keeps personal_record current; this repairs drift or
+backfills data imported behind the API's back. Records are recomputed per
+user in a single transaction. Uses the configured database (DATABASE_URL);
+run from the repository root:
+
+    python backend/scripts/rebuild_records.py [--user-id N]
+"""
+import sys, os
+import time
+import argparse
+
+# Ensure repository root is on sys.path so 'import backend' works when running from scripts/
+sys.path.insert(0, os.getcwd())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--user-id', type=int, help='only rebuild this user')
+    args = parser.parse_args()
+
+    import backend
+    from backend import db, records
+
+    with backend.app.app_context():
+        t0 = time.perf_counter()
+        written = records.rebuild(args.user_id)
+        db.session.commit()
+        scope = f'user {args.user_id}' if args.user_id is not None else 'all users'
+        print(f'{written} records written for {scope} in {(time.perf_counter() - t0) * 1000:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
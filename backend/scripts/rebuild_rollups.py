@@ -0,0 +1,37 @@
+"""
+Rebuild the exercise rollup tables from workout_exercise.
+
+The rollups are kept current by every write path; this backfills them
+(after importing data behind the API's back, or for a dialect the
+migration does not backfill) and repairs drift. Each grain is rebuilt with
+one INSERT ... SELECT in a single transaction. Uses the configured database
+(DATABASE_URL); run from the repository root:
+
+    python backend/scripts/rebuild_rollups.py [--user-id N]
+"""
+import sys, os
+import time
+import argparse
+
+# Ensure repository root is on sys.path so 'import backend' works when running from scripts/
+sys.path.insert(0, os.getcwd())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--user-id', type=int, help='only rebuild this user')
+    args = parser.parse_args()
+
+    import backend
+    from backend import db, rollups
+
+    with backend.app.app_context():
+        t0 = time.perf_counter()
+        written = rollups.rebuild(args.user_id)
+        db.session.commit()
+        scope = f'user {args.user_id}' if args.user_id is not None else 'all users'
+        print(f'{written} rollup rows written for {scope} in {(time.perf_counter() - t0) * 1000:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
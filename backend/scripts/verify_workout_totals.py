@@ -0,0 +1,109 @@
+"""
+Consistency check for the denormalized workout totals.
+
+Recomputes exercise_count, total_sets, total_reps and total_volume of every
+workout from its workout_exercise rows and reports the workouts whose
+stored columns disagree. With --fix the mismatching workouts are rewritten
+from the exercise rows. Exits with status 1 if mismatches remain. Uses the
+configured database (DATABASE_URL); run from the repository root:
+
+    python backend/scripts/verify_workout_totals.py [--fix] [--user-id N] [--show 20]
+"""
+import sys, os
+import argparse
+
+# Ensure repository root is on sys.path so 'import backend' works when running from scripts/
+sys.path.insert(0, os.getcwd())
+
+TOTALS = ('exercise_count', 'total_sets', 'total_reps', 'total_volume')
+FIX_CHUNK_SIZE = 500
+
+
+def find_mismatches(user_id=None):
+    """(workout_id, user_id, stored, actual) for every inconsistent workout, in one query"""
+    from backend import db
+    from backend.database_models import Workout, WorkoutExercise, exercise_volume
+
+    exercises = WorkoutExercise.__table__
+    actual = db.select(
+            exercises.c.workout_id,
+            db.func.count(exercises.c.id).label('exercise_count'),
+            db.func.sum(exercises.c.sets).label('total_sets'),
+            db.func.sum(exercises.c.reps).label('total_reps'),
+            db.func.sum(exercise_volume(exercises)).label('total_volume')
+        )\
+        .group_by(exercises.c.workout_id)\
+        .subquery()
+
+    query = db.session.query(
+            Workout.id, Workout.user_id,
+            *[getattr(Workout, name) for name in TOTALS],
+            *[db.func.coalesce(actual.c[name], 0) for name in TOTALS]
+        )\
+        .outerjoin(actual, actual.c.workout_id == Workout.id)
+    if user_id is not None:
+        query = query.filter(Workout.user_id == user_id)
+
+    mismatches = []
+    for row in query.yield_per(1000):
+        stored = dict(zip(TOTALS, row[2:6]))
+        expected = dict(zip(TOTALS, row[6:10]))
+        # Volume is a float sum, taken in Python on insert and in SQL here; allow rounding noise
+        if any(stored[name] != expected[name] for name in TOTALS[:3]) \
+                or abs((stored['total_volume'] or 0) - (expected['total_volume'] or 0)) > 1e-6:
+            mismatches.append((row.id, row.user_id, stored, expected))
+    return mismatches
+
+
+def fix(workout_ids):
+    from backend import db
+    from backend.database_models import Workout, workout_totals_subqueries
+
+    workout_table = Workout.__table__
+    for start in range(0, len(workout_ids), FIX_CHUNK_SIZE):
+        chunk = workout_ids[start:start + FIX_CHUNK_SIZE]
+        db.session.execute(
+            workout_table.update()
+            .where(workout_table.c.id.in_(chunk))
+            .values(workout_totals_subqueries(workout_table.c.id))
+        )
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fix', action='store_true', help='rewrite mismatching workouts from their exercises')
+    parser.add_argument('--user-id', type=int, help='only check this user')
+    parser.add_argument('--show', type=int, default=20, help='mismatches to print')
+    args = parser.parse_args()
+
+    import backend
+    from backend import db
+    from backend.database_models import Workout
+
+    with backend.app.app_context():
+        query = db.session.query(db.func.count(Workout.id))
+        if args.user_id is not None:
+            query = query.filter(Workout.user_id == args.user_id)
+        checked = query.scalar()
+
+        mismatches = find_mismatches(args.user_id)
+        for workout_id, user_id, stored, expected in mismatches[:args.show]:
+            diffs = ', '.join(f'{name} {stored[name]} != {expected[name]}'
+                              for name in TOTALS if stored[name] != expected[name])
+            print(f'workout {workout_id} (user {user_id}): {diffs}')
+        if len(mismatches) > args.show:
+            print(f'... and {len(mismatches) - args.show} more')
+        print(f'{checked} workouts checked, {len(mismatches)} inconsistent')
+
+        if mismatches and args.fix:
+            fix([workout_id for workout_id, *_ in mismatches])
+            remaining = find_mismatches(args.user_id)
+            print(f'fixed {len(mismatches) - len(remaining)}, {len(remaining)} still inconsistent')
+            mismatches = remaining
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
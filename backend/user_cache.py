@@ -0,0 +1,112 @@
+# backend/user_cache.py
+"""
+User Cache
+Per-process LRU + TTL cache of User rows for the Flask-Login user loader
+"""
+import time
+import threading
+from collections import OrderedDict
+
+
+class UserCache:
+    """Bounded, thread-safe cache of detached User instances keyed by id
+
+    Entries are detached from any session; callers re-attach a per-request
+    copy with db.session.merge(user, load=False), which issues no SQL.
+
+    The cache is per process: a write handled by one gunicorn worker only
+    invalidates that worker's entry, other workers see the change once their
+    entry expires (USER_CACHE_TTL).
+    """
+
+    def __init__(self, max_size=1024, ttl=30.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def configure(self, max_size, ttl):
+        with self._lock:
+            self.max_size = max_size
+            self.ttl = ttl
+            self._entries.clear()
+
+    @property
+    def enabled(self):
+        return self.max_size > 0 and self.ttl > 0
+
+    def get(self, user_id):
+        """Return the cached detached User or None on miss/expiry"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user_id, user):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+user_cache = UserCache()
+
+
+def load_user_cached(user_id):
+    """Flask-Login loader body: serve identity from the cache when possible"""
+    from sqlalchemy.orm import make_transient_to_detached
+    from backend.app import db
+    from backend.database_models import User
+
+    if not user_cache.enabled:
+        return db.session.get(User, user_id)
+
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return db.session.merge(cached, load=False)
+
+    user = db.session.get(User, user_id)
+    if user is None:
+        return None
+
+    # Cache a detached copy of the column values; the request keeps its own
+    # session-bound instance
+    detached = User(**{col.key: getattr(user, col.key) for col in User.__mapper__.column_attrs})
+    make_transient_to_detached(detached)
+    user_cache.put(user_id, detached)
+    return user
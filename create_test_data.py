@@ -11,7 +11,8 @@ from werkzeug.security import generate_password_hash
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from backend.app import create_app, db
-from backend.database_models import User, Workout, WorkoutExercise
+from backend.database_models import User
+from backend.api_routes import _insert_workout
 
 def create_test_user():
     """Create test user Emilek with sample data"""
@@ -162,24 +163,8 @@ def create_test_user():
         
         total_exercises = 0
         for i, workout_data in enumerate(workouts_data, 1):
-            workout = Workout(
-                user_id=user.id,
-                date=workout_data['date'],
-                note=workout_data['note']
-            )
-            db.session.add(workout)
-            db.session.flush()
-            
-            for ex_data in workout_data['exercises']:
-                exercise = WorkoutExercise(
-                    workout_id=workout.id,
-                    name=ex_data['name'],
-                    sets=ex_data['sets'],
-                    reps=ex_data['reps'],
-                    weight=ex_data['weight']
-                )
-                db.session.add(exercise)
-                total_exercises += 1
+            _insert_workout(user.id, workout_data['date'], workout_data['note'], workout_data['exercises'])
+            total_exercises += len(workout_data['exercises'])
             
             print(f"   ✓ Workout {i}/{len(workouts_data)}: {workout_data['note']} ({len(workout_data['exercises'])} cviků)")
         
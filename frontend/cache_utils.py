@@ -14,27 +14,73 @@ def get_exercise_catalog():
     return EXERCISE_CATALOG
 
 
-@st.cache_data(ttl=60, show_spinner=False)  # Cache for 1 minute
+def _revalidated_get(path, params=None):
+    """GET an API payload, revalidating the last copy with If-None-Match
+
+    The backend answers 304 without touching the user's data when nothing
+    changed, so this is cheap enough to call on every rerun. Copies are kept
+    per browser session, keyed by path and query.
+    """
+    session = st.session_state['session']
+    store = st.session_state.setdefault('etag_cache', {})
+    key = (path, tuple(sorted((params or {}).items())))
+    cached = store.get(key)
+    headers = {'If-None-Match': cached[0]} if cached else {}
+
+    r = session.get(f"{API_BASE}{path}", params=params, headers=headers, timeout=5)
+    if r.status_code == 304 and cached:
+        return cached[1]
+    if not r.ok:
+        return None
+    payload = _safe_json(r)
+    etag = r.headers.get('ETag')
+    if etag:
+        store[key] = (etag, payload)
+    return payload
+
+
 def get_user_stats(user_id):
-    """Get cached user statistics"""
+    """Get user statistics (revalidated via ETag)"""
     try:
-        session = st.session_state['session']
-        r = session.get(f"{API_BASE}/stats", timeout=5)
-        if r.ok:
-            return _safe_json(r).get('stats', {})
+        payload = _revalidated_get("/stats")
+        if payload:
+            return payload.get('stats', {})
     except Exception:
         pass
     return {}
 
 
-@st.cache_data(ttl=120, show_spinner=False)  # Cache for 2 minutes, hide spinner
 def get_user_workouts(user_id):
-    """Get cached user workouts"""
+    """Get user workouts (revalidated via ETag)"""
     try:
-        session = st.session_state['session']
-        r = session.get(f"{API_BASE}/workouts", timeout=5)
-        if r.ok:
-            return _safe_json(r).get('workouts', [])
+        payload = _revalidated_get("/workouts")
+        if payload:
+            return payload.get('workouts', [])
+    except Exception:
+        pass
+    return []
+
+
+def get_exercise_rollups(user_id, grain='week', exercise=None):
+    """Get per-exercise aggregates by day/week/month (revalidated via ETag)"""
+    try:
+        params = {'grain': grain}
+        if exercise:
+            params['exercise'] = exercise
+        payload = _revalidated_get("/stats/rollups", params)
+        if payload:
+            return payload.get('rollups', [])
+    except Exception:
+        pass
+    return []
+
+
+def get_personal_records(user_id):
+    """Get personal records per exercise and kind (revalidated via ETag)"""
+    try:
+        payload = _revalidated_get("/records")
+        if payload:
+            return payload.get('records', [])
     except Exception:
         pass
     return []
@@ -129,11 +175,11 @@ def get_recent_achievements(user_id):
 
 def clear_user_cache(user_id):
     """Clear all cached data for a specific user"""
-    get_user_stats.clear()
-    get_user_workouts.clear()
+    st.session_state.pop('etag_cache', None)
     get_recent_achievements.clear()
 
 
 def clear_all_cache():
     """Clear all cached data"""
+    st.session_state.pop('etag_cache', None)
     st.cache_data.clear()
@@ -22,19 +22,51 @@ def admin_page():
     
     st.markdown('<div class="main-header">⚙️ Správce</div>', unsafe_allow_html=True)
     
+    # Search, sorting and paging are done server-side
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        search_query = st.text_input("🔍 Hledat uživatele", placeholder="Uživatelské jméno nebo email")
+    with col2:
+        sort_by = st.selectbox(
+            "Řadit podle:",
+            ["Nejstarší účty", "Nejnovější účty", "Uživatel A-Z", "Nejvíce tréninků"],
+            key="admin_sort_users"
+        )
+    
+    sort_params = {
+        "Nejstarší účty": {'sort': 'id', 'order': 'asc'},
+        "Nejnovější účty": {'sort': 'id', 'order': 'desc'},
+        "Uživatel A-Z": {'sort': 'username', 'order': 'asc'},
+        "Nejvíce tréninků": {'sort': 'workout_count', 'order': 'desc'},
+    }
+    params = {'limit': 50, **sort_params[sort_by]}
+    if search_query:
+        params['q'] = search_query
+    
+    # Cursor stack: element i opens page i+1; reset whenever filters change
+    filter_key = tuple(sorted(params.items()))
+    if st.session_state.get('admin_users_filter_key') != filter_key:
+        st.session_state['admin_users_filter_key'] = filter_key
+        st.session_state['admin_users_cursors'] = [None]
+    cursors = st.session_state['admin_users_cursors']
+    if cursors[-1]:
+        params['cursor'] = cursors[-1]
+    
     # Load users
     try:
-        r = session.get(f"{API_BASE}/admin/users", timeout=5)
+        r = session.get(f"{API_BASE}/admin/users", params=params, timeout=5)
         if not r.ok:
             st.error("❌ Chyba při načítání uživatelů")
             return
         
-        users = _safe_json(r).get('users', [])
+        data = _safe_json(r)
+        users = data.get('users', [])
+        next_cursor = data.get('next_cursor')
     except Exception as e:
         st.error(f"❌ Chyba připojení: {str(e)}")
         return
     
-    st.subheader(f"👥 Celkem uživatelů: {len(users)}")
+    st.subheader(f"👥 Celkem uživatelů: {data.get('total', len(users))}")
     
     # Create DataFrame
     df_data = []
@@ -53,6 +85,20 @@ def admin_page():
         st.dataframe(df, use_container_width=True)
     else:
         st.info("Žádní uživatelé")
+    
+    # Pagination
+    if len(cursors) > 1 or next_cursor:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if st.button("⬅️ Předchozí", key="admin_users_prev", disabled=(len(cursors) == 1)):
+                cursors.pop()
+                st.rerun()
+        with col2:
+            st.markdown(f"<div style='text-align: center; padding: 10px;'>Stránka **{len(cursors)}**</div>", unsafe_allow_html=True)
+        with col3:
+            if st.button("Další ➡️", key="admin_users_next", disabled=(not next_cursor)):
+                cursors.append(next_cursor)
+                st.rerun()
 
 
 def achievements_page():
@@ -11,7 +11,7 @@ from config import API_BASE
 from components import show_loading, show_empty_state, show_toast
 from auth import _safe_json, _display_api_error
 from utils import calculate_1rm
-from cache_utils import get_user_stats, get_user_workouts
+from cache_utils import get_exercise_rollups, get_personal_records, get_user_stats, get_user_workouts
 
 
 def dashboard_page():
@@ -191,71 +191,53 @@ def dashboard_page():
     
     # Recent workouts
     st.subheader("📅 Poslední tréninky")
-    r = session.get(f"{API_BASE}/workouts", timeout=5)
-    if r.ok:
-        workouts = _safe_json(r).get('workouts', [])[:5]
-        if workouts:
-            for w in workouts:
-                with st.expander(f"📌 {w['date']} — {w['exercise_count']} cviků"):
-                    st.write(f"**Poznámka:** {w.get('note', 'Bez poznámky')}")
-                    if st.button("Zobrazit detail", key=f"detail_{w['id']}"):
-                        st.session_state['selected_workout'] = w['id']
-                        st.session_state['page'] = 'workout_detail'
-                        st.rerun()
-        else:
-            st.info("Zatím nemáte žádné tréninky. Začněte rychlým startem nebo vytvořte nový trénink!")
+    workouts = get_user_workouts(user_id)[:5]
+    if workouts:
+        for w in workouts:
+            with st.expander(f"📌 {w['date']} — {w['exercise_count']} cviků"):
+                st.write(f"**Poznámka:** {w.get('note', 'Bez poznámky')}")
+                if st.button("Zobrazit detail", key=f"detail_{w['id']}"):
+                    st.session_state['selected_workout'] = w['id']
+                    st.session_state['page'] = 'workout_detail'
+                    st.rerun()
+    else:
+        st.info("Zatím nemáte žádné tréninky. Začněte rychlým startem nebo vytvořte nový trénink!")
 
 
 def stats_page():
     """Advanced statistics page with interactive Plotly charts."""
     st.markdown('<div class="main-header">📈 Pokročilé statistiky & analýzy</div>', unsafe_allow_html=True)
     
-    session = st.session_state['session']
+    user_id = st.session_state.get('user', {}).get('id')
 
     # Loading state for data
     data_placeholder = st.empty()
     with data_placeholder.container():
         show_loading("Načítám data pro analýzy...")
     
-    r = session.get(f"{API_BASE}/workouts", timeout=5)
+    # Workout list without exercises plus per-day, per-exercise rollups from the
+    # backend: both grow with the number of training days, not exercise rows,
+    # and are revalidated with If-None-Match so unchanged data is not re-downloaded
+    workouts = get_user_workouts(user_id)
+    rollups = get_exercise_rollups(user_id, grain='day')
     data_placeholder.empty()
     
-    if not r.ok:
-        st.error('Nepodařilo se načíst tréninky pro statistiky')
-        return
-
-    workouts = _safe_json(r).get('workouts', [])
     if not workouts:
         st.info('🏋️ Zatím není dost dat pro statistiky. Začněte vytvářením tréninků!')
         return
 
-    # Collect all exercise data with details
-    ex_rows = []
-    for w in workouts:
-        try:
-            wr = session.get(f"{API_BASE}/workouts/{w['id']}", timeout=5)
-            if not wr.ok:
-                continue
-            detail = _safe_json(wr).get('workout', {})
-            wdate = detail.get('date')
-            for e in detail.get('exercises', []):
-                ex_rows.append({
-                    'date': wdate,
-                    'name': e.get('name'),
-                    'sets': e.get('sets', 0),
-                    'reps': e.get('reps', 0),
-                    'weight': e.get('weight', 0) or 0,
-                    'volume': (e.get('sets', 0) * e.get('reps', 0) * (e.get('weight', 0) or 0))
-                })
-        except Exception:
-            continue
-
-    if not ex_rows:
+    if not rollups:
         st.info('Žádné cviky k analýze')
         return
 
-    df = pd.DataFrame(ex_rows)
+    # One row per (day, exercise): entry_count exercises logged that day,
+    # summed sets/reps/volume and the heaviest weight
+    df = pd.DataFrame(rollups).rename(columns={
+        'bucket': 'date', 'exercise': 'name', 'total_sets': 'sets',
+        'total_reps': 'reps', 'max_weight': 'weight'
+    })
     df['date'] = pd.to_datetime(df['date'])
+    df['weight'] = df['weight'].fillna(0)
     df = df.sort_values('date')
 
     # === KEY METRICS ===
@@ -263,7 +245,7 @@ def stats_page():
     col1, col2, col3, col4 = st.columns(4)
     
     total_workouts = len(workouts)
-    total_exercises = len(df)
+    total_exercises = int(df['entry_count'].sum())
     total_volume = df['volume'].sum()
     unique_exercises = df['name'].nunique()
     
@@ -341,7 +323,7 @@ def stats_page():
     # === TOP EXERCISES BY COUNT ===
     st.markdown("## 🏆 Nejčastější cviky")
     
-    exercise_counts = df['name'].value_counts().head(10).reset_index()
+    exercise_counts = df.groupby('name')['entry_count'].sum().sort_values(ascending=False).head(10).reset_index()
     exercise_counts.columns = ['Cvik', 'Počet']
     
     if len(exercise_counts) == 0:
@@ -393,25 +375,10 @@ def stats_page():
     # === MUSCLE GROUP ANALYSIS ===
     st.markdown("## 🗺️ Analýza zatížení svalových skupin")
     
-    def get_muscle_group(name):
-        name_lower = name.lower()
-        muscle_map = {
-            'hrudník': ['bench', 'tlak', 'press', 'fly'],
-            'záda': ['pull', 'tah', 'row', 'deadlift', 'mrtvý'],
-            'ramena': ['shoulder', 'rameno', 'lateral', 'overhead'],
-            'biceps': ['curl', 'bicep'],
-            'triceps': ['tricep', 'extension', 'dip'],
-            'nohy': ['squat', 'dřep', 'leg', 'lunge'],
-            'core': ['plank', 'abs', 'crunch']
-        }
-        
-        for muscle, keywords in muscle_map.items():
-            if any(keyword in name_lower for keyword in keywords):
-                return muscle
-        return 'ostatní'
-    
-    if ex_rows:
-        df['muscle_group'] = df['name'].apply(get_muscle_group)
+    # muscle_group and category come with each rollup row from the backend's
+    # exercise dictionary
+    if not df.empty:
+        df['muscle_group'] = df['muscle_group'].fillna('ostatní')
         muscle_volume = df.groupby('muscle_group')['volume'].sum().sort_values(ascending=False)
         
         # Create body heatmap visualization
@@ -443,27 +410,8 @@ def stats_page():
     # === EXERCISE CATEGORIZATION ===
     st.markdown("## 📂 Rozdělení cviků podle kategorie")
     
-    def categorize_exercise(name):
-        name_lower = name.lower()
-        if any(x in name_lower for x in ['bench', 'tlak', 'press']):
-            return 'Tlaky'
-        elif any(x in name_lower for x in ['squat', 'dřep']):
-            return 'Dřepy'
-        elif any(x in name_lower for x in ['deadlift', 'mrtvý']):
-            return 'Mrtvé tahy'
-        elif any(x in name_lower for x in ['pull', 'tah', 'row']):
-            return 'Tahy'
-        elif any(x in name_lower for x in ['curl', 'bicep']):
-            return 'Biceps'
-        elif any(x in name_lower for x in ['tricep', 'extension']):
-            return 'Triceps'
-        elif any(x in name_lower for x in ['shoulder', 'rameno']):
-            return 'Ramena'
-        else:
-            return 'Ostatní'
-    
-    df['category'] = df['name'].apply(categorize_exercise)
-    category_counts = df['category'].value_counts().reset_index()
+    df['category'] = df['category'].fillna('Ostatní')
+    category_counts = df.groupby('category')['entry_count'].sum().sort_values(ascending=False).reset_index()
     category_counts.columns = ['Kategorie', 'Počet']
     
     fig_pie = px.pie(category_counts, values='Počet', names='Kategorie',
@@ -485,7 +433,8 @@ def stats_page():
     col1, col2 = st.columns(2)
     
     with col1:
-        avg_sets = df.groupby('name')['sets'].mean().sort_values(ascending=False).head(10).reset_index()
+        per_exercise = df.groupby('name')[['sets', 'entry_count']].sum()
+        avg_sets = (per_exercise['sets'] / per_exercise['entry_count']).sort_values(ascending=False).head(10).reset_index()
         avg_sets.columns = ['Cvik', 'Průměr sérií']
         avg_sets['Průměr sérií'] = avg_sets['Průměr sérií'].round(1)
         
@@ -504,7 +453,8 @@ def stats_page():
         st.plotly_chart(fig_sets, use_container_width=True)
     
     with col2:
-        avg_reps = df.groupby('name')['reps'].mean().sort_values(ascending=False).head(10).reset_index()
+        per_exercise = df.groupby('name')[['reps', 'entry_count']].sum()
+        avg_reps = (per_exercise['reps'] / per_exercise['entry_count']).sort_values(ascending=False).head(10).reset_index()
         avg_reps.columns = ['Cvik', 'Průměr opakování']
         avg_reps['Průměr opakování'] = avg_reps['Průměr opakování'].round(1)
         
@@ -534,6 +484,24 @@ def stats_page():
         ex_data = df[df['name'] == selected_exercise].copy()
         ex_data = ex_data.sort_values('date')
         
+        # Personal records from the backend (kept current on every write)
+        records = {r['kind']: r for r in get_personal_records(user_id) if r['exercise'] == selected_exercise}
+        if records:
+            record_labels = [
+                ('weight', '🏋️ Max váha', 'kg'),
+                ('one_rm', '💪 Odhad 1RM', 'kg'),
+                ('set_volume', '📦 Nejlepší série', 'kg'),
+                ('session_volume', '🔥 Nejlepší trénink', 'kg'),
+            ]
+            cols = st.columns(len(record_labels))
+            for col, (kind, label, unit) in zip(cols, record_labels):
+                with col:
+                    record = records.get(kind)
+                    if record:
+                        st.metric(label, f"{record['value']:,.1f} {unit}", help=f"Dosaženo {record['date']}")
+                    else:
+                        st.metric(label, '–')
+        
         col1, col2 = st.columns(2)
         
         with col1:
@@ -585,7 +553,7 @@ def stats_page():
         consistency_score = min(recent_workouts * 5, 40)  # Max 40 points for consistency
         
         volume_trend = 0
-        if len(df) >= 10:
+        if total_exercises >= 10:
             recent_volume = df[df['date'] > df['date'].max() - pd.Timedelta(days=30)]['volume'].sum()
             older_volume = df[df['date'] <= df['date'].max() - pd.Timedelta(days=30)]['volume'].sum()
             if older_volume > 0:
@@ -653,7 +621,7 @@ def stats_page():
 
     # === DATA EXPORT ===
     st.markdown("## 💾 Export dat")
-    with st.expander('📥 Stáhnout surová data (CSV)'):
+    with st.expander('📥 Stáhnout denní souhrn cviků (CSV)'):
         try:
             csv_blob = df.to_csv(index=False)
             st.download_button('⬇️ Stáhnout CSV', 
@@ -4,12 +4,11 @@ Handles workout listing, creation, and detail views
 """
 import streamlit as st
 from datetime import date
-import pandas as pd
 
 from config import API_BASE
 from components import show_loading, show_empty_state, confirm_dialog, show_toast
 from auth import _safe_json, _display_api_error
-from cache_utils import get_user_workouts, get_workout_templates, clear_user_cache
+from cache_utils import get_workout_templates, clear_user_cache
 
 
 def workouts_page():
@@ -45,31 +44,7 @@ def workouts_page():
             st.rerun()
         st.markdown("---")
     
-    # Loading state
-    workouts_placeholder = st.empty()
-    with workouts_placeholder.container():
-        show_loading("Načítám tréninky...")
-    
-    # Use cached workouts
-    user_id = st.session_state.get('user', {}).get('id')
-    workouts = get_user_workouts(user_id)
-    workouts_placeholder.empty()
-    
-    if not workouts:
-        def go_to_new_workout():
-            st.session_state['page'] = 'new_workout'
-            st.rerun()
-        
-        show_empty_state(
-            "💪",
-            "Žádné tréninky",
-            "Zatím nemáte žádné zaznamenané tréninky. Začněte svou fitness cestu!",
-            "➕ Vytvořit první trénink",
-            go_to_new_workout
-        )
-        return
-    
-    # Search and filtering
+    # Search and filtering (evaluated server-side, one page at a time)
     st.markdown("<br>", unsafe_allow_html=True)
     st.markdown("### 🔍 Vyhledávání a řazení")
     
@@ -86,90 +61,112 @@ def workouts_page():
             key="sort_workouts"
         )
     with col2:
-        st.markdown(f"**Nalezeno:** {len(workouts)} tréninků")
+        # Empty tuple = no date filter; a range picker yields 0-2 dates
+        date_range = st.date_input("Období", value=(), key="workouts_range")
+    date_from = date_range[0] if len(date_range) > 0 else None
+    date_to = date_range[1] if len(date_range) > 1 else None
+    
+    sort_params = {
+        "Nejnovější první": {'sort': 'date', 'order': 'desc'},
+        "Nejstarší první": {'sort': 'date', 'order': 'asc'},
+        "Nejvíce cviků": {'sort': 'exercise_count', 'order': 'desc'},
+        "Nejméně cviků": {'sort': 'exercise_count', 'order': 'asc'},
+    }
+    
+    items_per_page = 10
+    params = {'limit': items_per_page, **sort_params[sort_by]}
+    if search_query:
+        params['q'] = search_query
+    if date_from:
+        params['from'] = date_from.isoformat()
+    if date_to:
+        params['to'] = date_to.isoformat()
+    
+    # Cursor stack: element i is the cursor that opens page i+1 (None = first page).
+    # Changing filters or sorting starts again from the first page.
+    filter_key = tuple(sorted((k, v) for k, v in params.items()))
+    if st.session_state.get('workout_filter_key') != filter_key:
+        st.session_state['workout_filter_key'] = filter_key
+        st.session_state['workout_cursors'] = [None]
+    cursors = st.session_state['workout_cursors']
+    if cursors[-1]:
+        params['cursor'] = cursors[-1]
     
     st.markdown("---")
     
-    # Create DataFrame
-    df_data = []
-    for w in workouts:
-        df_data.append({
-            'Datum': w['date'],
-            'Poznámka': w.get('note', ''),
-            'Poznámka_short': w.get('note', '')[:50] + ('...' if len(w.get('note', '')) > 50 else ''),
-            'Počet cviků': w['exercise_count'],
-            'ID': w['id']
-        })
+    # Loading state
+    workouts_placeholder = st.empty()
+    with workouts_placeholder.container():
+        show_loading("Načítám tréninky...")
     
-    df = pd.DataFrame(df_data)
+    try:
+        r = session.get(f"{API_BASE}/workouts", params=params, timeout=5)
+    except Exception as e:
+        workouts_placeholder.empty()
+        st.error(f"❌ Chyba připojení: {str(e)}")
+        return
+    workouts_placeholder.empty()
     
-    # Filter by search
-    if search_query:
-        search_lower = search_query.lower()
-        datum_col = df['Datum'].astype(str)
-        poznamka_col = df['Poznámka'].astype(str)
-        mask = (
-            datum_col.str.contains(search_lower, case=False, na=False) |
-            poznamka_col.str.contains(search_lower, case=False, na=False)
-        )
-        df = df[mask]
-        
-        if len(df) == 0:
+    if not r.ok:
+        _display_api_error(r)
+        return
+    
+    data = _safe_json(r)
+    workouts = data.get('workouts', [])
+    next_cursor = data.get('next_cursor')
+    has_filters = bool(search_query or date_from or date_to)
+    
+    if not workouts and len(cursors) == 1:
+        if has_filters:
             show_empty_state(
                 "🔍",
                 "Nenalezeny žádné výsledky",
-                f"Pro dotaz '{search_query}' nebyly nalezeny žádné tréninky.",
+                "Pro zadané filtry nebyly nalezeny žádné tréninky.",
             )
             return
-    
-    # Sort
-    if sort_by == "Nejnovější první":
-        df = df.sort_values('Datum', ascending=False)
-    elif sort_by == "Nejstarší první":
-        df = df.sort_values('Datum', ascending=True)
-    elif sort_by == "Nejvíce cviků":
-        df = df.sort_values('Počet cviků', ascending=False)
-    elif sort_by == "Nejméně cviků":
-        df = df.sort_values('Počet cviků', ascending=True)
+        
+        def go_to_new_workout():
+            st.session_state['page'] = 'new_workout'
+            st.rerun()
+        
+        show_empty_state(
+            "💪",
+            "Žádné tréninky",
+            "Zatím nemáte žádné zaznamenané tréninky. Začněte svou fitness cestu!",
+            "➕ Vytvořit první trénink",
+            go_to_new_workout
+        )
+        return
     
     # Pagination
-    items_per_page = 10
-    total_pages = (len(df) + items_per_page - 1) // items_per_page
-    
-    if 'workout_page' not in st.session_state:
-        st.session_state['workout_page'] = 1
-    
-    if total_pages > 1:
+    if len(cursors) > 1 or next_cursor:
         col1, col2, col3 = st.columns([1, 2, 1])
         with col1:
-            if st.button("⬅️ Předchozí", disabled=(st.session_state['workout_page'] == 1)):
-                st.session_state['workout_page'] -= 1
+            if st.button("⬅️ Předchozí", disabled=(len(cursors) == 1)):
+                cursors.pop()
                 st.rerun()
         with col2:
-            st.markdown(f"<div style='text-align: center; padding: 10px;'>Stránka **{st.session_state['workout_page']}** z **{total_pages}**</div>", unsafe_allow_html=True)
+            st.markdown(f"<div style='text-align: center; padding: 10px;'>Stránka **{len(cursors)}**</div>", unsafe_allow_html=True)
         with col3:
-            if st.button("Další ➡️", disabled=(st.session_state['workout_page'] == total_pages)):
-                st.session_state['workout_page'] += 1
+            if st.button("Další ➡️", disabled=(not next_cursor)):
+                cursors.append(next_cursor)
                 st.rerun()
         st.markdown("---")
     
-    # Get page items
-    start_idx = (st.session_state['workout_page'] - 1) * items_per_page
-    end_idx = start_idx + items_per_page
-    df_page = df.iloc[start_idx:end_idx]
-    
     # Display workouts
-    for idx, row in df_page.iterrows():
+    for w in workouts:
+        note = w.get('note', '')
+        note_short = note[:50] + ('...' if len(note) > 50 else '')
         col1, col2, col3, col4 = st.columns([2, 4, 2, 2])
         with col1:
-            st.write(f"**{row['Datum']}**")
+            st.write(f"**{w['date']}**")
         with col2:
-            st.write(row['Poznámka_short'])
+            st.write(note_short)
         with col3:
-            st.write(f"🏋️ {row['Počet cviků']} cviků")
+            st.write(f"🏋️ {w['exercise_count']} cviků")
         with col4:
-            if st.button("Detail", key=f"view_{row['ID']}"):
-                st.session_state['selected_workout'] = row['ID']
+            if st.button("Detail", key=f"view_{w['id']}"):
+                st.session_state['selected_workout'] = w['id']
                 st.session_state['page'] = 'workout_detail'
                 st.rerun()
         st.markdown("---")
@@ -201,7 +201,7 @@ def calculate_muscle_recovery_score(workout_history, muscle_group):
     last_workout = None
     for workout in reversed(workout_history):
         for exercise in workout.get('exercises', []):
-            if get_muscle_group(exercise['name']) == muscle_group:
+            if (exercise.get('muscle_group') or get_muscle_group(exercise['name'])) == muscle_group:
                 last_workout = workout
                 break
         if last_workout:
@@ -231,7 +231,11 @@ def calculate_muscle_recovery_score(workout_history, muscle_group):
     return recovery_score
 
 def get_muscle_group(exercise_name):
-    """Categorize exercise by primary muscle group"""
+    """Categorize exercise by primary muscle group
+    
+    Fallback for exercise dicts without the backend's muscle_group (set once
+    per exercise in the dictionary, see backend/exercise_names.py).
+    """
     name_lower = exercise_name.lower()
     
     muscle_map = {